@@ -0,0 +1,68 @@
+"""Per-client rate limits on processes submitted to running simulations.
+
+Admission control proper (how deep the ready queue may grow, and what
+happens to arrivals beyond that) belongs to the scheduler; see
+``ProcessScheduler.max_ready``. The limits here stop a single client from
+flooding a simulation with submissions before they ever reach it.
+"""
+import math
+import threading
+import time
+from typing import Callable, Dict, Hashable
+
+class RateLimiter:
+    """Token bucket per client: ``rate`` processes per second, in bursts of up to ``burst``.
+
+    Buckets are created on a client's first request. Once there are more
+    than ``max_clients``, buckets that have refilled completely, whose
+    clients have been idle long enough to be indistinguishable from new
+    ones, are dropped.
+    """
+
+    def __init__(self, rate: float, burst: float = None, max_clients: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self.max_clients = max_clients
+        self.clock = clock
+        self._buckets: Dict[Hashable, list] = {}  # client -> [tokens, time of last refill]
+        self._lock = threading.Lock()
+        self.limited = 0  # Requests turned away
+
+    def acquire(self, client: Hashable, cost: float = 1) -> float:
+        """Take ``cost`` tokens from ``client``'s bucket.
+
+        Returns 0 when they were taken, otherwise the seconds until the
+        bucket will hold enough of them (infinite for a cost above
+        ``burst``) and takes nothing.
+        """
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                if len(self._buckets) >= self.max_clients:
+                    self._prune(now)
+                bucket = self._buckets[client] = [self.burst, now]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            self.limited += 1
+            if cost > self.burst:
+                return math.inf
+            return (cost - bucket[0]) / self.rate
+
+    def stats(self) -> Dict:
+        return {
+            'clients': len(self._buckets),
+            'limited': self.limited
+        }
+
+    def _prune(self, now: float):
+        full_after = self.burst / self.rate
+        for client in [client for client, (_, last) in self._buckets.items() if now - last >= full_after]:
+            del self._buckets[client]
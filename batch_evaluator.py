@@ -0,0 +1,161 @@
+"""Closed-form evaluation of non-preemptive schedules.
+
+Under FCFS, SJF and non-preemptive priority scheduling a dispatched process
+runs to completion, so the whole schedule follows from the dispatch order
+and a cumulative-max scan over arrival and burst times. The results match
+the tick-by-tick engine in ``process_scheduler`` exactly, including its time
+conventions: the first tick is 1 and a process occupies the CPU for at
+least one tick.
+"""
+import heapq
+from typing import Dict, List, Sequence
+
+from process_scheduler import ProcessState, ProcessTable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, fall back to plain Python loops
+    np = None
+
+BATCH_ALGORITHMS = ("fcfs", "sjf", "priority")
+
+def dispatch_order(algorithm: str, arrival_times: Sequence[int], burst_times: Sequence[int],
+                   priorities: Sequence[int] = None) -> List[int]:
+    """Indices of the processes in the order they are dispatched.
+
+    Ties are broken by position in the input among processes with the same
+    arrival time, like the scheduler's arrival-ordered process list.
+    """
+    count = len(arrival_times)
+    if algorithm == "fcfs":
+        if np is not None:
+            return np.argsort(np.asarray(arrival_times), kind="stable").tolist()
+        return sorted(range(count), key=arrival_times.__getitem__)
+    # Plain ints compare much faster than NumPy scalars in the heap below
+    arrival_times = _as_list(arrival_times)
+    burst_times = _as_list(burst_times)
+    if algorithm == "sjf":
+        keys = burst_times
+    elif algorithm == "priority":
+        keys = _as_list(priorities) if priorities is not None else [0] * count
+    else:
+        raise ValueError(f"{algorithm} cannot be evaluated in closed form")
+
+    # The choice at each dispatch depends on which processes have arrived by
+    # then, so the order comes from a single pass over a heap.
+    by_arrival = sorted(range(count), key=arrival_times.__getitem__)
+    ready = []
+    order = []
+    clock = 1
+    next_arrival = 0
+    while len(order) < count:
+        if not ready:
+            clock = max(clock, arrival_times[by_arrival[next_arrival]])
+        while next_arrival < count and arrival_times[by_arrival[next_arrival]] <= clock:
+            index = by_arrival[next_arrival]
+            heapq.heappush(ready, (keys[index], next_arrival, index))
+            next_arrival += 1
+        index = heapq.heappop(ready)[2]
+        order.append(index)
+        clock += max(burst_times[index], 1)
+    return order
+
+def evaluate_batch(algorithm: str, arrival_times: Sequence[int], burst_times: Sequence[int],
+                   priorities: Sequence[int] = None) -> Dict:
+    """Compute the final schedule of a non-preemptive algorithm.
+
+    Returns the dispatch ``order`` plus ``start_time``, ``completion_time``,
+    ``end_time``, ``waiting_time`` and ``turnaround_time`` in input order,
+    as NumPy arrays when NumPy is available and lists otherwise, and the
+    total CPU ``busy_time``.
+    """
+    order = dispatch_order(algorithm, arrival_times, burst_times, priorities)
+    # end_time is the last tick for SJF and priority but the tick after it for FCFS
+    end_offset = 0 if algorithm == "fcfs" else -1
+
+    if np is not None:
+        arrivals = np.asarray(arrival_times, dtype=np.int64)
+        bursts = np.asarray(burst_times, dtype=np.int64)
+        order = np.asarray(order, dtype=np.int64)
+        durations = np.maximum(bursts[order], 1)
+        # Time the CPU has been busy before each dispatch, if it never idled
+        busy_before = np.concatenate(([0], np.cumsum(durations)[:-1]))
+        dispatch = np.maximum.accumulate(np.maximum(arrivals[order], 1) - busy_before) + busy_before
+        start = np.empty_like(arrivals)
+        start[order] = dispatch
+        end = np.empty_like(arrivals)
+        end[order] = dispatch + durations + end_offset
+        completion = start + bursts
+        turnaround = completion - arrivals
+        waiting = np.maximum(turnaround - bursts, 0)
+        busy_time = int(durations.sum())
+    else:
+        count = len(arrival_times)
+        start = [0] * count
+        end = [0] * count
+        clock = 1
+        busy_time = 0
+        for index in order:
+            clock = max(clock, arrival_times[index])
+            start[index] = clock
+            duration = max(burst_times[index], 1)
+            clock += duration
+            busy_time += duration
+            end[index] = clock + end_offset
+        completion = [s + b for s, b in zip(start, burst_times)]
+        turnaround = [c - a for c, a in zip(completion, arrival_times)]
+        waiting = [max(t - b, 0) for t, b in zip(turnaround, burst_times)]
+
+    return {
+        'order': order,
+        'start_time': start,
+        'completion_time': completion,
+        'end_time': end,
+        'waiting_time': waiting,
+        'turnaround_time': turnaround,
+        'busy_time': busy_time
+    }
+
+def evaluate_table(algorithm: str, table, rows) -> Dict:
+    """Evaluate the processes at ``rows`` of a ``ProcessTable`` in place.
+
+    Writes the final times, remaining time and state of every row into the
+    table columns and returns the ``evaluate_batch`` result as plain lists in
+    ``rows`` order, with ``order`` translated to table rows.
+    """
+    terminated = ProcessTable.state_code(ProcessState.TERMINATED)
+    columns = ('start_time', 'completion_time', 'end_time', 'waiting_time', 'turnaround_time')
+    if np is not None:
+        rows = np.frombuffer(rows, dtype=np.int64) if len(rows) else np.empty(0, dtype=np.int64)
+        arrivals = _column(table.arrival_time)[rows]
+        bursts = _column(table.burst_time)[rows]
+        priorities = _column(table.priority)[rows]
+        result = evaluate_batch(algorithm, arrivals, bursts, priorities)
+        for name in columns:
+            _column(getattr(table, name))[rows] = result[name]
+        _column(table.remaining_time)[rows] = bursts - np.maximum(bursts, 1)
+        _column(table.state, np.int8)[rows] = terminated
+        result['order'] = rows[result['order']]
+        result = {name: value.tolist() if hasattr(value, 'tolist') else value
+                  for name, value in result.items()}
+    else:
+        arrivals = [table.arrival_time[row] for row in rows]
+        bursts = [table.burst_time[row] for row in rows]
+        priorities = [table.priority[row] for row in rows]
+        result = evaluate_batch(algorithm, arrivals, bursts, priorities)
+        for name in columns:
+            column = getattr(table, name)
+            for row, value in zip(rows, result[name]):
+                column[row] = value
+        for row, burst in zip(rows, bursts):
+            table.remaining_time[row] = burst - max(burst, 1)
+            table.state[row] = terminated
+        result['order'] = [rows[index] for index in result['order']]
+    return result
+
+def _as_list(values) -> list:
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+def _column(column, dtype=None):
+    """Writable NumPy view of an ``array`` column, without copying."""
+    return np.frombuffer(column, dtype=dtype or np.int64) if len(column) else np.empty(0, dtype=dtype or np.int64)
@@ -0,0 +1,75 @@
+"""Compare memory use and build time of a scheduler backed by ProcessTable
+against a plain list of per-process objects with a pid index.
+
+Usage: python benchmarks/bench_process_table.py [count ...]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from process_scheduler import ProcessScheduler, ProcessState, ProcessTable
+
+class ObjectProcess:
+    """Per-process object layout the scheduler used before ProcessTable."""
+
+    def __init__(self, pid: int, burst_time: int, arrival_time: int):
+        self.pid = pid
+        self.burst_time = burst_time
+        self.arrival_time = arrival_time
+        self.remaining_time = burst_time
+        self.state = ProcessState.NEW
+        self.waiting_time = 0
+        self.turnaround_time = 0
+        self.completion_time = 0
+        self.start_time = None
+        self.end_time = None
+        self.priority = 0
+
+def make_workload(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    bursts = [rng.randint(1, 1000) for _ in range(count)]
+    arrivals = [rng.randint(0, count) for _ in range(count)]
+    priorities = [rng.randint(0, 4) for _ in range(count)]
+    return bursts, arrivals, priorities
+
+def build_objects(bursts, arrivals, priorities):
+    processes = []
+    index = {}
+    for pid, (burst, arrival, priority) in enumerate(zip(bursts, arrivals, priorities)):
+        process = ObjectProcess(pid, burst, arrival)
+        process.priority = priority
+        processes.append(process)
+        index[pid] = process
+    processes.sort(key=lambda p: p.arrival_time)
+    return processes, index
+
+def build_table(bursts, arrivals, priorities):
+    return ProcessScheduler(ProcessTable.from_columns(bursts, arrivals, priorities))
+
+def measure(build, workload):
+    started = time.perf_counter()
+    result = build(*workload)
+    elapsed = time.perf_counter() - started
+    del result
+    # Measured in a separate run, tracing allocations distorts the timing
+    tracemalloc.start()
+    result = build(*workload)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, memory
+
+def main(counts):
+    print(f"{'processes':>10} {'layout':>8} {'build s':>9} {'bytes/process':>14}")
+    for count in counts:
+        workload = make_workload(count)
+        for name, build in (("objects", build_objects), ("table", build_table)):
+            elapsed, memory = measure(build, workload)
+            print(f"{count:>10} {name:>8} {elapsed:>9.3f} {memory / count:>14.1f}")
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
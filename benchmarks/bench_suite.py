@@ -0,0 +1,180 @@
+"""Benchmark the scheduler end to end on seeded workloads.
+
+Measures, for every workload size:
+
+- engine: simulated ticks per second of ``run_to_completion`` for each
+  algorithm, ``step()`` ticks per second, and ``evaluate()`` time where
+  the closed form applies
+- serialization: latency and payload size of a full state snapshot and of
+  a one-frame state delta, both encoded to JSON
+- ingestion: rows per second of CSV import and of binary table loading
+- api_step: ``/api/step`` requests per second through the Flask test client
+
+Usage: python benchmarks/bench_suite.py [--sizes 100 1000 ...] [--output results.json]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import binary_format
+from ingest import import_processes
+from process_scheduler import ProcessScheduler, ProcessTable
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+def make_workload(count: int, seed: int):
+    """Bursts of 1-10 ticks arriving uniformly at roughly 90% CPU load."""
+    rng = random.Random(seed)
+    bursts = [rng.randint(1, 10) for _ in range(count)]
+    arrivals = [rng.randint(0, 6 * count) for _ in range(count)]
+    priorities = [rng.randint(0, 4) for _ in range(count)]
+    return bursts, arrivals, priorities
+
+def make_scheduler(workload, algorithm: str) -> ProcessScheduler:
+    scheduler = ProcessScheduler(ProcessTable.from_columns(*workload))
+    scheduler.set_algorithm(algorithm)
+    scheduler.start()
+    return scheduler
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+def bench_engine(workload, algorithms, budget: float):
+    results = []
+    for algorithm in algorithms:
+        scheduler = make_scheduler(workload, algorithm)
+        seconds, _ = timed(scheduler.run_to_completion)
+        makespan = scheduler.current_time
+
+        # The tick-by-tick engine, for as many ticks as fit in the budget
+        scheduler = make_scheduler(workload, algorithm)
+        started = time.perf_counter()
+        while not scheduler.is_complete() and time.perf_counter() - started < budget:
+            for _ in range(min(1000, makespan - scheduler.current_time)):
+                scheduler.step()
+        step_seconds = time.perf_counter() - started
+        steps = scheduler.current_time
+
+        result = {
+            'algorithm': algorithm,
+            'makespan': makespan,
+            'run_seconds': seconds,
+            'ticks_per_second': makespan / seconds if seconds else None,
+            'step_ticks_per_second': steps / step_seconds if step_seconds else None
+        }
+        if scheduler.can_evaluate(algorithm):
+            scheduler = ProcessScheduler(ProcessTable.from_columns(*workload))
+            result['evaluate_seconds'], _ = timed(scheduler.evaluate, algorithm)
+        results.append(result)
+    return results
+
+def bench_serialization(workload, algorithm: str):
+    scheduler = make_scheduler(workload, algorithm)
+    # Somewhere in the middle of the run, with every queue populated
+    scheduler.advance(len(workload[0]) * 3)
+    snapshot_seconds, snapshot = timed(lambda: json.dumps(scheduler.get_current_state()))
+    scheduler.take_state_delta()
+    scheduler.advance(1)
+    delta_seconds, delta = timed(lambda: json.dumps(scheduler.take_state_delta()))
+    return {
+        'algorithm': algorithm,
+        'snapshot_seconds': snapshot_seconds,
+        'snapshot_bytes': len(snapshot),
+        'delta_seconds': delta_seconds,
+        'delta_bytes': len(delta)
+    }
+
+def bench_ingestion(workload):
+    bursts, arrivals, priorities = workload
+    body = ''.join(f'{b},{a},{p}\n' for b, a, p in zip(bursts, arrivals, priorities)).encode()
+    csv_stats = import_processes(ProcessScheduler(), io.BytesIO(body), 'csv')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'workload' + binary_format.EXTENSION)
+        binary_format.save_table(ProcessTable.from_columns(*workload), path)
+        load_seconds, table = timed(binary_format.load_table, path)
+    return {
+        'csv_bytes': len(body),
+        'csv_rows_per_second': csv_stats['rows_per_second'],
+        'binary_load_seconds': load_seconds,
+        'binary_rows_per_second': len(table) / load_seconds if load_seconds else None
+    }
+
+def bench_api_step(workload, algorithm: str, requests: int, budget: float):
+    # Imported here so the other benchmarks run without Flask installed
+    import main as web
+
+    # Measure the engine behind the endpoint, not lookups of earlier runs
+    web.simulations.result_cache = None
+    client = web.app.test_client()
+    headers = {'X-Simulation-Id': f'bench-{len(workload[0])}'}
+    scheduler = web.simulations.get(headers['X-Simulation-Id']).scheduler
+    scheduler.load_table(ProcessTable.from_columns(*workload))
+    scheduler.set_algorithm(algorithm)
+    scheduler.start()
+    count = 0
+    started = time.perf_counter()
+    while count < requests and (count == 0 or time.perf_counter() - started < budget):
+        response = client.post('/api/step', headers=headers)
+        response.get_data()
+        count += 1
+    seconds = time.perf_counter() - started
+    return {'algorithm': algorithm, 'requests': count, 'requests_per_second': count / seconds}
+
+def main(args):
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': binary_format.np.__version__ if binary_format.np is not None else None
+        },
+        'seed': args.seed,
+        'sizes': {}
+    }
+    for size in args.sizes:
+        workload = make_workload(size, args.seed)
+        print(f"{size} processes", file=sys.stderr)
+        report['sizes'][str(size)] = result = {
+            'engine': bench_engine(workload, args.algorithms, args.budget),
+            'serialization': bench_serialization(workload, 'rr'),
+            'ingestion': bench_ingestion(workload),
+            'api_step': bench_api_step(workload, 'rr', args.step_requests, args.budget)
+        }
+        for engine in result['engine']:
+            print(f"  {engine['algorithm']:>15} {engine['ticks_per_second']:>14,.0f} ticks/s "
+                  f"{engine['step_ticks_per_second']:>12,.0f} step ticks/s", file=sys.stderr)
+        serialization = result['serialization']
+        print(f"  snapshot {serialization['snapshot_seconds'] * 1000:.2f} ms / {serialization['snapshot_bytes']} B, "
+              f"delta {serialization['delta_seconds'] * 1000:.2f} ms / {serialization['delta_bytes']} B", file=sys.stderr)
+        print(f"  csv {result['ingestion']['csv_rows_per_second']:,.0f} rows/s, "
+              f"binary {result['ingestion']['binary_rows_per_second']:,.0f} rows/s, "
+              f"/api/step {result['api_step']['requests_per_second']:,.1f} req/s", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--algorithms', nargs='+', default=list(ProcessScheduler.ALGORITHMS))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--step-requests', type=int, default=200,
+                        help="maximum /api/step requests per size")
+    parser.add_argument('--budget', type=float, default=5.0,
+                        help="seconds allowed for each open-ended measurement")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    main(parser.parse_args())
@@ -0,0 +1,175 @@
+"""Binary workload and result files that can be memory-mapped.
+
+A file is a 64-byte little-endian header followed by the columns of a
+``ProcessTable``, each stored as one contiguous block of fixed-width
+values: the int64 columns in ``ProcessTable.COLUMNS`` order, then the int8
+``state`` column. The same layout serves as a workload (a table that has
+not run yet) and as a result (a table after a simulation, with
+``current_time`` recorded in the header).
+
+Because the columns are contiguous, ``open_table`` can expose them straight
+from the mapped file without copying, and ``load_table`` builds a
+``ProcessTable`` with one bulk copy per column.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict
+
+from process_scheduler import ProcessTable
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, columns are then exposed as memoryviews
+    np = None
+
+MAGIC = b'PSTABLE\x00'
+VERSION = 1
+# magic, version, column count, row count, first pid, current time
+HEADER = struct.Struct('<8sIIqqq')
+HEADER_SIZE = 64
+COLUMNS = ProcessTable.COLUMNS + ('state',)
+EXTENSION = '.ptab'
+
+def _column_offsets(count: int) -> Dict[str, int]:
+    offsets = {}
+    offset = HEADER_SIZE
+    for name in COLUMNS:
+        offsets[name] = offset
+        offset += count * (1 if name == 'state' else 8)
+    offsets['end'] = offset
+    return offsets
+
+def _column_bytes(column: array) -> bytes:
+    if sys.byteorder != 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return memoryview(column).cast('B')
+
+def write_table(table: ProcessTable, stream, current_time: int = 0):
+    """Write ``table`` (a workload or a finished run) to a binary stream."""
+    header = HEADER.pack(MAGIC, VERSION, len(COLUMNS), len(table), table.first_pid, current_time)
+    stream.write(header.ljust(HEADER_SIZE, b'\x00'))
+    for name in COLUMNS:
+        stream.write(_column_bytes(getattr(table, name)))
+
+def save_table(table: ProcessTable, path: str, current_time: int = 0):
+    """Write ``table`` to ``path``, replacing it atomically."""
+    with open(path + '.tmp', 'wb') as f:
+        write_table(table, f, current_time)
+    os.replace(path + '.tmp', path)
+
+def _read_header(buffer) -> tuple:
+    if len(buffer) < HEADER_SIZE:
+        raise ValueError("File is too short to be a process table")
+    magic, version, columns, count, first_pid, current_time = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a process table file")
+    if version != VERSION or columns != len(COLUMNS):
+        raise ValueError(f"Unsupported process table version {version}")
+    return count, first_pid, current_time
+
+def read_table(stream) -> ProcessTable:
+    """Read a table from a binary stream, one column at a time."""
+    count, first_pid, current_time = _read_header(stream.read(HEADER_SIZE))
+    table = ProcessTable(first_pid)
+    for name in COLUMNS:
+        column = array('b' if name == 'state' else 'q')
+        size = count * column.itemsize
+        data = stream.read(size)
+        if len(data) != size:
+            raise ValueError("Process table file is truncated")
+        column.frombytes(data)
+        if sys.byteorder != 'little':
+            column.byteswap()
+        setattr(table, name, column)
+    table.all_dirty = True
+    return table
+
+class MappedTable:
+    """Read-only, zero-copy view of a process table file.
+
+    Columns are available under the same names as on ``ProcessTable``, as
+    numpy arrays when numpy is installed and as memoryviews otherwise.
+    Both are backed directly by the mapped file.
+
+    A scheduler cannot run on the mapping itself: simulating writes the
+    run columns (state, remaining and result times) of its table in place,
+    so it needs the writable copy ``to_table`` makes. What mapping saves is
+    the transfer: processes that map the same file share its pages and
+    copy the columns from memory in bulk instead of parsing or unpickling
+    them, which is how ``comparison`` hands workloads to its workers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count, self.first_pid, self.current_time = _read_header(self._mmap)
+        self._offsets = offsets = _column_offsets(self.count)
+        if len(self._mmap) < offsets['end']:
+            self._mmap.close()
+            raise ValueError("Process table file is truncated")
+        if sys.byteorder != 'little' and np is None:
+            self._mmap.close()
+            raise ValueError("Mapping process table files on big-endian hosts requires numpy")
+        self._views = []
+        for name in COLUMNS:
+            typecode = 'b' if name == 'state' else 'q'
+            if np is not None:
+                dtype = np.int8 if typecode == 'b' else np.dtype('<i8')
+                column = np.frombuffer(self._mmap, dtype=dtype, count=self.count, offset=offsets[name])
+            else:
+                view = memoryview(self._mmap)[offsets[name]:offsets[name] + self.count * (1 if typecode == 'b' else 8)]
+                column = view.cast(typecode)
+                self._views.extend((view, column))
+            setattr(self, name, column)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def to_table(self) -> ProcessTable:
+        """Copy the mapped columns into a new, writable ``ProcessTable``."""
+        table = ProcessTable(self.first_pid)
+        buffer = memoryview(self._mmap)
+        for name in COLUMNS:
+            column = array('b' if name == 'state' else 'q')
+            start = self._offsets[name]
+            with buffer[start:start + self.count * column.itemsize] as data:
+                column.frombytes(data)
+            if sys.byteorder != 'little':
+                column.byteswap()
+            setattr(table, name, column)
+        buffer.release()
+        table.all_dirty = True
+        return table
+
+    def close(self):
+        for name in COLUMNS:
+            setattr(self, name, None)
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        try:
+            self._mmap.close()
+        except BufferError:
+            # numpy views handed out to callers still reference the mapping;
+            # it is unmapped once they are garbage collected
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_table(path: str) -> MappedTable:
+    """Map a process table file without reading it into memory."""
+    return MappedTable(path)
+
+def load_table(path: str) -> ProcessTable:
+    """Load a process table file into a writable ``ProcessTable``."""
+    with open_table(path) as mapped:
+        return mapped.to_table()
@@ -0,0 +1,181 @@
+"""Periodic snapshots of a running simulation, for seeking back and forth."""
+import bisect
+from array import array
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, rows are then paged in table order
+    np = None
+
+PAGE_SIZE = 512  # Bytes per page of a snapshotted column
+
+class Checkpoint:
+    """Scheduler state at one simulated tick.
+
+    ``columns`` maps a column name to ``(typecode, pages, by_row)``: the
+    column's bytes split into fixed-size pages, in the store's ``row_order``
+    when ``by_row`` is set. ``state`` holds everything else the
+    scheduler needs to resume, as built by ``ProcessScheduler``.
+    """
+
+    __slots__ = ('time', 'columns', 'state', 'state_bytes', 'nbytes')
+
+    def __init__(self, time: int, columns: Dict, state: Dict, state_bytes: int):
+        self.time = time
+        self.columns = columns
+        self.state = state
+        self.state_bytes = state_bytes
+        self.nbytes = 0  # Memory not shared with the previous checkpoint
+
+class CheckpointStore:
+    """Checkpoints taken every ``interval`` ticks within a memory budget.
+
+    Columns are stored copy-on-write at page granularity: a page whose
+    bytes did not change since the previous checkpoint is shared with it
+    rather than copied, so a checkpoint costs roughly the rows that changed
+    in between. That only works if rows changing together sit together, so
+    per-row columns can be paged in ``row_order`` (set with
+    ``order_rows_by``, e.g. by arrival time) instead of table order.
+
+    When the checkpoints outgrow ``max_bytes``, every other one is dropped
+    and the interval doubles, which keeps them evenly spread over the whole
+    run at the price of longer replays.
+    """
+
+    def __init__(self, interval: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        if interval < 1:
+            raise ValueError("Checkpoint interval must be at least 1")
+        self.base_interval = interval
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        self.interval = self.base_interval
+        self._checkpoints: List[Checkpoint] = []
+        self._times: List[int] = []
+        self.nbytes = 0
+        # Tick at which the next checkpoint is due; checked on every tick
+        self.next_time = 0
+        self.row_order = None
+
+    def order_rows_by(self, keys: array):
+        """Page per-row columns in ascending order of ``keys`` from now on.
+
+        Only possible while the store is empty. Without numpy, or when the
+        rows are in order already, table order is kept.
+        """
+        if self._checkpoints:
+            raise ValueError("Row order can only change while there are no checkpoints")
+        self.row_order = None
+        if np is not None and any(keys[row] > keys[row + 1] for row in range(len(keys) - 1)):
+            self.row_order = np.argsort(np.frombuffer(keys, dtype=np.dtype(keys.typecode)), kind='stable')
+
+    def __len__(self) -> int:
+        return len(self._checkpoints)
+
+    def add(self, time: int, row_columns: Dict[str, array], columns: Dict[str, array],
+            state: Dict, state_bytes: int = 0):
+        """Record a checkpoint at ``time``, after the latest one.
+
+        ``row_columns`` hold one value per table row and are paged in
+        ``row_order``; ``columns`` are paged as they are.
+        """
+        if self._times and time <= self._times[-1]:
+            raise ValueError("Checkpoints must be added in time order")
+        previous = self._checkpoints[-1] if self._checkpoints else None
+        paged = {}
+        size = state_bytes
+        for by_row, named in ((True, row_columns), (False, columns)):
+            for name, column in named.items():
+                old_pages = previous.columns[name][1] if previous is not None and name in previous.columns else ()
+                if by_row and self.row_order is not None:
+                    data = np.frombuffer(column, dtype=np.dtype(column.typecode))[self.row_order].tobytes()
+                else:
+                    data = column.tobytes()
+                pages, new_bytes = self._pages(data, old_pages)
+                paged[name] = (column.typecode, pages, by_row)
+                size += 8 * len(pages) + new_bytes
+        checkpoint = Checkpoint(time, paged, state, state_bytes)
+        checkpoint.nbytes = size
+        self._checkpoints.append(checkpoint)
+        self._times.append(time)
+        self.nbytes += checkpoint.nbytes
+        if self.nbytes > self.max_bytes:
+            self._thin()
+        self.next_time = time + self.interval
+
+    def nearest(self, time: int) -> Optional[Checkpoint]:
+        """The latest checkpoint at or before ``time``, or None."""
+        index = bisect.bisect_right(self._times, time)
+        return self._checkpoints[index - 1] if index else None
+
+    def columns(self, checkpoint: Checkpoint) -> Dict[str, array]:
+        """Fresh, writable copies of all columns stored in ``checkpoint``."""
+        columns = {}
+        for name, (typecode, pages, by_row) in checkpoint.columns.items():
+            data = b''.join(pages)
+            if by_row and self.row_order is not None:
+                paged = np.frombuffer(data, dtype=np.dtype(typecode))
+                values = np.empty_like(paged)
+                values[self.row_order] = paged
+                data = values.tobytes()
+            columns[name] = array(typecode, data)
+        return columns
+
+    @staticmethod
+    def _pages(data: bytes, old_pages: tuple) -> tuple:
+        """Split ``data`` into pages, reusing the unchanged ``old_pages``.
+
+        Returns the pages and the number of bytes in new ones.
+        """
+        if np is None or not old_pages:
+            pages = []
+            new_bytes = 0
+            for index, offset in enumerate(range(0, len(data), PAGE_SIZE)):
+                page = data[offset:offset + PAGE_SIZE]
+                if index < len(old_pages) and old_pages[index] == page:
+                    page = old_pages[index]
+                else:
+                    new_bytes += len(page)
+                pages.append(page)
+            return tuple(pages), new_bytes
+
+        # Compare the full pages both versions have in one go
+        old = b''.join(old_pages)
+        common = min(len(data), len(old)) // PAGE_SIZE * PAGE_SIZE
+        pages = list(old_pages[:common // PAGE_SIZE])
+        changed = []
+        if common:
+            differs = np.frombuffer(data, np.uint8, common) != np.frombuffer(old, np.uint8, common)
+            changed = np.flatnonzero(differs.reshape(-1, PAGE_SIZE).any(axis=1)).tolist()
+        for index in changed:
+            pages[index] = data[index * PAGE_SIZE:(index + 1) * PAGE_SIZE]
+        pages.extend(data[offset:offset + PAGE_SIZE] for offset in range(common, len(data), PAGE_SIZE))
+        return tuple(pages), len(changed) * PAGE_SIZE + len(data) - common
+
+    @staticmethod
+    def _unshared_bytes(checkpoint: Checkpoint, previous: Optional[Checkpoint]) -> int:
+        size = checkpoint.state_bytes
+        for name, (_, pages, _) in checkpoint.columns.items():
+            old_pages = previous.columns[name][1] if previous is not None and name in previous.columns else ()
+            size += 8 * len(pages)
+            for index, page in enumerate(pages):
+                if index >= len(old_pages) or old_pages[index] is not page:
+                    size += len(page)
+        return size
+
+    def _thin(self):
+        """Drop every other checkpoint until the rest fit in the budget."""
+        while self.nbytes > self.max_bytes and len(self._checkpoints) > 2:
+            # Keep the first and the latest so seeking never has to replay from scratch
+            kept = self._checkpoints[:-1:2] + self._checkpoints[-1:]
+            self._checkpoints = kept
+            self._times = [checkpoint.time for checkpoint in kept]
+            self.interval *= 2
+            self.nbytes = 0
+            previous = None
+            for checkpoint in kept:
+                checkpoint.nbytes = self._unshared_bytes(checkpoint, previous)
+                self.nbytes += checkpoint.nbytes
+                previous = checkpoint
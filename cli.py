@@ -0,0 +1,162 @@
+"""Headless batch runner: simulate trace files without the web front end.
+
+Usage: python -m process_scheduler run TRACE [TRACE ...] [--algorithms fcfs rr ...]
+       [--quanta 2 4] [--cores 2] [--no-preemptive] [--jobs N]
+       [--format json|csv|binary] [--output PATH]
+
+Traces are CSV, JSON Lines or binary process tables (see ``ingest``), told
+apart by their extension. Each trace is one unit of work: a worker process
+parses it once and runs every algorithm on it, so ``--jobs`` workers keep as
+many cores busy on a directory of traces.
+
+JSON and CSV output hold one record per trace and run with its metrics and
+makespan. Binary output writes the finished process table of every run to
+``PATH/<trace>.<run>.ptab`` (see ``binary_format``), with per-process times
+and the final simulated time.
+
+Only the scheduler core is imported, never Flask or Socket.IO, so starting
+a run costs next to nothing.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+import binary_format
+from comparison import expand_jobs, simulate
+from ingest import detect_format, read_columns
+from process_scheduler import ProcessScheduler, ProcessTable
+
+OUTPUT_FORMATS = ('json', 'csv', 'binary')
+RECORD_FIELDS = ('trace', 'algorithm', 'quantum', 'cores', 'processes')
+
+def load_trace(path: str) -> ProcessTable:
+    """The workload in the trace file at ``path``."""
+    with open(path, 'rb') as f:
+        return ProcessTable.from_columns(*read_columns(f, detect_format(path)))
+
+def _run_label(algorithm: str, quantum, cores) -> str:
+    label = algorithm
+    if quantum is not None:
+        label += f'-q{quantum}'
+    if cores is not None:
+        label += f'-c{cores}'
+    return label
+
+def run_trace(path: str, jobs: Sequence, preemptive: bool = True, table_dir: str = None) -> List[Dict]:
+    """Run every job on the trace at ``path`` and return one record per run.
+
+    With ``table_dir``, each run's finished process table is saved there.
+    """
+    table = load_trace(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    records = []
+    for algorithm, quantum, cores in jobs:
+        scheduler = simulate(table, algorithm, quantum or 2, preemptive, cores or 1)
+        metrics = scheduler.get_performance_metrics()
+        metrics['makespan'] = scheduler.current_time
+        if table_dir is not None:
+            binary_format.save_table(scheduler.table, os.path.join(
+                table_dir, f'{name}.{_run_label(algorithm, quantum, cores)}{binary_format.EXTENSION}'),
+                scheduler.current_time)
+        records.append(dict(trace=path, algorithm=algorithm, quantum=quantum, cores=cores,
+                            processes=len(scheduler.processes), metrics=metrics))
+    return records
+
+def _run_trace_safely(path: str, jobs: Sequence, preemptive: bool, table_dir: str):
+    """``run_trace`` in a worker: a broken trace is reported, not fatal."""
+    try:
+        return run_trace(path, jobs, preemptive, table_dir), None
+    except (OSError, ValueError) as e:
+        return [], f"{path}: {e}"
+
+def run_traces(paths: Sequence[str], jobs: Sequence, preemptive: bool = True, table_dir: str = None,
+               max_workers: int = None):
+    """Run every trace, in parallel, and yield ``(records, error)`` per trace in order."""
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    arguments = (paths, [jobs] * len(paths), [preemptive] * len(paths), [table_dir] * len(paths))
+    if workers <= 1:
+        yield from map(_run_trace_safely, *arguments)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_run_trace_safely, *arguments)
+
+def write_json(records: List[Dict], stream):
+    json.dump(records, stream, indent=2)
+    stream.write('\n')
+
+def write_csv(records: List[Dict], stream):
+    """One row per run; list-valued metrics (per-core figures) are space separated."""
+    metric_names = []
+    for record in records:
+        metric_names.extend(name for name in record['metrics'] if name not in metric_names)
+    writer = csv.writer(stream)
+    writer.writerow(RECORD_FIELDS + tuple(metric_names))
+    for record in records:
+        metrics = record['metrics']
+        values = [' '.join(map(str, value)) if isinstance(value, list) else value
+                  for value in (metrics.get(name, '') for name in metric_names)]
+        writer.writerow([record[field] if record[field] is not None else '' for field in RECORD_FIELDS] + values)
+
+def run_command(args) -> int:
+    try:
+        jobs = expand_jobs(args.algorithms, args.quanta, args.cores)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    table_dir = None
+    if args.format == 'binary':
+        if not args.output or args.output == '-':
+            print("--format binary needs --output DIRECTORY", file=sys.stderr)
+            return 2
+        table_dir = args.output
+        os.makedirs(table_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    records = []
+    failed = 0
+    for trace_records, error in run_traces(args.traces, jobs, args.preemptive, table_dir, args.jobs):
+        if error:
+            failed += 1
+            print(error, file=sys.stderr)
+        records.extend(trace_records)
+
+    if args.format != 'binary':
+        write = write_json if args.format == 'json' else write_csv
+        if args.output and args.output != '-':
+            with open(args.output, 'w', newline='') as f:
+                write(records, f)
+        else:
+            write(records, sys.stdout)
+    print(f"{len(records)} runs on {len(args.traces) - failed} traces in "
+          f"{time.perf_counter() - started:.2f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m process_scheduler', description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="simulate trace files and write their metrics")
+    run.add_argument('traces', nargs='+', metavar='TRACE', help="CSV, JSON Lines or binary (.ptab) workloads")
+    run.add_argument('--algorithms', nargs='+', default=list(ProcessScheduler.ALGORITHMS))
+    run.add_argument('--quanta', type=int, nargs='+', default=[2],
+                     help="Round Robin runs once per quantum; MLFQ and SMP use the first")
+    run.add_argument('--cores', type=int, nargs='+', default=[2], help="SMP runs once per core count")
+    run.add_argument('--no-preemptive', dest='preemptive', action='store_false',
+                     help="run priority scheduling and preemptive SJF without preemption")
+    run.add_argument('--jobs', '-j', type=int, default=None,
+                     help="worker processes (default: one per CPU)")
+    run.add_argument('--format', choices=OUTPUT_FORMATS, default='json')
+    run.add_argument('--output', '-o', help="output file (default: stdout), or directory for binary tables")
+    run.set_defaults(handler=run_command)
+    return parser
+
+def main(argv: Sequence[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
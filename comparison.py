@@ -0,0 +1,124 @@
+"""Run several scheduling algorithms on the same workload in parallel.
+
+Every algorithm (and every Round Robin quantum and SMP core count) is simulated on its own
+copy of the workload in a worker process, so comparisons use all cores and
+never touch the scheduler that drives the live visualization.
+
+Workers do not receive the workload through a pipe: it is saved once as a
+binary process table (see ``binary_format``) and every worker maps that
+file, copying the columns straight out of the shared page cache.
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import binary_format
+from process_scheduler import ProcessScheduler, ProcessTable
+
+_workload: ProcessTable = None
+
+def as_table(workload) -> ProcessTable:
+    """Accept a ``ProcessTable``, a ``ProcessScheduler``, the path of a
+    binary process table file, or an iterable of process dicts
+    (``burst_time``, ``arrival_time``, optional ``priority``)."""
+    if isinstance(workload, ProcessTable):
+        return workload
+    if isinstance(workload, str):
+        return binary_format.load_table(workload)
+    if isinstance(workload, ProcessScheduler):
+        return workload.table
+    burst_times, arrival_times, priorities = [], [], []
+    for process in workload:
+        burst_times.append(process['burst_time'])
+        arrival_times.append(process['arrival_time'])
+        priorities.append(process.get('priority', 0))
+    return ProcessTable.from_columns(burst_times, arrival_times, priorities)
+
+def simulate(table: ProcessTable, algorithm: str, quantum: int = 2, preemptive: bool = True,
+             cores: int = 2) -> ProcessScheduler:
+    """Simulate ``algorithm`` to completion on a private scheduler and return it."""
+    scheduler = ProcessScheduler(table)
+    scheduler.quantum = quantum
+    scheduler.preemptive = preemptive
+    scheduler.cores = cores
+    if scheduler.can_evaluate(algorithm):
+        scheduler.evaluate(algorithm)
+    else:
+        scheduler.set_algorithm(algorithm)
+        scheduler.start()
+        scheduler.run_to_completion()
+    return scheduler
+
+def run_algorithm(table: ProcessTable, algorithm: str, quantum: int = 2, preemptive: bool = True,
+                  cores: int = 2) -> Dict:
+    """Simulate ``algorithm`` to completion on a private scheduler and return its metrics."""
+    scheduler = simulate(table, algorithm, quantum, preemptive, cores)
+    metrics = scheduler.get_performance_metrics()
+    metrics['makespan'] = scheduler.current_time
+    return metrics
+
+def _init_worker(path: str):
+    global _workload
+    _workload = binary_format.load_table(path)
+
+def _run_job(algorithm: str, quantum: int, preemptive: bool, cores: int) -> Dict:
+    return run_algorithm(_workload, algorithm, quantum, preemptive, cores)
+
+def expand_jobs(algorithms: Iterable[str], quanta: Sequence[int] = (2,),
+                cores: Sequence[int] = (2,)) -> List[Tuple[str, Optional[int], Optional[int]]]:
+    """``(algorithm, quantum, cores)`` of every run a comparison makes.
+
+    Round Robin is run once per value in ``quanta``, SMP once per core
+    count in ``cores``; MLFQ and SMP use the first quantum. Settings an
+    algorithm ignores are None.
+    """
+    first_quantum = quanta[0] if quanta else 2
+    jobs = []
+    for algorithm in algorithms:
+        if algorithm not in ProcessScheduler.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if algorithm == "rr":
+            jobs.extend((algorithm, quantum, None) for quantum in quanta)
+        elif algorithm == "smp":
+            jobs.extend((algorithm, first_quantum, count) for count in cores)
+        elif algorithm == "mlfq":
+            jobs.append((algorithm, first_quantum, None))
+        else:
+            jobs.append((algorithm, None, None))
+    return jobs
+
+def compare_algorithms(workload, algorithms: Iterable[str] = ProcessScheduler.ALGORITHMS,
+                       quanta: Sequence[int] = (2,), preemptive: bool = True,
+                       max_workers: int = None, cores: Sequence[int] = (2,)) -> List[Dict]:
+    """Run every algorithm on ``workload`` and return one row of metrics per run.
+
+    Round Robin is run once per value in ``quanta``, SMP once per core count
+    in ``cores``; MLFQ and SMP use the first quantum. Each worker maps the
+    workload file once (``workload`` itself when it is a path), and every
+    run resets its own copy of it.
+    """
+    jobs = expand_jobs(algorithms, quanta, cores)
+    if not jobs:
+        return []
+
+    directory = None
+    if isinstance(workload, str):
+        path = workload
+    else:
+        directory = tempfile.mkdtemp(prefix='process-scheduler-compare-')
+        path = os.path.join(directory, 'workload' + binary_format.EXTENSION)
+        binary_format.save_table(as_table(workload), path)
+    try:
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as executor:
+            futures = [executor.submit(_run_job, algorithm, job_quantum or 2, preemptive, job_cores or 1)
+                       for algorithm, job_quantum, job_cores in jobs]
+            return [
+                {'algorithm': algorithm, 'quantum': job_quantum, 'cores': job_cores, 'metrics': future.result()}
+                for (algorithm, job_quantum, job_cores), future in zip(jobs, futures)
+            ]
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,160 @@
+"""Streaming import of process workloads from CSV or JSON Lines.
+
+Rows are parsed one line at a time straight into typed ``array`` columns,
+so memory grows with the number of processes (24 bytes each) rather than
+with the size of the input text, and the scheduler receives the whole
+workload in a single ``add_processes`` call.
+
+CSV input may start with a header naming ``burst_time``, ``arrival_time``
+and optionally ``priority`` in any order; without a header the columns are
+taken in that order. JSON Lines input holds one object per line with the
+same keys. Binary process table files (see ``binary_format``) are read
+column by column.
+"""
+import codecs
+import csv
+import io
+import json
+import time
+from array import array
+from itertools import compress
+from typing import Dict, Iterator, Tuple
+
+import binary_format
+from process_scheduler import ProcessScheduler
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, binary columns are then checked with min()
+    np = None
+
+FORMATS = ('csv', 'jsonl', 'binary')
+FIELDS = ('burst_time', 'arrival_time', 'priority')
+
+def detect_format(filename: str = None, content_type: str = None) -> str:
+    """Guess the input format from a file name or MIME type, defaulting to CSV."""
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith(binary_format.EXTENSION):
+        return 'binary'
+    if name.endswith('.csv'):
+        return 'csv'
+    content_type = content_type or ''
+    if 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'jsonl'
+    if content_type == 'application/octet-stream':
+        return 'binary'
+    return 'csv'
+
+def _text_lines(stream, encoding: str = 'utf-8', chunk_size: int = 1 << 16) -> Iterator[str]:
+    """Yield lines from a text or binary stream, reading ``chunk_size`` at a time."""
+    if isinstance(stream, io.TextIOBase):
+        yield from stream
+        return
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + decoder.decode(chunk)).split('\n')
+        pending = lines.pop()
+        yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+def _csv_rows(lines: Iterator[str]) -> Iterator[Tuple[int, int, int, int]]:
+    reader = csv.reader(lines)
+    positions = None
+    for line_number, record in enumerate(reader, 1):
+        if not record or not ''.join(record).strip():
+            continue
+        if positions is None:
+            header = [field.strip().lower() for field in record]
+            if 'burst_time' in header and 'arrival_time' in header:
+                positions = [header.index(name) if name in header else None for name in FIELDS]
+                continue
+            positions = [0, 1, 2 if len(record) > 2 else None]
+        try:
+            burst = int(record[positions[0]])
+            arrival = int(record[positions[1]])
+            priority = int(record[positions[2]]) if positions[2] is not None else 0
+        except (IndexError, ValueError):
+            raise ValueError(f"Invalid CSV row on line {line_number}: {record}")
+        yield line_number, burst, arrival, priority
+
+def _jsonl_rows(lines: Iterator[str]) -> Iterator[Tuple[int, int, int, int]]:
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            yield line_number, int(record['burst_time']), int(record['arrival_time']), int(record.get('priority', 0))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Invalid JSON Lines record on line {line_number}")
+
+def check_columns(burst_times: array, arrival_times: array):
+    """Raise ValueError unless every burst time is positive and every arrival
+    time non-negative, naming the first row that is not."""
+    if np is not None:
+        invalid = np.flatnonzero((np.frombuffer(burst_times, dtype=np.int64) < 1)
+                                 | (np.frombuffer(arrival_times, dtype=np.int64) < 0))
+        if not len(invalid):
+            return
+        row = int(invalid[0])
+    else:
+        if not burst_times or (min(burst_times) >= 1 and min(arrival_times) >= 0):
+            return
+        row = next(row for row, (burst, arrival) in enumerate(zip(burst_times, arrival_times))
+                   if burst < 1 or arrival < 0)
+    raise ValueError(f"Row {row + 1}: burst time must be positive and arrival time non-negative")
+
+def read_columns(stream, format: str = 'csv') -> Tuple[array, array, array]:
+    """Parse a workload into ``(burst_times, arrival_times, priorities)`` columns."""
+    if format not in FORMATS:
+        raise ValueError(f"Unknown import format: {format}")
+    if format == 'binary':
+        table = binary_format.read_table(stream)
+        live = [table.row(table.first_pid + row) >= 0 for row in range(len(table))]
+        if all(live):
+            columns = table.burst_time, table.arrival_time, table.priority
+        else:
+            # Deleted processes keep their rows in the file but are not imported
+            columns = tuple(array('q', compress(column, live))
+                            for column in (table.burst_time, table.arrival_time, table.priority))
+        # Nothing in the file has been checked by anyone
+        check_columns(columns[0], columns[1])
+        return columns
+    lines = _text_lines(stream)
+    rows = _csv_rows(lines) if format == 'csv' else _jsonl_rows(lines)
+    burst_times, arrival_times, priorities = array('q'), array('q'), array('q')
+    for line_number, burst, arrival, priority in rows:
+        if burst < 1 or arrival < 0:
+            raise ValueError(f"Line {line_number}: burst time must be positive and arrival time non-negative")
+        burst_times.append(burst)
+        arrival_times.append(arrival)
+        priorities.append(priority)
+    return burst_times, arrival_times, priorities
+
+def import_processes(scheduler: ProcessScheduler, stream, format: str = 'csv') -> Dict:
+    """Stream a workload into ``scheduler`` and report how fast it was ingested.
+
+    Nothing is added if any row is invalid.
+    """
+    started = time.perf_counter()
+    return add_columns(scheduler, read_columns(stream, format), started)
+
+def add_columns(scheduler: ProcessScheduler, columns: Tuple[array, array, array], started: float) -> Dict:
+    """Add columns from ``read_columns`` to ``scheduler`` and report how fast
+    they were ingested since ``started`` (a ``time.perf_counter`` reading)."""
+    burst_times, arrival_times, priorities = columns
+    pids = scheduler.add_processes(burst_times, arrival_times, priorities)
+    seconds = time.perf_counter() - started
+    return {
+        'rows': len(pids),
+        'first_pid': pids.start if pids else None,
+        'seconds': seconds,
+        'rows_per_second': len(pids) / seconds if seconds > 0 else 0.0
+    }
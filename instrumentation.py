@@ -0,0 +1,205 @@
+"""Engine instrumentation: phase timers, counters and an on-demand profiler.
+
+``InstrumentedScheduler`` times the three phases of every simulated tick.
+Because the timing lives in a subclass, the plain ``ProcessScheduler`` pays
+nothing for it; the web app only uses the subclass when started with
+``SCHEDULER_INSTRUMENTATION=1``. Counters such as context switches and
+preemptions are kept by every scheduler.
+
+``render_prometheus`` exports all of it in the Prometheus text format, and
+``Profiler`` wraps chosen code paths in cProfile while switched on.
+"""
+import cProfile
+import io
+import pstats
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterable
+
+from process_scheduler import ProcessScheduler
+
+PHASES = ('update_process_states', 'schedule_next_process', 'update_metrics')
+
+class InstrumentedScheduler(ProcessScheduler):
+    """``ProcessScheduler`` that accumulates the time spent in each engine phase."""
+
+    def __init__(self, table=None, result_cache=None):
+        # Phase totals only ever grow, like the Prometheus counters they feed
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.phase_calls = dict.fromkeys(PHASES, 0)
+        super().__init__(table, result_cache)
+
+    def _reset_metrics(self):
+        super()._reset_metrics()
+        self.max_ready_queue_length = 0
+
+    def _update_process_states(self):
+        started = perf_counter()
+        super()._update_process_states()
+        self.phase_seconds['update_process_states'] += perf_counter() - started
+        self.phase_calls['update_process_states'] += 1
+        if len(self.ready_queue) > self.max_ready_queue_length:
+            self.max_ready_queue_length = len(self.ready_queue)
+
+    def _schedule_next_process(self):
+        started = perf_counter()
+        super()._schedule_next_process()
+        self.phase_seconds['schedule_next_process'] += perf_counter() - started
+        self.phase_calls['schedule_next_process'] += 1
+
+    def _update_metrics(self):
+        started = perf_counter()
+        metrics = super()._update_metrics()
+        self.phase_seconds['update_metrics'] += perf_counter() - started
+        self.phase_calls['update_metrics'] += 1
+        return metrics
+
+class Profiler:
+    """cProfile that is only active around ``profiled()`` blocks while enabled.
+
+    cProfile traces a single thread, so instead of one global session the
+    profile is switched on around each block (simulation frames, step and
+    run requests) in whichever thread runs it.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._profile = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            self._profile = cProfile.Profile()
+            self.enabled = True
+
+    def stop(self, limit: int = 30) -> str:
+        """Stop profiling and return the top functions by cumulative time."""
+        with self._lock:
+            self.enabled = False
+            profile, self._profile = self._profile, None
+        if profile is None:
+            return ''
+        output = io.StringIO()
+        stats = pstats.Stats(profile, stream=output)
+        stats.sort_stats('cumulative').print_stats(limit)
+        return output.getvalue()
+
+    @contextmanager
+    def profiled(self):
+        if not self.enabled:
+            yield
+            return
+        with self._lock:
+            profile = self._profile
+            if profile is None:
+                yield
+                return
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+class _Exposition:
+    """Collects samples grouped by metric so each gets one HELP/TYPE header."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def add(self, name: str, kind: str, help: str, value, **labels):
+        metric = self._metrics.setdefault(name, (kind, help, []))
+        metric[2].append((labels, value))
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, help, samples) in self._metrics.items():
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+def render_prometheus(simulations: Iterable, store_stats: Dict = None, cache_stats: Dict = None,
+                      rate_limit_stats: Dict = None) -> str:
+    """Internal metrics of the given simulations in Prometheus text format."""
+    out = _Exposition()
+    if store_stats is not None:
+        out.add('scheduler_simulations_live', 'gauge', 'Simulations held in memory.', store_stats['live'])
+        out.add('scheduler_simulations_bytes', 'gauge', 'Approximate memory held by live simulations.',
+                store_stats['bytes'])
+        out.add('scheduler_simulations_spilled_total', 'counter', 'Simulations spilled to disk.',
+                store_stats['spilled'])
+        out.add('scheduler_simulations_restored_total', 'counter', 'Simulations restored from disk.',
+                store_stats['restored'])
+        out.add('scheduler_simulations_expired_total', 'counter', 'Spilled simulations deleted unused.',
+                store_stats['expired'])
+    if cache_stats is not None:
+        out.add('scheduler_result_cache_entries', 'gauge', 'Finished runs held in the result cache.',
+                cache_stats['entries'])
+        out.add('scheduler_result_cache_bytes', 'gauge', 'Memory held by the result cache.', cache_stats['bytes'])
+        out.add('scheduler_result_cache_hits_total', 'counter', 'Runs restored from the result cache.',
+                cache_stats['hits'])
+        out.add('scheduler_result_cache_misses_total', 'counter', 'Runs not found in the result cache.',
+                cache_stats['misses'])
+    if rate_limit_stats is not None:
+        out.add('scheduler_rate_limited_clients', 'gauge', 'Clients with a rate limit bucket.',
+                rate_limit_stats['clients'])
+        out.add('scheduler_rate_limited_total', 'counter', 'Submissions refused by per-client rate limits.',
+                rate_limit_stats['limited'])
+
+    for simulation in simulations:
+        scheduler = simulation.scheduler
+        sim = simulation.id
+        out.add('scheduler_time', 'gauge', 'Current simulated time.', scheduler.current_time, simulation=sim)
+        out.add('scheduler_running', 'gauge', 'Whether the simulation is running.', int(scheduler.is_running),
+                simulation=sim)
+        out.add('scheduler_processes', 'gauge', 'Live processes.', len(scheduler.processes), simulation=sim)
+        out.add('scheduler_ready_queue_length', 'gauge', 'Processes in the ready queue.',
+                len(scheduler.ready_queue), simulation=sim)
+        out.add('scheduler_waiting_queue_length', 'gauge', 'Processes that have not arrived yet.',
+                len(scheduler.waiting_queue), simulation=sim)
+        out.add('scheduler_completed_processes', 'gauge', 'Processes that have terminated.',
+                len(scheduler.completed_processes), simulation=sim)
+        out.add('scheduler_pending_commands', 'gauge', 'Commands queued for or running on the simulation.',
+                simulation.pending, simulation=sim)
+        admission = scheduler.admission_stats()
+        if admission['max_ready'] is not None:
+            out.add('scheduler_ready_queue_max', 'gauge', 'Ready queue bound of admission control.',
+                    admission['max_ready'], simulation=sim)
+        out.add('scheduler_deferred_processes', 'gauge', 'Arrived processes waiting for room in the ready queue.',
+                admission['deferred'], simulation=sim)
+        out.add('scheduler_admission_deferrals_total', 'counter', 'Arrivals deferred because the ready queue was full.',
+                admission['deferrals'], simulation=sim)
+        out.add('scheduler_admission_rejected_total', 'counter',
+                'Processes refused because the ready queue was full.', admission['rejected'], simulation=sim)
+        out.add('scheduler_busy_ticks_total', 'counter', 'Ticks the CPU spent running a process.',
+                scheduler.busy_time, simulation=sim)
+        out.add('scheduler_context_switches_total', 'counter', 'Dispatches of a different process.',
+                scheduler.context_switches, simulation=sim)
+        out.add('scheduler_preemptions_total', 'counter',
+                'Running processes put back on the ready queue (quantum expiry or preemption).',
+                scheduler.preemptions, simulation=sim)
+        if scheduler.policy.multicore:
+            for core, ticks in enumerate(scheduler.core_busy):
+                out.add('scheduler_core_busy_ticks_total', 'counter', 'Ticks each core spent running a process.',
+                        ticks, simulation=sim, core=core)
+            out.add('scheduler_steals_total', 'counter', 'Processes an idle core took from another run queue.',
+                    scheduler.steals, simulation=sim)
+        if isinstance(scheduler, InstrumentedScheduler):
+            out.add('scheduler_ready_queue_length_max', 'gauge', 'Longest ready queue seen while stepping.',
+                    scheduler.max_ready_queue_length, simulation=sim)
+            for phase in PHASES:
+                out.add('scheduler_phase_seconds_total', 'counter', 'Time spent in each engine phase.',
+                        scheduler.phase_seconds[phase], simulation=sim, phase=phase)
+                out.add('scheduler_phase_calls_total', 'counter', 'Calls of each engine phase.',
+                        scheduler.phase_calls[phase], simulation=sim, phase=phase)
+    return out.render()
@@ -1,26 +1,286 @@
-from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
+"""Web front end: Flask routes and Socket.IO events around per-session schedulers.
+
+Every scheduler is owned by its ``Simulation``'s writer task; handlers
+submit commands to it with ``simulation.execute`` and serve reads from the
+snapshots ``simulation.read`` caches, never touching a scheduler directly.
+
+The async worker is picked with SCHEDULER_ASYNC_MODE (eventlet, gevent or
+threading). Left unset, Flask-SocketIO uses eventlet or gevent when
+installed and falls back to threads.
+"""
+import os
+
+ASYNC_MODE = os.environ.get('SCHEDULER_ASYNC_MODE') or None
+# Green-thread servers need the standard library patched before anything imports it
+if ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, Response, render_template, jsonify, request, session, abort, send_file, g
+from flask_socketio import SocketIO, emit, join_room
+import copy
+import io
 import json
+import math
+import threading
 import time
-from process_scheduler import ProcessScheduler
+import uuid
+from process_scheduler import AdmissionRejected, ProcessScheduler
+import binary_format
+from admission import RateLimiter
+from comparison import as_table, compare_algorithms, expand_jobs
+from instrumentation import InstrumentedScheduler, Profiler, render_prometheus
+from ingest import add_columns, detect_format, read_columns
+from result_cache import ResultCache
+from sessions import Simulation, SimulationStore
+from sweeps import run_sweep
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'secret!'
-socketio = SocketIO(app)
+socketio = SocketIO(app, async_mode=ASYNC_MODE)
+
+# Every browser session, or explicit simulation id, gets its own scheduler.
+# Phase timers are opt-in since they add a little work to every tick.
+scheduler_class = InstrumentedScheduler if os.environ.get('SCHEDULER_INSTRUMENTATION') == '1' else ProcessScheduler
+# Memory each simulation may spend on checkpoints for seeking
+checkpoint_bytes = int(os.environ.get('SCHEDULER_CHECKPOINT_MB', 64)) * 1024 * 1024
+# Admission control every simulation starts with: a bound on the ready
+# queue (unbounded by default) and what happens to arrivals beyond it
+max_ready = int(os.environ.get('SCHEDULER_MAX_READY', 0)) or None
+admission_policy = os.environ.get('SCHEDULER_ADMISSION', 'defer')
+
+def make_scheduler() -> ProcessScheduler:
+    scheduler = scheduler_class()
+    scheduler.checkpoints.max_bytes = checkpoint_bytes
+    scheduler.set_admission(max_ready, admission_policy)
+    return scheduler
+
+# Backpressure on process submissions: each client may submit
+# SCHEDULER_RATE_LIMIT processes per second (unlimited by default) in bursts
+# of SCHEDULER_RATE_BURST, and no simulation takes submissions while
+# MAX_PENDING_COMMANDS commands are already queued for it
+rate_limit = float(os.environ.get('SCHEDULER_RATE_LIMIT', 0))
+rate_limiter = RateLimiter(rate_limit, float(os.environ.get('SCHEDULER_RATE_BURST', 0)) or None) \
+    if rate_limit > 0 else None
+MAX_PENDING_COMMANDS = int(os.environ.get('SCHEDULER_MAX_PENDING', 64))
+
+# Finished runs are shared by all simulations, and kept on disk too with
+# SCHEDULER_RESULT_CACHE_DIR
+result_cache = ResultCache(int(os.environ.get('SCHEDULER_RESULT_CACHE_MB', 64)) * 1024 * 1024,
+                           os.environ.get('SCHEDULER_RESULT_CACHE_DIR'))
+
+simulations = SimulationStore(scheduler_factory=make_scheduler, spawn=socketio.start_background_task,
+                              result_cache=result_cache)
+
+# cProfile around simulation frames and step/run requests, off by default
+profiler = Profiler()
+if os.environ.get('SCHEDULER_PROFILE') == '1':
+    profiler.start()
+
+# Monte Carlo sweeps started through the API, oldest first:
+# id -> {'cancel': threading.Event, 'progress': latest aggregate}
+sweeps = {}
+MAX_SWEEPS = 16
+SWEEP_OPTIONS = ('workloads', 'processes', 'bursts', 'load', 'algorithms', 'quanta',
+                 'preemptive', 'cores', 'seed', 'confidence')
+
+# Algorithm comparisons started through the API, oldest first:
+# id -> {'comparison_id', 'done', 'results', and 'error' if it failed}
+comparisons = {}
+MAX_COMPARISONS = 16
+
+# Simulation speeds as (frames per second, ticks per frame)
+SIMULATION_SPEEDS = {
+    'slow': (1, 1),
+    'medium': (2, 1),
+    'fast': (10, 1),
+    'turbo': (30, 100)
+}
+
+def simulation_id():
+    """Id of the simulation a request addresses.
+
+    An explicit X-Simulation-Id header or simulation_id query argument lets
+    several clients share one simulation; otherwise each browser session
+    gets its own.
+    """
+    explicit = request.headers.get('X-Simulation-Id') or request.args.get('simulation_id')
+    if explicit:
+        return explicit
+    if 'simulation_id' not in session:
+        session['simulation_id'] = uuid.uuid4().hex
+    return session['simulation_id']
+
+def current_simulation() -> Simulation:
+    """The simulation the request addresses, held until the request ends."""
+    try:
+        simulation = simulations.get(simulation_id())
+    except ValueError as e:
+        abort(400, description=str(e))
+    g.setdefault('simulations', []).append(simulation)
+    return simulation
+
+@app.teardown_request
+def release_simulations(error=None):
+    # Socket.IO events run in a request context too, so this covers them
+    for simulation in g.pop('simulations', ()):
+        simulations.release(simulation)
+
+def apply_speed(simulation_settings, data):
+    """Update simulation_settings from a speed name or explicit rate fields."""
+    speed = data.get('speed')
+    if speed is not None:
+        if speed not in SIMULATION_SPEEDS:
+            raise ValueError(f"Unknown speed: {speed}")
+        frame_rate, ticks_per_frame = SIMULATION_SPEEDS[speed]
+    else:
+        frame_rate = data.get('frame_rate', simulation_settings['frame_rate'])
+        ticks_per_frame = data.get('ticks_per_frame', simulation_settings['ticks_per_frame'])
+    if frame_rate <= 0 or ticks_per_frame <= 0:
+        raise ValueError("frame_rate and ticks_per_frame must be positive")
+    simulation_settings['frame_rate'] = frame_rate
+    simulation_settings['ticks_per_frame'] = ticks_per_frame
+
+def apply_cores(scheduler, data):
+    """Set the number of SMP cores from an optional ``cores`` field."""
+    cores = data.get('cores')
+    if cores is not None:
+        if not isinstance(cores, int) or cores < 1:
+            raise ValueError("cores must be a positive integer")
+        scheduler.cores = cores
+
+def throttle(simulation: Simulation, cost: int):
+    """A 429 response if the client may not submit ``cost`` processes right now, else None."""
+    if simulation.pending >= MAX_PENDING_COMMANDS:
+        return backpressure(simulation, 'busy', "Simulation is busy, try again shortly", 1)
+    if rate_limiter is not None:
+        wait = rate_limiter.acquire(request.remote_addr, cost)
+        if math.isinf(wait):
+            return backpressure(simulation, 'rate_limited',
+                                f"At most {rate_limiter.burst:g} processes can be submitted at once")
+        if wait:
+            return backpressure(simulation, 'rate_limited', "Too many processes submitted, slow down", wait)
+    return None
 
-# Initialize the process scheduler
-scheduler = ProcessScheduler()
+def backpressure(simulation: Simulation, reason: str, message: str, retry_after: float = None,
+                 admission: dict = None):
+    """Tell clients to back off: a 429 response for the caller, and a
+    backpressure event for everyone watching the simulation."""
+    retry_after = math.ceil(retry_after) if retry_after is not None else None
+    payload = {"reason": reason, "message": message, "retry_after": retry_after}
+    if admission is not None:
+        payload["admission"] = admission
+    socketio.emit('backpressure', payload, to=simulation.id)
+    response = jsonify({"status": "error", **payload})
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def broadcast_state(simulation: Simulation):
+    """Send the simulation's clients what changed since the last broadcast.
+
+    Clients get a compact state_delta when the scheduler can describe the
+    change as a patch, and a full state_update snapshot otherwise. Each
+    simulation has its own Socket.IO room. Broadcasting does not change
+    the simulation, only which delta follows the state snapshot, so it
+    leaves every cached snapshot but that one valid.
+    """
+    simulation.execute(emit_state, simulation, mutates=False)
+
+def emit_state(simulation: Simulation):
+    """``broadcast_state`` as a command: emitting on the writer keeps deltas in order."""
+    event, state = state_message(simulation.scheduler)
+    if event == 'state_delta':
+        # Its delta_seq now names the delta just sent
+        simulation.forget('state')
+    socketio.emit(event, state, to=simulation.id)
+
+def state_message(scheduler: ProcessScheduler):
+    """The event and payload telling clients about the latest changes."""
+    delta = scheduler.take_state_delta()
+    if delta is None:
+        return 'state_update', scheduler.get_current_state()
+    return 'state_delta', delta
+
+def json_response(body: bytes) -> Response:
+    return Response(body, mimetype='application/json')
+
+def run_simulation_loop(simulation: Simulation, generation):
+    """Advance one simulation and broadcast one state update per frame.
+
+    Runs as a Socket.IO background task, so the work per frame is the same
+    no matter how many clients are watching.
+    """
+    scheduler = simulation.scheduler
+    settings = simulation.settings
+    deferring = False
+
+    def frame() -> bool:
+        """Advance and broadcast one frame; False once the loop should stop."""
+        nonlocal deferring
+        # Superseded or paused since the last frame
+        if generation != simulation.generation or not scheduler.is_running:
+            return False
+        with profiler.profiled():
+            scheduler.advance(settings['ticks_per_frame'])
+        emit_state(simulation)
+        admission = scheduler.admission_stats()
+        if bool(admission['deferred']) != deferring:
+            # Arrivals started or stopped piling up behind a full ready queue
+            deferring = not deferring
+            socketio.emit('backpressure', {
+                "reason": 'deferred' if deferring else 'cleared',
+                "message": ("Ready queue full, deferring arrivals" if deferring
+                            else "Deferred arrivals admitted"),
+                "retry_after": None,
+                "admission": admission
+            }, to=simulation.id)
+        if scheduler.is_complete():
+            scheduler.pause()
+            socketio.emit('simulation_complete', {'current_time': scheduler.current_time}, to=simulation.id)
+            return False
+        return True
+
+    while True:
+        frame_started = time.perf_counter()
+        if not simulation.execute(frame):
+            break
+        elapsed = time.perf_counter() - frame_started
+        socketio.sleep(max(0, 1 / settings['frame_rate'] - elapsed))
+
+def start_simulation_loop(simulation: Simulation):
+    """Start a new simulation loop, stopping the previous one; a command."""
+    simulation.generation += 1
+    socketio.start_background_task(run_simulation_loop, simulation, simulation.generation)
+
+def queue_full(simulation: Simulation, error: AdmissionRejected):
+    """429 response for processes refused by the scheduler's admission control."""
+    admission = simulation.execute(simulation.scheduler.admission_stats, mutates=False)
+    return backpressure(simulation, 'queue_full', str(error), 1, admission)
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    simulation = current_simulation()
+    # Requests made by the page address the simulation it was opened for
+    session['simulation_id'] = simulation.id
+    return render_template('index.html', simulation_id=simulation.id)
 
 @app.route('/api/processes', methods=['GET'])
 def get_processes():
-    return jsonify(scheduler.get_processes())
+    return json_response(current_simulation().read('processes', ProcessScheduler.get_processes))
+
+@app.route('/api/state', methods=['GET'])
+def get_state():
+    return json_response(current_simulation().read('state', ProcessScheduler.get_current_state))
 
 @app.route('/api/processes', methods=['POST'])
 def add_process():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
     try:
         data = request.json
         burst_time = data.get('burst_time')
@@ -32,16 +292,25 @@ def add_process():
                 "status": "error",
                 "message": "Missing required fields"
             }), 400
+        throttled = throttle(simulation, 1)
+        if throttled is not None:
+            return throttled
         
-        scheduler.add_process(burst_time, arrival_time, priority)
+        def command():
+            scheduler.admit(1)
+            scheduler.add_process(burst_time, arrival_time, priority)
+            return scheduler.get_processes()
+        processes = simulation.execute(command)
         # Send updated state after adding process
-        socketio.emit('state_update', scheduler.get_current_state())
+        broadcast_state(simulation)
         
         return jsonify({
             "status": "success",
             "message": "Process added successfully",
-            "processes": scheduler.get_processes()
+            "processes": processes
         })
+    except AdmissionRejected as e:
+        return queue_full(simulation, e)
     except Exception as e:
         print(f"Error adding process: {str(e)}")
         return jsonify({
@@ -51,6 +320,8 @@ def add_process():
 
 @app.route('/api/processes/<int:pid>', methods=['PUT'])
 def update_process(pid):
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
     try:
         data = request.json
         burst_time = data.get('burst_time')
@@ -63,14 +334,18 @@ def update_process(pid):
                 "message": "Missing required fields"
             }), 400
         
-        success = scheduler.update_process(pid, burst_time, arrival_time, priority)
-        if success:
+        def command():
+            if not scheduler.update_process(pid, burst_time, arrival_time, priority):
+                return None
+            return scheduler.get_processes()
+        processes = simulation.execute(command)
+        if processes is not None:
             # Send updated state after updating process
-            socketio.emit('state_update', scheduler.get_current_state())
+            broadcast_state(simulation)
             return jsonify({
                 "status": "success",
                 "message": "Process updated successfully",
-                "processes": scheduler.get_processes()
+                "processes": processes
             })
         return jsonify({
             "status": "error",
@@ -85,15 +360,21 @@ def update_process(pid):
 
 @app.route('/api/processes/<int:pid>', methods=['DELETE'])
 def delete_process(pid):
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
     try:
-        success = scheduler.delete_process(pid)
-        if success:
+        def command():
+            if not scheduler.delete_process(pid):
+                return None
+            return scheduler.get_processes()
+        processes = simulation.execute(command)
+        if processes is not None:
             # Send updated state after deleting process
-            socketio.emit('state_update', scheduler.get_current_state())
+            broadcast_state(simulation)
             return jsonify({
                 "status": "success",
                 "message": "Process deleted successfully",
-                "processes": scheduler.get_processes()
+                "processes": processes
             })
         return jsonify({
             "status": "error",
@@ -108,16 +389,34 @@ def delete_process(pid):
 
 @app.route('/api/processes/generate', methods=['POST'])
 def generate_processes():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
     try:
         count = request.json.get('count', 5)
-        scheduler.generate_random_processes(count)
+        if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+            return jsonify({
+                "status": "error",
+                "message": "count must be a non-negative integer"
+            }), 400
+        throttled = throttle(simulation, count)
+        if throttled is not None:
+            return throttled
+
+        def command():
+            # The generated processes replace the workload
+            scheduler.admit(count, replace=True)
+            scheduler.generate_random_processes(count)
+            return scheduler.get_processes()
+        processes = simulation.execute(command)
         # Send updated state after generating processes
-        socketio.emit('state_update', scheduler.get_current_state())
+        broadcast_state(simulation)
         return jsonify({
             "status": "success",
             "message": f"Generated {count} random processes",
-            "processes": scheduler.get_processes()
+            "processes": processes
         })
+    except AdmissionRejected as e:
+        return queue_full(simulation, e)
     except Exception as e:
         print(f"Error generating processes: {str(e)}")
         return jsonify({
@@ -125,31 +424,196 @@ def generate_processes():
             "message": f"Failed to generate processes: {str(e)}"
         }), 500
 
+@app.route('/api/processes/batch', methods=['POST'])
+def batch_processes():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
+    try:
+        data = request.json
+        # Either {"ops": [...]} or the list of ops itself
+        ops = data.get('ops') if isinstance(data, dict) else data
+        if not isinstance(ops, list):
+            return jsonify({
+                "status": "error",
+                "message": "Expected a list of operations"
+            }), 400
+
+        adds = [op for op in ops if isinstance(op, dict) and op.get('op') == 'add']
+        throttled = throttle(simulation, len(adds))
+        if throttled is not None:
+            return throttled
+
+        def command():
+            scheduler.admit(len(adds))
+            return scheduler.apply_batch(ops)
+        summary = simulation.execute(command)
+        # One update for the whole batch
+        broadcast_state(simulation)
+        return jsonify({
+            "status": "success",
+            "message": f"Applied {len(ops)} operations",
+            **summary
+        })
+    except AdmissionRejected as e:
+        return queue_full(simulation, e)
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        print(f"Error applying batch: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to apply batch: {str(e)}"
+        }), 500
+
+@app.route('/api/admission', methods=['GET'])
+def get_admission():
+    simulation = current_simulation()
+    return jsonify({
+        "status": "success",
+        **simulation.execute(simulation.scheduler.admission_stats, mutates=False)
+    })
+
+@app.route('/api/admission', methods=['POST'])
+def set_admission():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
+    data = request.json or {}
+
+    def command():
+        scheduler.set_admission(data.get('max_ready', scheduler.max_ready), data.get('policy', scheduler.admission))
+        return scheduler.admission_stats()
+    try:
+        admission = simulation.execute(command)
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    return jsonify({
+        "status": "success",
+        "message": "Admission control updated",
+        **admission
+    })
+
+@app.route('/api/processes/import', methods=['POST'])
+def import_process_file():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
+    try:
+        # Either a multipart upload or a raw (possibly chunked) CSV/JSONL body
+        upload = request.files.get('file')
+        if upload is not None:
+            stream = upload.stream
+            format = detect_format(upload.filename, upload.mimetype)
+        else:
+            stream = request.stream
+            format = detect_format(content_type=request.mimetype)
+        format = request.args.get('format', format)
+
+        # Parsed before queueing, so the processes can be charged like any other submission
+        started = time.perf_counter()
+        columns = read_columns(stream, format)
+        rows = len(columns[0])
+        throttled = throttle(simulation, rows)
+        if throttled is not None:
+            return throttled
+
+        def command():
+            scheduler.admit(rows)
+            return add_columns(scheduler, columns, started)
+        stats = simulation.execute(command)
+        # Send updated state after importing processes
+        broadcast_state(simulation)
+        return jsonify({
+            "status": "success",
+            "message": f"Imported {stats['rows']} processes",
+            **stats
+        })
+    except AdmissionRejected as e:
+        return queue_full(simulation, e)
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        print(f"Error importing processes: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to import processes: {str(e)}"
+        }), 500
+
+@app.route('/api/export', methods=['GET'])
+def export_simulation():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
+    # The workload, or the results so far once the simulation has run
+    buffer = io.BytesIO()
+    simulation.execute(lambda: binary_format.write_table(scheduler.table, buffer, scheduler.current_time),
+                       mutates=False)
+    buffer.seek(0)
+    return send_file(buffer, mimetype='application/octet-stream', as_attachment=True,
+                     download_name='simulation' + binary_format.EXTENSION)
+
+@app.route('/api/timeline', methods=['GET'])
+def get_timeline():
+    simulation = current_simulation()
+    try:
+        start = int(request.args.get('from', 0))
+        end = request.args.get('to')
+        end = int(end) if end is not None else None
+        resolution = request.args.get('resolution')
+        resolution = int(resolution) if resolution is not None else None
+        if start < 0 or (end is not None and end < start) or (resolution is not None and resolution < 1):
+            raise ValueError("Expected 0 <= from <= to and resolution >= 1")
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": f"Invalid timeline range: {str(e)}"
+        }), 400
+    return jsonify(simulation.execute(simulation.scheduler.get_timeline, start, end, resolution, mutates=False))
+
 @app.route('/api/start', methods=['POST'])
 def start_simulation():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
     try:
         data = request.json
         algorithm = data.get('algorithm', 'fcfs')
-        
-        # Check if there are any processes
-        if not scheduler.processes:
+
+        def command():
+            # Check if there are any processes
+            if not scheduler.processes:
+                return None
+            apply_speed(simulation.settings, data)
+            apply_cores(scheduler, data)
+            # Set algorithm and start simulation
+            scheduler.set_algorithm(algorithm)
+            scheduler.start()
+            # Send initial state, the simulation loop pushes the rest
+            emit_state(simulation)
+            start_simulation_loop(simulation)
+            return scheduler.get_current_state()
+        state = simulation.execute(command)
+        if state is None:
             return jsonify({
                 "status": "error",
                 "message": "No processes available. Please add processes first."
             }), 400
         
-        # Set algorithm and start simulation
-        scheduler.set_algorithm(algorithm)
-        scheduler.start()
-        
-        # Send initial state
-        socketio.emit('state_update', scheduler.get_current_state())
-        
         return jsonify({
             "status": "success",
             "message": f"Simulation started with {algorithm} algorithm",
-            "state": scheduler.get_current_state()
+            "state": state
         })
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
     except Exception as e:
         print(f"Error starting simulation: {str(e)}")
         return jsonify({
@@ -159,8 +623,9 @@ def start_simulation():
 
 @app.route('/api/pause', methods=['POST'])
 def pause_simulation():
+    simulation = current_simulation()
     try:
-        scheduler.pause()
+        simulation.execute(simulation.scheduler.pause)
         return jsonify({
             "status": "success",
             "message": "Simulation paused"
@@ -172,12 +637,33 @@ def pause_simulation():
             "message": f"Failed to pause simulation: {str(e)}"
         }), 500
 
+@app.route('/api/speed', methods=['POST'])
+def set_simulation_speed():
+    simulation = current_simulation()
+    try:
+        data = request.json or {}
+        simulation.execute(apply_speed, simulation.settings, data)
+        return jsonify({
+            "status": "success",
+            "message": "Simulation speed updated",
+            "settings": dict(simulation.settings)
+        })
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
 @app.route('/api/reset', methods=['POST'])
 def reset_simulation():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
     try:
-        scheduler.reset()
-        # Send updated state after reset
-        socketio.emit('state_update', scheduler.get_current_state())
+        def command():
+            scheduler.reset()
+            # Send updated state after reset
+            emit_state(simulation)
+        simulation.execute(command)
         return jsonify({
             "status": "success",
             "message": "Simulation reset"
@@ -189,11 +675,42 @@ def reset_simulation():
             "message": f"Failed to reset simulation: {str(e)}"
         }), 500
 
+@app.route('/api/seek', methods=['POST'])
+def seek_simulation():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
+    try:
+        data = request.json or {}
+        target = int(data['time'])
+
+        def command():
+            with profiler.profiled():
+                scheduler.seek(target)
+            emit_state(simulation)
+            return scheduler.get_current_state()
+        return jsonify(simulation.execute(command))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({
+            "status": "error",
+            "message": f"Invalid seek time: {str(e)}"
+        }), 400
+    except Exception as e:
+        print(f"Error seeking simulation: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to seek simulation: {str(e)}"
+        }), 500
+
 @app.route('/api/step', methods=['POST'])
 def step_simulation():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
     try:
-        scheduler.step()
-        return jsonify(scheduler.get_current_state())
+        def command():
+            with profiler.profiled():
+                scheduler.step()
+            return scheduler.get_current_state()
+        return jsonify(simulation.execute(command))
     except Exception as e:
         print(f"Error stepping simulation: {str(e)}")
         return jsonify({
@@ -201,15 +718,234 @@ def step_simulation():
             "message": f"Failed to step simulation: {str(e)}"
         }), 500
 
+@app.route('/api/run', methods=['POST'])
+def run_simulation():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
+    try:
+        data = request.json or {}
+        algorithm = data.get('algorithm', 'fcfs')
+
+        def command():
+            if not scheduler.processes:
+                return None
+            apply_cores(scheduler, data)
+            # No animation is needed, so compute the final state directly:
+            # in closed form when the algorithm allows it, otherwise with the
+            # event-driven engine
+            with profiler.profiled():
+                if scheduler.can_evaluate(algorithm):
+                    scheduler.evaluate(algorithm)
+                else:
+                    scheduler.set_algorithm(algorithm)
+                    scheduler.start()
+                    scheduler.run_to_completion()
+            emit_state(simulation)
+            return scheduler.get_current_state()
+        state = simulation.execute(command)
+        if state is None:
+            return jsonify({
+                "status": "error",
+                "message": "No processes available. Please add processes first."
+            }), 400
+
+        return jsonify({
+            "status": "success",
+            "message": f"Simulation completed with {algorithm} algorithm",
+            "state": state
+        })
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        print(f"Error running simulation: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to run simulation: {str(e)}"
+        }), 500
+
+@app.route('/api/compare', methods=['POST'])
+def compare_simulations():
+    simulation = current_simulation()
+    scheduler = simulation.scheduler
+    try:
+        data = request.json or {}
+        algorithms = data.get('algorithms', list(ProcessScheduler.ALGORITHMS))
+        # Copy what the comparison needs in one command, so the runs below
+        # don't hold up the simulation and see a consistent workload
+        workload, quantum, cores, preemptive = simulation.execute(
+            lambda: (copy.deepcopy(scheduler.table), scheduler.quantum, scheduler.cores, scheduler.preemptive),
+            mutates=False)
+        quanta = data.get('quanta', [quantum])
+        cores = data.get('cores', [cores])
+        # Compare on the submitted workload, or on the current one
+        if data.get('processes'):
+            workload = data['processes']
+        elif not len(workload):
+            return jsonify({
+                "status": "error",
+                "message": "No processes available. Please add processes first."
+            }), 400
+
+        # Checked here so bad settings fail the request rather than the comparison
+        expand_jobs(algorithms, quanta, cores)
+        table = as_table(workload)
+
+        # Runs in the background: the results are emitted to the simulation's
+        # room as comparison_complete, and kept for polling
+        finished = [key for key, comparison in comparisons.items() if comparison['done']]
+        while len(comparisons) >= MAX_COMPARISONS and finished:
+            del comparisons[finished.pop(0)]
+        comparison_id = uuid.uuid4().hex
+        comparisons[comparison_id] = {'comparison_id': comparison_id, 'done': False, 'results': None}
+        socketio.start_background_task(run_comparison_task, comparison_id, table, algorithms, quanta, preemptive,
+                                       cores, simulation.id)
+        return jsonify({
+            "status": "success",
+            "message": "Comparison started",
+            "comparison_id": comparison_id
+        }), 202
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        print(f"Error comparing algorithms: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to compare algorithms: {str(e)}"
+        }), 500
+
+def run_comparison_task(comparison_id, table, algorithms, quanta, preemptive, cores, room):
+    """Run a comparison off the request and send its results to the room that started it."""
+    comparison = comparisons[comparison_id]
+    try:
+        comparison['results'] = compare_algorithms(table, algorithms, quanta, preemptive, cores=cores)
+    except Exception as e:
+        print(f"Error comparing algorithms: {str(e)}")
+        comparison['error'] = str(e)
+    comparison['done'] = True
+    socketio.emit('comparison_complete', comparison, to=room)
+
+@app.route('/api/compare/<comparison_id>', methods=['GET'])
+def get_comparison(comparison_id):
+    if comparison_id not in comparisons:
+        return jsonify({
+            "status": "error",
+            "message": "Comparison not found"
+        }), 404
+    return jsonify(comparisons[comparison_id])
+
+def run_sweep_task(sweep_id, progress, room):
+    """Forward a sweep's partial aggregates to the room that started it."""
+    sweep = sweeps[sweep_id]
+    try:
+        for result in progress:
+            sweep['progress'] = dict(result, sweep_id=sweep_id)
+            socketio.emit('sweep_progress', sweep['progress'], to=room)
+            socketio.sleep(0)
+    except Exception as e:
+        print(f"Error running sweep: {str(e)}")
+        sweep['progress'] = dict(sweep['progress'], done=True, error=str(e))
+        socketio.emit('sweep_progress', sweep['progress'], to=room)
+
+@app.route('/api/sweeps', methods=['POST'])
+def start_sweep():
+    data = request.json or {}
+    unknown = set(data) - set(SWEEP_OPTIONS)
+    if unknown:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown sweep options: {', '.join(sorted(unknown))}"
+        }), 400
+    cancel = threading.Event()
+    try:
+        progress = run_sweep(cancel=cancel, **dict({'workloads': 100}, **data))
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
+    # Make room by forgetting the oldest finished sweeps
+    finished = [key for key, sweep in sweeps.items() if sweep['progress']['done']]
+    while len(sweeps) >= MAX_SWEEPS and finished:
+        del sweeps[finished.pop(0)]
+    sweep_id = uuid.uuid4().hex
+    sweeps[sweep_id] = {'cancel': cancel, 'progress': {'sweep_id': sweep_id, 'completed': 0,
+                                                       'done': False, 'results': {}}}
+    socketio.start_background_task(run_sweep_task, sweep_id, progress, current_simulation().id)
+    return jsonify({
+        "status": "success",
+        "message": "Sweep started",
+        "sweep_id": sweep_id
+    }), 202
+
+@app.route('/api/sweeps/<sweep_id>', methods=['GET'])
+def get_sweep(sweep_id):
+    if sweep_id not in sweeps:
+        return jsonify({
+            "status": "error",
+            "message": "Sweep not found"
+        }), 404
+    return jsonify(sweeps[sweep_id]['progress'])
+
+@app.route('/api/sweeps/<sweep_id>/cancel', methods=['POST'])
+def cancel_sweep(sweep_id):
+    if sweep_id not in sweeps:
+        return jsonify({
+            "status": "error",
+            "message": "Sweep not found"
+        }), 404
+    sweeps[sweep_id]['cancel'].set()
+    return jsonify({
+        "status": "success",
+        "message": "Sweep cancelled"
+    })
+
+@app.route('/api/metrics/internal', methods=['GET'])
+def internal_metrics():
+    # Prometheus text exposition format
+    body = render_prometheus(simulations.live(), simulations.stats(), simulations.result_cache.stats(),
+                             rate_limiter.stats() if rate_limiter is not None else None)
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/profile', methods=['POST'])
+def toggle_profiler():
+    enabled = (request.json or {}).get('enabled', True)
+    if enabled:
+        profiler.start()
+        return jsonify({
+            "status": "success",
+            "message": "Profiling started"
+        })
+    return jsonify({
+        "status": "success",
+        "message": "Profiling stopped",
+        "stats": profiler.stop()
+    })
+
 @socketio.on('connect')
 def handle_connect():
     print('Client connected')
+    simulation = current_simulation()
+    session['simulation_id'] = simulation.id
+    join_room(simulation.id)
     # Send initial state to new client
-    emit('state_update', scheduler.get_current_state())
+    emit('state_update', simulation.execute(simulation.scheduler.get_current_state, mutates=False))
+
+@socketio.on('resync')
+def handle_resync():
+    # The client missed a delta, send it a fresh snapshot
+    simulation = current_simulation()
+    emit('state_update', simulation.execute(simulation.scheduler.get_current_state, mutates=False))
 
 @socketio.on('disconnect')
 def handle_disconnect():
     print('Client disconnected')
 
 if __name__ == '__main__':
-    socketio.run(app, debug=True) 
+    socketio.run(app, debug=os.environ.get('FLASK_DEBUG') == '1') 
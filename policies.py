@@ -0,0 +1,287 @@
+"""Scheduling policies and the registry the scheduler looks them up in.
+
+``ProcessScheduler`` owns the engine: it dispatches processes, runs them
+tick by tick, records start, waiting, completion and end times, counts
+context switches and preemptions, and skips quiet ticks in the
+event-driven engine. A policy only decides *which* ready process runs next
+and *when* a running one has to give up its CPU, so an improvement to the
+engine applies to every policy at once.
+
+A new policy subclasses ``SchedulingPolicy`` and registers under the name
+passed to ``set_algorithm``::
+
+    @register_policy
+    class LotteryPolicy(SchedulingPolicy):
+        name = "lottery"
+        ...
+"""
+from typing import Dict, Optional, Type
+
+from ready_queues import FifoReadyQueue, HeapReadyQueue, MultilevelReadyQueue, PerCoreReadyQueue
+
+POLICIES: Dict[str, Type['SchedulingPolicy']] = {}
+
+def register_policy(cls: Type['SchedulingPolicy']) -> Type['SchedulingPolicy']:
+    """Class decorator making a policy available under ``cls.name``."""
+    if not cls.name:
+        raise ValueError("A scheduling policy needs a name")
+    POLICIES[cls.name] = cls
+    return cls
+
+def policy_class(name: str) -> Type['SchedulingPolicy']:
+    """The policy registered as ``name``."""
+    try:
+        return POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {name}") from None
+
+class SchedulingPolicy:
+    """Picks the process to dispatch and decides preemption.
+
+    One instance is created per scheduler and algorithm, on every reset, and
+    reads whatever it needs (quantum, current time, the ready queue) from
+    ``scheduler``. The defaults describe non-preemptive FIFO scheduling.
+    """
+
+    name: str = None
+    # A preempted process is replaced by the next one within the same tick
+    # (True), or its CPU stays idle until the next tick dispatches (False)
+    switch_on_preempt = False
+    # end_time of a process that completes on tick t is t + end_offset
+    end_offset = 1
+    # Several CPUs with per-core run queues and timelines
+    multicore = False
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+
+    @property
+    def cores(self) -> int:
+        """Number of CPUs the engine runs."""
+        return 1
+
+    def make_ready_queue(self):
+        return FifoReadyQueue()
+
+    def begin_tick(self):
+        """Called on every tick before any process is dispatched."""
+
+    def pick(self, core: int) -> Optional[int]:
+        """Remove and return the pid ``core`` should run next, or None."""
+        queue = self.scheduler.ready_queue
+        return queue.pop() if queue else None
+
+    def pick_preempting(self, core: int) -> int:
+        """Remove and return the pid replacing a process preempted on ``core``
+        (only with ``switch_on_preempt``, and ``should_preempt`` found one)."""
+        return self.pick(core)
+
+    def should_preempt(self, process, core: int) -> bool:
+        """Whether ``process``, which just ran on ``core``, has to give it up."""
+        return False
+
+    def requeue(self, process, core: int):
+        """Put a preempted ``process`` back on the ready queue."""
+        self.scheduler.ready_queue.push(process.pid)
+
+    def quiet_ticks(self, process, core: int) -> Optional[int]:
+        """Ticks ``process`` can keep running on ``core`` before the policy
+        may preempt it, assuming nothing arrives; None if unlimited."""
+        return None
+
+    def fast_forwarded(self, process, core: int):
+        """Called after the engine ran ``process`` on ``core`` through quiet
+        ticks in one jump, to catch up on whatever they would have changed."""
+
+@register_policy
+class FcfsPolicy(SchedulingPolicy):
+    """First Come First Serve: run processes to completion in arrival order."""
+
+    name = "fcfs"
+
+@register_policy
+class SjfPolicy(SchedulingPolicy):
+    """Shortest Job First, non-preemptive."""
+
+    name = "sjf"
+    end_offset = 0
+
+    def make_ready_queue(self):
+        return HeapReadyQueue(self._remaining_time)
+
+    def pick_preempting(self, core: int) -> int:
+        return self.scheduler.ready_queue.pop(sort=False)
+
+    # Heap keys are bound methods rather than lambdas so schedulers pickle
+    def _remaining_time(self, pid: int) -> int:
+        table = self.scheduler.table
+        return table.remaining_time[pid - table.first_pid]
+
+@register_policy
+class SjfPreemptivePolicy(SjfPolicy):
+    """Shortest Job First, preempted as soon as a shorter job is ready."""
+
+    name = "sjf_preemptive"
+    switch_on_preempt = True
+    end_offset = 1
+
+    def should_preempt(self, process, core: int) -> bool:
+        queue = self.scheduler.ready_queue
+        return (self.scheduler.preemptive and bool(queue)
+                and self._remaining_time(queue.peek()) < process.remaining_time)
+
+@register_policy
+class PriorityPolicy(SchedulingPolicy):
+    """Priority scheduling, lower number first, preemptive unless disabled."""
+
+    name = "priority"
+    switch_on_preempt = True
+    end_offset = 0
+
+    def make_ready_queue(self):
+        return HeapReadyQueue(self._priority)
+
+    def pick_preempting(self, core: int) -> int:
+        return self.scheduler.ready_queue.pop(sort=False)
+
+    def _priority(self, pid: int) -> int:
+        table = self.scheduler.table
+        return table.priority[pid - table.first_pid]
+
+    def should_preempt(self, process, core: int) -> bool:
+        queue = self.scheduler.ready_queue
+        return self.scheduler.preemptive and bool(queue) and self._priority(queue.peek()) < process.priority
+
+@register_policy
+class RoundRobinPolicy(SchedulingPolicy):
+    """Round Robin: requeue the running process when its quantum expires.
+
+    A process whose quantum expires while no other process is ready keeps
+    its CPU and starts a new quantum, so a lone process runs without being
+    sliced and the engine can skip straight to the next arrival.
+    """
+
+    name = "rr"
+
+    def should_preempt(self, process, core: int) -> bool:
+        scheduler = self.scheduler
+        if scheduler.core_quantum[core] < scheduler.quantum:
+            return False
+        if self._contended(core):
+            return True
+        scheduler.core_quantum[core] = 0
+        return False
+
+    def _contended(self, core: int) -> bool:
+        """Whether another process could take ``core`` if it were preempted."""
+        return bool(self.scheduler.ready_queue)
+
+    def quiet_ticks(self, process, core: int) -> Optional[int]:
+        if not self._contended(core):
+            return None
+        return self.scheduler.quantum - self.scheduler.core_quantum[core] - 1
+
+    def fast_forwarded(self, process, core: int):
+        # Every quantum that expired meanwhile started over
+        self.scheduler.core_quantum[core] %= self.scheduler.quantum
+
+@register_policy
+class MlfqPolicy(SchedulingPolicy):
+    """Multilevel Feedback Queue.
+
+    Processes start on level 0 and drop a level whenever they use up the
+    quantum of their level, which doubles with every level. Lower levels
+    are served first; a process that waits ``aging`` ticks on its level
+    is promoted one level so long jobs cannot starve. A process that uses
+    up its quantum while no other process is ready drops a level but keeps
+    its CPU.
+    """
+
+    name = "mlfq"
+
+    def make_ready_queue(self):
+        return MultilevelReadyQueue(self.scheduler.mlfq_levels, self._clock)
+
+    def _clock(self) -> int:
+        return self.scheduler.current_time
+
+    def _level_quantum(self, level: int) -> int:
+        return self.scheduler.quantum << level
+
+    def begin_tick(self):
+        self.scheduler.ready_queue.age(self.scheduler.aging)
+
+    def should_preempt(self, process, core: int) -> bool:
+        scheduler = self.scheduler
+        queue = scheduler.ready_queue
+        level = queue.level_of(process.pid)
+        if scheduler.core_quantum[core] >= self._level_quantum(level):
+            if queue:
+                return True
+            # Nothing else to run: move down one level in place
+            level = min(level + 1, scheduler.mlfq_levels - 1)
+            queue.set_level(process.pid, level)
+            scheduler.core_quantum[core] = 0
+            return False
+        # A process on a higher level is waiting
+        return bool(queue) and queue.top_level() < level
+
+    def fast_forwarded(self, process, core: int):
+        # Every quantum that expired meanwhile moved the process down a level
+        scheduler = self.scheduler
+        queue = scheduler.ready_queue
+        level = queue.level_of(process.pid)
+        used = scheduler.core_quantum[core]
+        while used >= self._level_quantum(level) and level < scheduler.mlfq_levels - 1:
+            used -= self._level_quantum(level)
+            level += 1
+        queue.set_level(process.pid, level)
+        scheduler.core_quantum[core] = used % self._level_quantum(level)
+
+    def requeue(self, process, core: int):
+        scheduler = self.scheduler
+        level = scheduler.ready_queue.level_of(process.pid)
+        if scheduler.core_quantum[core] >= self._level_quantum(level):
+            # Used up the quantum of its level: move down one level
+            level = min(level + 1, scheduler.mlfq_levels - 1)
+        scheduler.ready_queue.push(process.pid, level)
+
+    def quiet_ticks(self, process, core: int) -> Optional[int]:
+        scheduler = self.scheduler
+        if not scheduler.ready_queue:
+            return None
+        level = scheduler.ready_queue.level_of(process.pid)
+        ticks = self._level_quantum(level) - scheduler.core_quantum[core] - 1
+        # A promotion may lift a waiting process above the running one
+        promotion = scheduler.ready_queue.next_promotion(scheduler.aging)
+        if promotion is not None:
+            ticks = min(ticks, promotion - scheduler.current_time - 1)
+        return ticks
+
+@register_policy
+class SmpPolicy(RoundRobinPolicy):
+    """Round Robin on ``scheduler.cores`` CPUs with per-core run queues.
+
+    Arriving processes join the shortest run queue, and a process whose
+    quantum expires goes back to the queue of the core it ran on. A core
+    that is idle with an empty queue steals from the longest one.
+    """
+
+    name = "smp"
+    multicore = True
+
+    @property
+    def cores(self) -> int:
+        return self.scheduler.cores
+
+    def make_ready_queue(self):
+        return PerCoreReadyQueue(self.scheduler.cores)
+
+    def pick(self, core: int) -> Optional[int]:
+        queue = self.scheduler.ready_queue
+        if not queue.core_length(core) and queue.steal(core):
+            self.scheduler.steals += 1
+        return queue.pop(core) if queue.core_length(core) else None
+
+    def requeue(self, process, core: int):
+        self.scheduler.ready_queue.push(process.pid, core)
@@ -1,8 +1,18 @@
+import bisect
+import hashlib
+import heapq
+import math
 import random
+from array import array
+from collections import Counter, deque
 from enum import Enum
 from typing import List, Dict
 import time
 
+from checkpoints import CheckpointStore
+from policies import POLICIES, policy_class
+from timeline import Timeline
+
 class ProcessState(Enum):
     NEW = "New"
     READY = "Ready"
@@ -10,87 +20,766 @@ class ProcessState(Enum):
     WAITING = "Waiting"
     TERMINATED = "Terminated"
 
+_STATES = list(ProcessState)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+_NEW = _STATE_CODES[ProcessState.NEW]
+_WAITING = _STATE_CODES[ProcessState.WAITING]
+_DELETED = -1  # State code of rows whose process has been deleted
+_UNSET = -1  # Stored in optional time columns in place of None
+# byte -> byte translations applied to the whole state column at once
+_RESET_STATES = bytes(_NEW if code != (_DELETED & 0xFF) else code for code in range(256))
+_NEW_TO_WAITING = bytes(_WAITING if code == _NEW else code for code in range(256))
+
+ADMISSION_POLICIES = ('defer', 'reject')
+
+class AdmissionRejected(ValueError):
+    """Processes refused because the ready queue is full (the ``reject`` admission policy)."""
+
+class ProcessTable:
+    """Columnar (struct-of-arrays) storage for process fields.
+
+    Each field is a typed ``array`` column, so a process costs well under a
+    hundred bytes instead of a full Python object with its own ``__dict__``.
+    The pid of a row is implicit (``first_pid + row``), and ``Process``
+    instances are thin views onto one row.
+
+    Rows written through a ``Process`` view are collected in ``dirty`` so
+    state updates can be sent as deltas; bulk rewrites of whole columns set
+    ``all_dirty`` instead.
+    """
+
+    COLUMNS = ('burst_time', 'arrival_time', 'remaining_time', 'priority', 'waiting_time',
+               'turnaround_time', 'completion_time', 'start_time', 'end_time')
+    # Columns written by the simulation itself rather than by edits
+    RUN_COLUMNS = ('remaining_time', 'waiting_time', 'turnaround_time', 'completion_time',
+                   'start_time', 'end_time', 'state')
+
+    def __init__(self, first_pid: int = 0):
+        self.first_pid = first_pid
+        for name in self.COLUMNS:
+            setattr(self, name, array('q'))
+        self.state = array('b')
+        self.dirty = set()
+        self.all_dirty = True
+
+    @classmethod
+    def from_columns(cls, burst_times, arrival_times, priorities=None, first_pid: int = 0) -> 'ProcessTable':
+        """Build a table for a whole workload at once."""
+        table = cls(first_pid)
+        table.burst_time = array('q', burst_times)
+        table.arrival_time = array('q', arrival_times)
+        count = len(table.burst_time)
+        table.priority = array('q', priorities) if priorities is not None else array('q', bytes(8 * count))
+        if len(table.arrival_time) != count or len(table.priority) != count:
+            raise ValueError("All columns must have the same length")
+        table.state = array('b', bytes(count))
+        table.reset()
+        return table
+
+    def __len__(self) -> int:
+        return len(self.state)
+
+    @staticmethod
+    def state_code(state: ProcessState) -> int:
+        """Value stored in the ``state`` column for ``state``."""
+        return _STATE_CODES[state]
+
+    def append(self, burst_time: int, arrival_time: int, priority: int = 0) -> int:
+        """Add a row for a new process and return its pid."""
+        self.burst_time.append(burst_time)
+        self.arrival_time.append(arrival_time)
+        self.remaining_time.append(burst_time)
+        self.priority.append(priority)
+        self.waiting_time.append(0)
+        self.turnaround_time.append(0)
+        self.completion_time.append(0)
+        self.start_time.append(_UNSET)
+        self.end_time.append(_UNSET)
+        self.state.append(_NEW)
+        self.dirty.add(len(self.state) - 1)
+        return self.first_pid + len(self.state) - 1
+
+    def extend(self, burst_times, arrival_times, priorities=None) -> range:
+        """Add rows for many new processes at once and return their rows."""
+        start = len(self.state)
+        self.burst_time.extend(burst_times)
+        self.arrival_time.extend(arrival_times)
+        count = len(self.burst_time) - start
+        if priorities is not None:
+            self.priority.extend(priorities)
+        else:
+            self.priority.extend(array('q', bytes(8 * count)))
+        if len(self.arrival_time) - start != count or len(self.priority) - start != count:
+            raise ValueError("All columns must have the same length")
+        zeros = array('q', bytes(8 * count))
+        self.remaining_time.extend(self.burst_time[start:])
+        self.waiting_time.extend(zeros)
+        self.turnaround_time.extend(zeros)
+        self.completion_time.extend(zeros)
+        self.start_time.extend(array('q', [_UNSET]) * count)
+        self.end_time.extend(array('q', [_UNSET]) * count)
+        self.state.extend(array('b', bytes([_NEW]) * count))
+        self.all_dirty = True
+        return range(start, start + count)
+
+    def row(self, pid: int) -> int:
+        """Row index of a live process, or -1."""
+        row = pid - self.first_pid
+        if 0 <= row < len(self.state) and self.state[row] != _DELETED:
+            return row
+        return -1
+
+    def delete(self, pid: int):
+        """Mark a process as deleted; its row is kept so pids stay stable."""
+        self.state[pid - self.first_pid] = _DELETED
+
+    def reset(self):
+        """Restore every live row to its state before the simulation started."""
+        count = len(self.state)
+        zeros = bytes(8 * count)
+        self.remaining_time = array('q', self.burst_time)
+        self.waiting_time = array('q', zeros)
+        self.turnaround_time = array('q', zeros)
+        self.completion_time = array('q', zeros)
+        self.start_time = array('q', [_UNSET]) * count
+        self.end_time = array('q', [_UNSET]) * count
+        self.state = array('b', self.state.tobytes().translate(_RESET_STATES))
+        self.all_dirty = True
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column buffers."""
+        columns = [getattr(self, name) for name in self.COLUMNS] + [self.state]
+        return sum(len(column) * column.itemsize for column in columns)
+
+class _Column:
+    """Descriptor exposing one ``ProcessTable`` column as a ``Process`` attribute."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, process, owner=None):
+        if process is None:
+            return self
+        return getattr(process._table, self.name)[process._row]
+
+    def __set__(self, process, value):
+        table, row = process._table, process._row
+        getattr(table, self.name)[row] = value
+        table.dirty.add(row)
+
+class _OptionalColumn(_Column):
+    def __get__(self, process, owner=None):
+        if process is None:
+            return self
+        value = getattr(process._table, self.name)[process._row]
+        return None if value == _UNSET else value
+
+    def __set__(self, process, value):
+        table, row = process._table, process._row
+        getattr(table, self.name)[row] = _UNSET if value is None else value
+        table.dirty.add(row)
+
+class _StateColumn(_Column):
+    def __get__(self, process, owner=None):
+        if process is None:
+            return self
+        return _STATES[process._table.state[process._row]]
+
+    def __set__(self, process, value):
+        table, row = process._table, process._row
+        table.state[row] = _STATE_CODES[value]
+        table.dirty.add(row)
+
 class Process:
+    """A process, stored as one row of a ``ProcessTable``."""
+
+    __slots__ = ('_table', '_row')
+
+    burst_time = _Column()
+    arrival_time = _Column()
+    remaining_time = _Column()
+    priority = _Column()
+    waiting_time = _Column()
+    turnaround_time = _Column()
+    completion_time = _Column()
+    start_time = _OptionalColumn()
+    end_time = _OptionalColumn()
+    state = _StateColumn()
+
     def __init__(self, pid: int, burst_time: int, arrival_time: int):
-        self.pid = pid
-        self.burst_time = burst_time
-        self.arrival_time = arrival_time
-        self.remaining_time = burst_time
-        self.state = ProcessState.NEW
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.completion_time = 0
-        self.start_time = None
-        self.end_time = None
-        self.priority = 0
+        self._table = ProcessTable(first_pid=pid)
+        self._row = 0
+        self._table.append(burst_time, arrival_time)
+
+    @classmethod
+    def view(cls, table: ProcessTable, row: int) -> 'Process':
+        """Wrap an existing table row without copying it."""
+        process = cls.__new__(cls)
+        process._table = table
+        process._row = row
+        return process
+
+    @property
+    def pid(self) -> int:
+        return self._table.first_pid + self._row
+
+    def __eq__(self, other):
+        return isinstance(other, Process) and other._table is self._table and other._row == self._row
+
+    def __hash__(self):
+        return hash((id(self._table), self._row))
+
+    def __repr__(self):
+        return f"Process(pid={self.pid}, state={self.state.value})"
+
+class ProcessIndex:
+    """Read-only pid -> ``Process`` mapping over a ``ProcessTable``."""
+
+    def __init__(self, table: ProcessTable):
+        self._table = table
+
+    def __getitem__(self, pid: int) -> Process:
+        row = self._table.row(pid)
+        if row < 0:
+            raise KeyError(pid)
+        return Process.view(self._table, row)
+
+    def get(self, pid: int, default=None):
+        row = self._table.row(pid)
+        return Process.view(self._table, row) if row >= 0 else default
+
+    def __contains__(self, pid: int) -> bool:
+        return self._table.row(pid) >= 0
+
+class ProcessList:
+    """Live processes ordered by arrival time, stored as an array of table rows."""
+
+    def __init__(self, table: ProcessTable, rows=()):
+        self._table = table
+        self.rows = array('q', rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self):
+        table = self._table
+        return (Process.view(table, row) for row in self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Process.view(self._table, row) for row in self.rows[index]]
+        return Process.view(self._table, self.rows[index])
+
+    def insert(self, row: int, index: int = None):
+        """Insert a row after every process with an earlier arrival time.
+
+        Among processes with the same arrival time it goes last, or, given
+        the ``index`` it was removed from, back to where a stable sort by
+        arrival would have kept it.
+        """
+        key = self._table.arrival_time.__getitem__
+        position = bisect.bisect_right(self.rows, key(row), key=key)
+        if index is not None:
+            position = max(bisect.bisect_left(self.rows, key(row), key=key), min(index, position))
+        self.rows.insert(position, row)
+
+    def merge(self, rows):
+        """Merge rows that are already in arrival order into the list in one pass."""
+        if not self.rows:
+            self.rows = array('q', rows)
+            return
+        self.rows = array('q', heapq.merge(self.rows, rows, key=self._table.arrival_time.__getitem__))
+
+    def index(self, row: int) -> int:
+        """Position of a row in the list."""
+        arrival = self._table.arrival_time
+        index = bisect.bisect_left(self.rows, arrival[row], key=arrival.__getitem__)
+        while self.rows[index] != row:
+            index += 1
+        return index
+
+    def positions(self, rows) -> Dict[int, int]:
+        """Positions of ``rows`` (and of the rows arriving with them) in the list."""
+        arrival = self._table.arrival_time
+        positions = {}
+        for time in {arrival[row] for row in rows}:
+            index = bisect.bisect_left(self.rows, time, key=arrival.__getitem__)
+            while index < len(self.rows) and arrival[self.rows[index]] == time:
+                positions[self.rows[index]] = index
+                index += 1
+        return positions
+
+    def remove(self, row: int) -> int:
+        """Remove a row and return its position; must be called before its arrival time changes."""
+        index = self.index(row)
+        del self.rows[index]
+        return index
+
+class QuantileSketch:
+    """Streaming quantile estimate with bounded relative error.
+
+    Samples are counted in logarithmically sized buckets (the DDSketch
+    layout), so memory depends on the range of values rather than on the
+    number of samples, and samples can be removed again when a completed
+    process is edited or deleted.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self._sorted_keys = []
+        self._zero_count = 0
+        self.count = 0
+
+    def _bucket(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float):
+        if value <= 0:
+            self._zero_count += 1
+        else:
+            key = self._bucket(value)
+            if key not in self._buckets:
+                self._buckets[key] = 0
+                self._sorted_keys = None
+            self._buckets[key] += 1
+        self.count += 1
+
+    def add_many(self, values):
+        log, ceil, log_gamma = math.log, math.ceil, self._log_gamma
+        keys = Counter(ceil(log(value) / log_gamma) for value in values if value > 0)
+        positive = sum(keys.values())
+        for key, count in keys.items():
+            if key not in self._buckets:
+                self._buckets[key] = 0
+                self._sorted_keys = None
+            self._buckets[key] += count
+        self._zero_count += len(values) - positive
+        self.count += len(values)
+
+    def remove(self, value: float):
+        if value <= 0:
+            self._zero_count -= 1
+        else:
+            key = self._bucket(value)
+            self._buckets[key] -= 1
+            if not self._buckets[key]:
+                del self._buckets[key]
+                self._sorted_keys = None
+        self.count -= 1
+
+    def quantile(self, q: float) -> float:
+        """The ``q`` quantile, interpolated between the two nearest samples.
+
+        Ranks are those of ``statistics.quantiles(method='inclusive')``, so
+        high quantiles of a few samples lie between the largest ones rather
+        than at the median.
+        """
+        if self.count <= 0:
+            return 0
+        position = q * (self.count - 1)
+        index = math.floor(position)
+        fraction = position - index
+        value = self._value_at(index)
+        if fraction and index + 1 < self.count:
+            value += (self._value_at(index + 1) - value) * fraction
+        return value
+
+    def _value_at(self, index: int) -> float:
+        """Estimate of the ``index``-th smallest sample."""
+        seen = self._zero_count
+        if index < seen:
+            return 0
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._buckets)
+        for key in self._sorted_keys:
+            seen += self._buckets[key]
+            if seen > index:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** self._sorted_keys[-1] / (self._gamma + 1)
+
+    def copy(self) -> 'QuantileSketch':
+        sketch = QuantileSketch.__new__(QuantileSketch)
+        sketch.__dict__.update(self.__dict__)
+        sketch._buckets = dict(self._buckets)
+        sketch._sorted_keys = None
+        return sketch
 
 class ProcessScheduler:
-    def __init__(self):
-        self.processes: List[Process] = []
+    """Simulates CPU scheduling of a process table, one tick at a time.
+
+    The engine here does the bookkeeping every algorithm shares; which
+    process runs and when it is preempted is left to the ``policy``
+    registered under ``algorithm`` (see ``policies``).
+    """
+
+    ALGORITHMS = tuple(POLICIES)  # Built-in policies
+
+    def __init__(self, table: ProcessTable = None, result_cache=None):
+        # Finished runs to restore identical runs from, and to store this
+        # scheduler's own in (a result_cache.ResultCache), or None
+        self.result_cache = result_cache
+        self.table = ProcessTable()
+        self.processes = ProcessList(self.table)
+        self.process_index = ProcessIndex(self.table)
         self.current_time = 0
         self.algorithm = "fcfs"
         self.is_running = False
         self.quantum = 2  # For Round Robin
-        self.current_process = None
-        self.ready_queue = []
-        self.waiting_queue = []
-        self.completed_processes = []
+        self.completed_processes = array('q')
         self.next_pid = 0
         self.priority_levels = 5  # For Priority Scheduling
         self.preemptive = True  # For Priority and SJF Preemptive
-        self.quantum_counter = 0
+        self.mlfq_levels = 3  # For Multilevel Feedback Queue; level n has a quantum of quantum * 2**n
+        self.aging = 20  # Ticks a process waits on an MLFQ level before it is promoted
+        self.cores = 2  # For SMP
+        # Admission control: the deepest the ready queue may get (None for no
+        # limit), and whether arrivals beyond it are deferred or refused
+        self.max_ready = None
+        self.admission = 'defer'
+        self.rejected = 0  # Processes refused by admission control, ever
+        self.policy = policy_class(self.algorithm)(self)
+        self.ready_queue = self.policy.make_ready_queue()
+        self._reset_cores()
+        self.delta_seq = 0  # Sequence number of the last state delta handed out
+        self._needs_snapshot = True
+        self._emitted_completed = 0
+        self._emitted_metrics = {}
+        self.checkpoints = CheckpointStore()
+        self._workload_key = None  # Hash of the workload, until the next edit
+        self._result_key = None  # Key of the run in progress while it may be cached
+        self._reset_arrivals()
+        self._reset_metrics()
+        if table is not None:
+            self.load_table(table)
+
+    def __getstate__(self):
+        # The result cache belongs to this process, not to the scheduler
+        state = self.__dict__.copy()
+        state['result_cache'] = None
+        return state
+
+    def _reset_metrics(self):
+        """Clear the running totals that performance metrics are derived from."""
+        self.total_waiting_time = 0
+        self.total_turnaround_time = 0
+        self.total_response_time = 0
+        self.busy_time = 0
+        self.context_switches = 0
+        self.preemptions = 0
+        self.waiting_time_sketch = QuantileSketch()
+        self.turnaround_time_sketch = QuantileSketch()
+        self.timeline = Timeline()
+        # Per-core counters, and per-core timelines of multi-core runs
+        cores = self.policy.cores
+        self.core_busy = array('q', bytes(8 * cores))
+        self.core_timelines = [Timeline() for _ in range(cores)] if self.policy.multicore else []
+        self.steals = 0
+        self._core_last_pid = [None] * cores
+        self.deferrals = 0  # Arrivals held back because the ready queue was full
+        self._evaluated_order = None  # Set by evaluate(), replayed into the timeline on demand
+
+    def _reset_cores(self):
+        """Idle every CPU."""
+        self.core_processes = [None] * self.policy.cores
+        self.core_quantum = array('q', bytes(8 * self.policy.cores))  # Ticks since each core's dispatch
+
+    @property
+    def current_process(self):
+        """The process on the first (or only) CPU, or None."""
+        return self.core_processes[0]
+
+    @current_process.setter
+    def current_process(self, process):
+        self.core_processes[0] = process
+
+    @property
+    def quantum_counter(self) -> int:
+        """Ticks the process on the first CPU has run since its dispatch."""
+        return self.core_quantum[0]
+
+    @property
+    def waiting_queue(self) -> List[int]:
+        """PIDs of processes that have not arrived yet, in arrival order."""
+        state = self.table.state
+        first_pid = self.table.first_pid
+        return [first_pid + row for row in self.processes.rows if state[row] == _WAITING]
 
     def add_process(self, burst_time: int, arrival_time: int, priority: int = 0) -> Process:
         """Add a new process to the scheduler."""
-        process = Process(self.next_pid, burst_time, arrival_time)
-        process.priority = priority
-        self.processes.append(process)
-        self.next_pid += 1
-        self.processes.sort(key=lambda x: x.arrival_time)
+        pid = self.table.append(burst_time, arrival_time, priority)
+        process = self.process_index[pid]
+        self.processes.insert(process._row)
+        self.next_pid = pid + 1
+        self._workload_changed()
+        self._push_arrival(process)
+        self._new_pids.append(pid)
+        self._fork_history()
         return process
 
+    def add_processes(self, burst_times, arrival_times, priorities=None) -> range:
+        """Add many processes at once and return their pids.
+
+        The new rows are sorted by arrival once (or not at all when they
+        already arrive in order) and merged into the process list, instead
+        of being inserted one by one.
+        """
+        table = self.table
+        rows = table.extend(burst_times, arrival_times, priorities)
+        arrival = table.arrival_time
+        if all(arrival[row] <= arrival[row + 1] for row in rows[:-1]):
+            ordered = rows
+        else:
+            ordered = sorted(rows, key=arrival.__getitem__)
+        self.processes.merge(ordered)
+        self.next_pid = table.first_pid + len(table)
+        self._workload_changed()
+        if self._classify_all:
+            # Not started since the last reset: take a fresh arrival snapshot
+            self._reset_arrivals()
+        else:
+            seq = self._arrival_seq
+            self._arrivals.extend((arrival[row], seq + i, row) for i, row in enumerate(ordered))
+            heapq.heapify(self._arrivals)
+            self._arrival_seq += len(rows)
+            self._new_pids.extend(table.first_pid + row for row in rows)
+            self._fork_history()
+        return range(table.first_pid + rows.start, table.first_pid + rows.stop)
+
+    def load_table(self, table: ProcessTable):
+        """Replace all processes with the rows of ``table`` and reset the simulation."""
+        state = table.state
+        rows = [row for row in sorted(range(len(table)), key=table.arrival_time.__getitem__)
+                if state[row] != _DELETED]
+        self.table = table
+        self.processes = ProcessList(table, rows)
+        self.process_index = ProcessIndex(table)
+        self.next_pid = table.first_pid + len(table)
+        self._workload_changed()
+        self.reset()
+
     def update_process(self, pid: int, burst_time: int, arrival_time: int, priority: int = 0) -> bool:
         """Update an existing process's burst time, arrival time, and priority."""
-        for process in self.processes:
-            if process.pid == pid:
-                process.burst_time = burst_time
-                process.arrival_time = arrival_time
-                process.remaining_time = burst_time
-                process.priority = priority
-                self.processes.sort(key=lambda x: x.arrival_time)
-                return True
-        return False
+        process = self.process_index.get(pid)
+        if process is None:
+            return False
+        # The process keeps its place among processes arriving with it
+        index = self.processes.remove(process._row)
+        self._edit_process(process, burst_time, arrival_time, priority)
+        self.processes.insert(process._row, index)
+        self._fork_history()
+        return True
 
     def delete_process(self, pid: int) -> bool:
         """Delete a process from the scheduler and clean up all queues."""
-        for i, process in enumerate(self.processes):
-            if process.pid == pid:
-                # Remove from all queues
-                if pid in self.ready_queue:
-                    self.ready_queue.remove(pid)
-                if pid in self.waiting_queue:
-                    self.waiting_queue.remove(pid)
-                if pid in self.completed_processes:
-                    self.completed_processes.remove(pid)
-                # If this is the current process, clear it
-                if self.current_process and self.current_process.pid == pid:
-                    self.current_process = None
-                # Remove from processes list
-                self.processes.pop(i)
-                return True
-        return False
+        process = self.process_index.get(pid)
+        if process is None:
+            return False
+        # Remove from processes list
+        self.processes.remove(process._row)
+        if self._drop_process(process):
+            self.completed_processes.remove(pid)
+        self._fork_history()
+        return True
+
+    def apply_batch(self, ops) -> Dict:
+        """Apply many adds, updates and deletes as a single edit.
+
+        ``ops`` is a sequence of dicts whose ``op`` is ``add`` (with
+        ``burst_time``, ``arrival_time`` and an optional ``priority``),
+        ``update`` (a ``pid`` and the same fields) or ``delete`` (a
+        ``pid``). Updates and deletes refer to processes that existed before
+        the batch. Every op is checked before anything changes, so an
+        invalid one raises ValueError and leaves the scheduler as it was.
+
+        The process list is rebuilt once, with one merge for the updated
+        processes and one for the added ones, into the order applying the
+        ops one by one would give: an updated process keeps its place if
+        its arrival time did not change, goes first among the processes
+        arriving with it if it now arrives later, and last if earlier;
+        added processes go last, in batch order. Returns how many processes
+        were added, updated and deleted and the pid of the first added one.
+        """
+        table = self.table
+        adds, edits = [], []
+        deleted_pids = set()
+        for index, op in enumerate(ops):
+            kind = op.get('op') if isinstance(op, dict) else None
+            try:
+                if kind == 'add':
+                    adds.append(self._batch_fields(op))
+                elif kind in ('update', 'delete'):
+                    pid = op.get('pid')
+                    if not isinstance(pid, int) or table.row(pid) < 0 or pid in deleted_pids:
+                        raise ValueError(f"process {pid} not found")
+                    if kind == 'delete':
+                        deleted_pids.add(pid)
+                        edits.append((pid, None))
+                    else:
+                        edits.append((pid, self._batch_fields(op)))
+                else:
+                    raise ValueError(f"unknown op {kind!r}")
+            except ValueError as e:
+                raise ValueError(f"Operation {index}: {e}") from None
+
+        # Updated rows -> tie-break among processes with the same arrival
+        # time; untouched rows break ties by their position in the list
+        ties = {}
+        size = len(self.processes)
+        # Taken before any edit, while the list is still in arrival order
+        positions = self.processes.positions([table.row(pid) for pid, fields in edits if fields is not None])
+        deleted = set()
+        completed_deleted = set()
+        for step, (pid, fields) in enumerate(edits):
+            process = self.process_index[pid]
+            if fields is None:
+                deleted.add(process._row)
+                if self._drop_process(process):
+                    completed_deleted.add(pid)
+                continue
+            row = process._row
+            arrival_time = process.arrival_time
+            self._edit_process(process, *fields)
+            if process.arrival_time > arrival_time:
+                ties[row] = -size - 1 - step  # Ahead of every process arriving then, latest move first
+            elif process.arrival_time < arrival_time:
+                ties[row] = size + step  # After every process arriving then
+            elif row not in ties:
+                ties[row] = positions[row]
+        if edits:
+            arrival = table.arrival_time
+            touched = deleted.union(ties)
+            kept = ((arrival[row], position, row) for position, row in enumerate(self.processes.rows)
+                    if row not in touched)
+            moved = sorted((arrival[row], tie, row) for row, tie in ties.items() if row not in deleted)
+            self.processes.rows = array('q', [row for _, _, row in heapq.merge(kept, moved)])
+            if completed_deleted:
+                self.completed_processes = array('q', [pid for pid in self.completed_processes
+                                                       if pid not in completed_deleted])
+            self._fork_history()
+
+        pids = self.add_processes(*map(list, zip(*adds))) if adds else range(0)
+        return {
+            'added': len(pids),
+            'updated': sum(1 for _, fields in edits if fields is not None),
+            'deleted': len(deleted),
+            'first_pid': pids.start if pids else None,
+            'processes': len(self.processes)
+        }
+
+    @staticmethod
+    def _batch_fields(op: Dict) -> tuple:
+        """``(burst_time, arrival_time, priority)`` of a batch op, validated."""
+        fields = (op.get('burst_time'), op.get('arrival_time'), op.get('priority', 0))
+        if not all(isinstance(value, int) and not isinstance(value, bool) for value in fields):
+            raise ValueError("burst_time, arrival_time and priority must be integers")
+        if fields[0] < 1 or fields[1] < 0:
+            raise ValueError("burst time must be positive and arrival time non-negative")
+        return fields
+
+    def _edit_process(self, process: Process, burst_time: int, arrival_time: int, priority: int):
+        """Change a process's fields and requeue it; the caller keeps the process list in order."""
+        completed = process.state == ProcessState.TERMINATED
+        if completed:
+            self._retract_completion(process)
+        # Only processes that have arrived can have been deferred
+        deferred = self._deferred and process.arrival_time <= self.current_time and process._row in self._deferred
+        self._workload_changed()
+        process.burst_time = burst_time
+        process.arrival_time = arrival_time
+        process.remaining_time = burst_time
+        process.priority = priority
+        if completed:
+            self._record_completion(process)
+        if process.pid in self.ready_queue:
+            self.ready_queue.update(process.pid)
+        elif process.state in (ProcessState.NEW, ProcessState.WAITING):
+            if deferred:
+                # Arrives again at its new time, as if it had never arrived
+                self._deferred.remove(process._row)
+            self._moved_rows.add(process._row)
+            self._push_arrival(process)
+
+    def _drop_process(self, process: Process) -> bool:
+        """Delete a process everywhere but in the process list and the
+        completed list; returns whether it had completed."""
+        pid = process.pid
+        # Remove from all queues
+        if pid in self.ready_queue:
+            self.ready_queue.remove(pid)
+        completed = process.state == ProcessState.TERMINATED
+        if completed:
+            self._retract_completion(process)
+        # If this is the current process, clear it
+        for core, running in enumerate(self.core_processes):
+            if running and running.pid == pid:
+                self.core_processes[core] = None
+        self.table.delete(pid)
+        self._workload_changed()
+        # Clients cannot patch a removal out of the completed list
+        self._needs_snapshot = True
+        return completed
+
+    def set_admission(self, max_ready: int = None, policy: str = 'defer'):
+        """Bound the ready queue at ``max_ready`` processes, or lift the bound with None.
+
+        Under the ``defer`` policy, processes arriving at a full ready queue
+        wait, in arrival order and still counting as waiting, until a
+        dispatch makes room. Under ``reject`` the bound is enforced when
+        processes are submitted (see ``admit``), counting those that have
+        not arrived yet, and arrivals are never held.
+        The bound applies to admissions: preempted processes are always
+        requeued, which can take the queue past it by one per CPU.
+        """
+        if max_ready is not None and (not isinstance(max_ready, int) or isinstance(max_ready, bool)
+                                      or max_ready < 1):
+            raise ValueError("max_ready must be a positive integer or null")
+        if policy not in ADMISSION_POLICIES:
+            raise ValueError(f"Unknown admission policy: {policy}")
+        self.max_ready = max_ready
+        self.admission = policy
+
+    def admit(self, count: int = 1, replace: bool = False):
+        """Check that ``count`` more processes may be submitted, or that a
+        workload of ``count`` processes may ``replace`` the current one.
+
+        Under the ``reject`` policy, raises AdmissionRejected unless the
+        ready queue has room for them on top of every process already
+        ready or yet to arrive, so that admissions can never overfill it
+        whenever the submitted processes arrive.
+        """
+        if self.max_ready is None or self.admission != 'reject' or count <= 0:
+            return
+        outstanding = 0 if replace else len(self.ready_queue) + self._pending_count()
+        if outstanding + count > self.max_ready:
+            self.rejected += count
+            raise AdmissionRejected(f"Ready queue full ({outstanding} of {self.max_ready} processes ready "
+                                    f"or yet to arrive)")
+
+    def admission_stats(self) -> Dict:
+        """Admission settings, queue depths and counters."""
+        return {
+            'max_ready': self.max_ready,
+            'policy': self.admission,
+            'ready': len(self.ready_queue),
+            'deferred': len(self._deferred),
+            'deferrals': self.deferrals,
+            'rejected': self.rejected
+        }
 
     def generate_random_processes(self, count: int = 5):
         """Generate random processes with priorities."""
-        self.processes = []
-        self.next_pid = 0
+        burst_times, arrival_times, priorities = [], [], []
         for i in range(count):
-            burst_time = random.randint(1, 10)
-            arrival_time = random.randint(0, 5)
-            priority = random.randint(0, self.priority_levels - 1)
-            self.add_process(burst_time, arrival_time, priority)
+            burst_times.append(random.randint(1, 10))
+            arrival_times.append(random.randint(0, 5))
+            priorities.append(random.randint(0, self.priority_levels - 1))
+        self.load_table(ProcessTable.from_columns(burst_times, arrival_times, priorities))
 
     def set_algorithm(self, algorithm: str):
+        policy_class(algorithm)  # Unknown names raise ValueError
         self.algorithm = algorithm
         self.reset()
 
@@ -98,6 +787,9 @@ class ProcessScheduler:
         self.is_running = True
         self.current_time = 0
         self._update_process_states()
+        self.checkpoints.clear()
+        self._take_checkpoint()
+        self._result_key = self.result_key() if self.result_cache is not None else None
 
     def pause(self):
         self.is_running = False
@@ -105,19 +797,15 @@ class ProcessScheduler:
     def reset(self):
         self.current_time = 0
         self.is_running = False
-        self.current_process = None
-        self.ready_queue = []
-        self.waiting_queue = []
-        self.completed_processes = []
-        self.quantum_counter = 0
-        for process in self.processes:
-            process.state = ProcessState.NEW
-            process.remaining_time = process.burst_time
-            process.waiting_time = 0
-            process.turnaround_time = 0
-            process.completion_time = 0
-            process.start_time = None
-            process.end_time = None
+        self.policy = policy_class(self.algorithm)(self)
+        self.ready_queue = self.policy.make_ready_queue()
+        self.completed_processes = array('q')
+        self._reset_cores()
+        self.table.reset()
+        self.checkpoints.clear()
+        self._result_key = None
+        self._reset_arrivals()
+        self._reset_metrics()
 
     def step(self):
         if not self.is_running:
@@ -125,318 +813,747 @@ class ProcessScheduler:
 
         self.current_time += 1
         self._update_process_states()
+        busy_time = self.busy_time
         self._schedule_next_process()
-        self._update_metrics()
+        self.timeline.sample(self.current_time, 1, len(self.ready_queue), self.busy_time != busy_time)
+        if self.current_time >= self.checkpoints.next_time:
+            self._take_checkpoint()
+        if self._result_key is not None and self.is_complete():
+            self._save_result(self._result_key)
+
+    def run_to_completion(self):
+        """Run the simulation until every process has terminated.
+
+        Event-driven counterpart of calling ``step()`` in a loop: ticks in
+        which no arrival, completion, quantum expiry or preemption can happen
+        are skipped in a single jump, so the cost grows with the number of
+        scheduling events instead of with the simulated time. A run that
+        ``result_cache`` has seen before is restored from it instead.
+        """
+        if not self.is_running:
+            return
+        if self._result_key is not None and self.current_time == 0:
+            result = self.result_cache.get(self._result_key)
+            if result is not None:
+                self._restore_result(result)
+                return
+
+        while not self.is_complete():
+            self.step()
+            skip = self._ticks_until_next_event()
+            if skip is None:
+                # Nothing is running, ready or still to arrive
+                break
+            if skip > 0:
+                self._fast_forward(skip)
+
+    def advance(self, ticks: int):
+        """Advance the simulation by ``ticks`` time units.
+
+        Equivalent to calling ``step()`` ``ticks`` times, but quiet ticks
+        are skipped the same way as in ``run_to_completion``.
+        """
+        if not self.is_running:
+            return
+
+        end_time = self.current_time + ticks
+        while self.current_time < end_time:
+            self.step()
+            skip = self._ticks_until_next_event()
+            if skip is None:
+                # Nothing will happen any more, the remaining ticks are idle
+                skip = end_time - self.current_time
+            skip = min(skip, end_time - self.current_time)
+            if skip > 0:
+                self._fast_forward(skip)
+
+    def seek(self, time: int) -> int:
+        """Move the simulation to tick ``time``, backwards or forwards.
+
+        Restores the latest checkpoint at or before ``time``, unless the
+        current tick is closer, and replays only the ticks after it. Before
+        the first checkpoint (the simulation has not started, was evaluated
+        in closed form, or was edited after ``time``) the current workload
+        is replayed from the start. Running or paused is left as it was.
+        """
+        if time < 0:
+            raise ValueError("Cannot seek to a negative time")
+        running = self.is_running
+        if not self.checkpoints and not self._classify_all:
+            # Edited since the last checkpoint: keep the present reachable
+            self._take_checkpoint()
+        checkpoint = self.checkpoints.nearest(time)
+        if checkpoint is None:
+            self.reset()
+            self.start()
+            checkpoint = self.checkpoints.nearest(time)
+        if self.current_time > time or checkpoint.time > self.current_time:
+            self._restore_checkpoint(checkpoint)
+        self.is_running = True
+        self.advance(time - self.current_time)
+        self.is_running = running
+        return self.current_time
+
+    def _take_checkpoint(self):
+        table = self.table
+        if not self.checkpoints:
+            # Processes arriving close together change together, so paging
+            # the columns in arrival order lets checkpoints share more pages
+            self.checkpoints.order_rows_by(table.arrival_time)
+        row_columns = {name: getattr(table, name) for name in ProcessTable.RUN_COLUMNS}
+        state = {
+            'ready_queue': self.ready_queue.copy(),
+            'arrival_cursor': self._arrival_cursor,
+            'arrivals': list(self._arrivals),
+            'arrival_seq': self._arrival_seq,
+            'moved_rows': set(self._moved_rows),
+            'new_pids': list(self._new_pids),
+            'classify_all': self._classify_all,
+            'deferred': (list(self._deferred), self.deferrals),
+            'totals': (self.total_waiting_time, self.total_turnaround_time, self.total_response_time,
+                       self.busy_time, self.context_switches, self.preemptions),
+            'sketches': (self.waiting_time_sketch.copy(), self.turnaround_time_sketch.copy()),
+            'cores': ([process.pid if process else None for process in self.core_processes],
+                      array('q', self.core_quantum), array('q', self.core_busy),
+                      list(self._core_last_pid), self.steals)
+        }
+        state_bytes = 1024 + 64 * (len(self.ready_queue) + len(self._arrivals)
+                                   + len(self._moved_rows) + len(self._new_pids) + len(self._deferred))
+        self.checkpoints.add(self.current_time, row_columns, {'completed_processes': self.completed_processes},
+                             state, state_bytes)
+
+    def _restore_checkpoint(self, checkpoint):
+        """Put the simulation back into the state recorded in ``checkpoint``."""
+        table = self.table
+        columns = self.checkpoints.columns(checkpoint)
+        self.completed_processes = columns.pop('completed_processes')
+        for name, column in columns.items():
+            setattr(table, name, column)
+        table.all_dirty = True
+        self._needs_snapshot = True
+
+        # The checkpoint is copied again so it can be restored any number of times
+        state = checkpoint.state
+        self.current_time = checkpoint.time
+        self.ready_queue = state['ready_queue'].copy()
+        self._arrival_cursor = state['arrival_cursor']
+        self._arrivals = list(state['arrivals'])
+        self._arrival_seq = state['arrival_seq']
+        self._moved_rows = set(state['moved_rows'])
+        self._new_pids = list(state['new_pids'])
+        self._classify_all = state['classify_all']
+        deferred, self.deferrals = state['deferred']
+        self._deferred = deque(deferred)
+        (self.total_waiting_time, self.total_turnaround_time, self.total_response_time,
+         self.busy_time, self.context_switches, self.preemptions) = state['totals']
+        self.waiting_time_sketch = state['sketches'][0].copy()
+        self.turnaround_time_sketch = state['sketches'][1].copy()
+        pids, core_quantum, core_busy, core_last_pid, self.steals = state['cores']
+        self.core_processes = [self.process_index[pid] if pid is not None else None for pid in pids]
+        self.core_quantum = array('q', core_quantum)
+        self.core_busy = array('q', core_busy)
+        self._core_last_pid = list(core_last_pid)
+
+    def _fork_history(self):
+        """An edit changes the course of the run from the current tick on.
+
+        Recorded ticks after it and the checkpoints, which could be replayed
+        without the edit, no longer apply; the next tick takes a fresh
+        checkpoint.
+        """
+        if self.checkpoints:
+            for timeline in [self.timeline] + self.core_timelines:
+                timeline.truncate(self.current_time + 1)
+            self.checkpoints.clear()
+
+    def is_complete(self) -> bool:
+        """Whether every process has terminated."""
+        return len(self.completed_processes) == len(self.processes)
+
+    def can_evaluate(self, algorithm: str = None) -> bool:
+        """Whether ``evaluate`` can compute ``algorithm`` without simulating it."""
+        algorithm = algorithm or self.algorithm
+        if self.max_ready is not None and self.admission == 'defer':
+            # Deferred arrivals change the schedule
+            return False
+        return algorithm in ("fcfs", "sjf") or (algorithm == "priority" and not self.preemptive)
+
+    def evaluate(self, algorithm: str = None):
+        """Compute the final state of a non-preemptive run in closed form.
+
+        Leaves the scheduler exactly as ``set_algorithm``, ``start`` and
+        ``run_to_completion`` would, without walking the simulation tick by
+        tick.
+        """
+        from batch_evaluator import evaluate_table
+
+        algorithm = algorithm or self.algorithm
+        if not self.can_evaluate(algorithm):
+            raise ValueError(f"{algorithm} cannot be evaluated in closed form")
+        self.set_algorithm(algorithm)
+        self.is_running = True
+        if not self.processes:
+            return
+        key = self.result_key() if self.result_cache is not None else None
+        if key is not None:
+            result = self.result_cache.get(key)
+            if result is not None:
+                self._restore_result(result)
+                return
+
+        result = evaluate_table(algorithm, self.table, self.processes.rows)
+        first_pid = self.table.first_pid
+        order = result['order']
+        self.completed_processes = array('q', order)
+        if first_pid:
+            self.completed_processes = array('q', (first_pid + row for row in order))
+        self.total_waiting_time = sum(result['waiting_time'])
+        self.total_turnaround_time = sum(result['turnaround_time'])
+        # Nothing is preempted, so response time equals waiting time
+        self.total_response_time = self.total_waiting_time
+        self.waiting_time_sketch.add_many(result['waiting_time'])
+        self.turnaround_time_sketch.add_many(result['turnaround_time'])
+
+        self.busy_time = result['busy_time']
+        self.context_switches = len(order) - 1
+        self._core_last_pid[0] = self.completed_processes[-1]
+        last = Process.view(self.table, order[-1])
+        self.current_time = last.start_time + max(last.burst_time, 1) - 1
+        self._evaluated_order = order
+        if key is not None:
+            self._save_result(key)
+
+    def result_key(self, algorithm: str = None) -> str:
+        """Content hash of the workload and of the settings ``algorithm`` runs with.
+
+        Schedulers with the same key produce the same run, so the key
+        identifies its result in ``result_cache``. The workload is hashed
+        once per edit: burst, arrival and priority columns, plus the
+        arrival order, which breaks ties between simultaneous arrivals.
+        """
+        if self._workload_key is None:
+            table = self.table
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f'{table.first_pid}:{len(table)}:{len(self.processes)}'.encode())
+            for column in (self.processes.rows, table.burst_time, table.arrival_time, table.priority):
+                digest.update(column.tobytes())
+            self._workload_key = digest.hexdigest()
+        settings = (self._workload_key, algorithm or self.algorithm, self.quantum, self.preemptive,
+                    self.mlfq_levels, self.aging, self.cores, self.max_ready, self.admission)
+        return hashlib.blake2b(repr(settings).encode(), digest_size=16).hexdigest()
+
+    def _workload_changed(self):
+        """Forget the workload hash; the run in progress no longer matches any key."""
+        self._workload_key = None
+        self._result_key = None
+
+    def _save_result(self, key: str):
+        """Store the final state of the finished run in ``result_cache``."""
+        # Only once per run, ticks after completion add nothing
+        self._result_key = None
+        if key != self.result_key():
+            # Settings changed since the run started
+            return
+        table = self.table
+        self.result_cache.put(key, {
+            'time': self.current_time,
+            'columns': {name: getattr(table, name) for name in ProcessTable.RUN_COLUMNS},
+            'completed_processes': self.completed_processes,
+            'totals': (self.total_waiting_time, self.total_turnaround_time, self.total_response_time,
+                       self.busy_time, self.context_switches, self.preemptions),
+            'sketches': (self.waiting_time_sketch, self.turnaround_time_sketch),
+            'cores': (self.core_quantum, self.core_busy, self._core_last_pid, self.steals),
+            'timelines': (self.timeline, self.core_timelines),
+            'evaluated_order': self._evaluated_order
+        })
+
+    def _restore_result(self, result: Dict):
+        """Jump to the end of the current run, as stored by ``_save_result``."""
+        table = self.table
+        for name, column in result['columns'].items():
+            setattr(table, name, column)
+        table.all_dirty = True
+        self._needs_snapshot = True
+        self.current_time = result['time']
+        # Every process has arrived and terminated
+        self.ready_queue = self.policy.make_ready_queue()
+        self._reset_cores()
+        self._new_pids = []
+        self._deferred = deque()
+        self._classify_all = False
+        self.completed_processes = result['completed_processes']
+        (self.total_waiting_time, self.total_turnaround_time, self.total_response_time,
+         self.busy_time, self.context_switches, self.preemptions) = result['totals']
+        self.waiting_time_sketch, self.turnaround_time_sketch = result['sketches']
+        self.core_quantum, self.core_busy, self._core_last_pid, self.steals = result['cores']
+        self.timeline, self.core_timelines = result['timelines']
+        self._evaluated_order = result['evaluated_order']
+        self._result_key = None
+
+    def _ticks_until_next_event(self):
+        """Number of upcoming ticks that cannot change the schedule."""
+        # Deferred arrivals are admitted on the tick after a dispatch makes room
+        if self._deferred and self._has_room():
+            return 0
+        # Ticks before the next arrival cannot change the ready queue
+        next_arrival = self._next_arrival_time()
+        skip = None if next_arrival is None else next_arrival - self.current_time - 1
+
+        # Without arrivals a running process can only stop by completing or
+        # by whatever the policy bounds with quiet_ticks, such as a quantum
+        # expiring. Preemption checks already failed on this tick and cannot
+        # succeed until something new arrives.
+        limits = [] if skip is None else [skip]
+        running = False
+        for core, process in enumerate(self.core_processes):
+            if not process:
+                # An idle CPU dispatches a ready process on the very next tick
+                if self.ready_queue:
+                    return 0
+                continue
+            running = True
+            limits.append(process.remaining_time - 1)
+            ticks = self.policy.quiet_ticks(process, core)
+            if ticks is not None:
+                limits.append(ticks)
+        if not running:
+            return skip
+        return max(0, min(limits))
+
+    def _fast_forward(self, ticks: int):
+        """Advance time by ``ticks`` quiet ticks without rescanning processes."""
+        start = self.current_time + 1
+        self.current_time += ticks
+        timelines = self.core_timelines or (self.timeline,)
+        busy = False
+        for core, process in enumerate(self.core_processes):
+            if process:
+                busy = True
+                process.remaining_time -= ticks
+                self.busy_time += ticks
+                self.core_busy[core] += ticks
+                self.core_quantum[core] += ticks
+                self.policy.fast_forwarded(process, core)
+                timelines[core].run(process.pid, start, ticks)
+            if self.core_timelines:
+                timelines[core].sample(start, ticks, self.ready_queue.core_length(core), process is not None)
+        self.timeline.sample(start, ticks, len(self.ready_queue), busy)
 
     def _update_process_states(self):
-        """Update process states based on arrival time and current time."""
-        # Update arrival of new processes
-        for process in self.processes:
-            if process.state == ProcessState.NEW:
-                if process.arrival_time <= self.current_time:
-                    process.state = ProcessState.READY
-                    if process.pid not in self.ready_queue:
-                        self.ready_queue.append(process.pid)
-                else:
-                    process.state = ProcessState.WAITING
-                    if process.pid not in self.waiting_queue:
-                        self.waiting_queue.append(process.pid)
-            elif process.state == ProcessState.WAITING and process.arrival_time <= self.current_time:
-                process.state = ProcessState.READY
-                if process.pid in self.waiting_queue:
-                    self.waiting_queue.remove(process.pid)
-                if process.pid not in self.ready_queue:
-                    self.ready_queue.append(process.pid)
-            elif process.state == ProcessState.READY:
-                # Ensure process is in ready queue
-                if process.pid not in self.ready_queue:
-                    self.ready_queue.append(process.pid)
-                # Remove from waiting queue if present
-                if process.pid in self.waiting_queue:
-                    self.waiting_queue.remove(process.pid)
+        """Admit processes whose arrival time has been reached.
+
+        Arrivals are consumed from a cursor over the arrival-ordered process
+        list taken at reset, merged with a heap of processes added or edited
+        since, so the work per tick is proportional to the number of new
+        arrivals rather than to the number of processes.
+        """
+        # Move arrived processes to the ready queue in arrival order, after
+        # those held back by admission control
+        deferred = self._deferred
+        while deferred and self._has_room():
+            row = deferred.popleft()
+            if self._is_pending(row):
+                self._make_ready(row)
+        arrived = []
+        reorder = False
+        while True:
+            arrival_time = self._next_arrival_time()
+            if arrival_time is None or arrival_time > self.current_time:
+                break
+            cursor = self._arrival_cursor
+            arrived.append(self._pop_arrival())
+            # Rows from the heap were added or edited since the reset
+            reorder = reorder or self._arrival_cursor == cursor
+        if reorder and len(arrived) > 1:
+            # Processes arriving on the same tick are admitted in process list
+            # order; a row edited twice may have come off the heap twice
+            arrived = list(dict.fromkeys(arrived))
+            arrived.sort(key=self.processes.positions(arrived).__getitem__)
+        defer = self.max_ready is not None and self.admission == 'defer'
+        for row in arrived:
+            if defer and (deferred or not self._has_room()):
+                deferred.append(row)
+                self.deferrals += 1
+            else:
+                self._make_ready(row)
+
+        # Newly added processes that have not arrived yet wait for their turn
+        if self._classify_all:
+            self.table.state = array('b', self.table.state.tobytes().translate(_NEW_TO_WAITING))
+            self.table.all_dirty = True
+            self._classify_all = False
+        for pid in self._new_pids:
+            row = self.table.row(pid)
+            if row >= 0 and self.table.state[row] == _NEW:
+                self.table.state[row] = _WAITING
+                self.table.dirty.add(row)
+        self._new_pids = []
+
+    def _make_ready(self, row: int):
+        process = Process.view(self.table, row)
+        process.state = ProcessState.READY
+        self.ready_queue.push(process.pid)
+
+    def _has_room(self) -> bool:
+        """Whether admission control lets another process into the ready queue."""
+        return self.max_ready is None or len(self.ready_queue) < self.max_ready
+
+    def _reset_arrivals(self):
+        """Start consuming arrivals from the current arrival-ordered process list."""
+        self._arrival_order = array('q', self.processes.rows)
+        self._arrival_cursor = 0
+        self._arrivals = []  # Heap of (arrival_time, seq, row) added after the reset
+        self._arrival_seq = len(self._arrival_order)
+        self._moved_rows = set()  # Rows whose arrival changed after the reset
+        self._new_pids = []
+        self._deferred = deque()  # Rows that arrived while the ready queue was full, in arrival order
+        self._classify_all = True
+
+    def _push_arrival(self, process: Process):
+        heapq.heappush(self._arrivals, (process.arrival_time, self._arrival_seq, process._row))
+        self._arrival_seq += 1
+
+    def _pending_count(self) -> int:
+        """Number of processes that have not arrived yet."""
+        states = self.table.state.tobytes()
+        return states.count(_NEW) + states.count(_WAITING)
+
+    def _is_pending(self, row: int) -> bool:
+        state = self.table.state[row]
+        return state == _NEW or state == _WAITING
+
+    def _next_arrival_time(self):
+        """Arrival time of the next process still to arrive, or None."""
+        arrival = self.table.arrival_time
+        order = self._arrival_order
+        while self._arrival_cursor < len(order):
+            row = order[self._arrival_cursor]
+            if self._is_pending(row) and row not in self._moved_rows:
+                break
+            self._arrival_cursor += 1
+        while self._arrivals:
+            arrival_time, _, row = self._arrivals[0]
+            if self._is_pending(row) and arrival[row] == arrival_time:
+                break
+            heapq.heappop(self._arrivals)
+
+        candidates = []
+        if self._arrival_cursor < len(order):
+            candidates.append((arrival[order[self._arrival_cursor]], self._arrival_cursor))
+        if self._arrivals:
+            candidates.append(self._arrivals[0][:2])
+        return min(candidates)[0] if candidates else None
+
+    def _pop_arrival(self) -> int:
+        """Remove and return the row of the next arrival found by ``_next_arrival_time``."""
+        arrival = self.table.arrival_time
+        order = self._arrival_order
+        if self._arrival_cursor < len(order):
+            row = order[self._arrival_cursor]
+            if not self._arrivals or (arrival[row], self._arrival_cursor) < self._arrivals[0][:2]:
+                self._arrival_cursor += 1
+                return row
+        return heapq.heappop(self._arrivals)[2]
 
     def _schedule_next_process(self):
-        if self.algorithm == "fcfs":
-            self._fcfs_schedule()
-        elif self.algorithm == "sjf":
-            self._sjf_schedule()
-        elif self.algorithm == "rr":
-            self._rr_schedule()
-        elif self.algorithm == "priority":
-            self._priority_schedule()
-        elif self.algorithm == "sjf_preemptive":
-            self._sjf_preemptive_schedule()
-
-    def _fcfs_schedule(self):
-        """First Come First Serve scheduling algorithm."""
-        if not self.current_process or self.current_process.state == ProcessState.TERMINATED:
-            if self.ready_queue:
-                # Get the first process from ready queue (already sorted by arrival time)
-                pid = self.ready_queue.pop(0)
-                self.current_process = next(p for p in self.processes if p.pid == pid)
-                self.current_process.state = ProcessState.RUNNING
-                if self.current_process.start_time is None:
-                    # Set start time to current time
-                    self.current_process.start_time = self.current_time
-                    # Calculate waiting time: WT = ST - AT
-                    self.current_process.waiting_time = max(0, self.current_time - self.current_process.arrival_time)
-
-        if self.current_process:
-            self.current_process.remaining_time -= 1
-            if self.current_process.remaining_time <= 0:
-                self.current_process.state = ProcessState.TERMINATED
-                self.current_process.end_time = self.current_time + 1  # End at next time unit
-                # Calculate completion time: CT = ST + BT
-                self.current_process.completion_time = self.current_process.start_time + self.current_process.burst_time
-                # Calculate turnaround time: TAT = CT - AT
-                self.current_process.turnaround_time = self.current_process.completion_time - self.current_process.arrival_time
-                # Add to completed processes
-                self.completed_processes.append(self.current_process.pid)
-                self.current_process = None
-
-    def _sjf_schedule(self):
-        if not self.current_process or self.current_process.state == ProcessState.TERMINATED:
-            if self.ready_queue:
-                # Sort ready queue by remaining time
-                self.ready_queue.sort(key=lambda pid: next(p for p in self.processes if p.pid == pid).remaining_time)
-                pid = self.ready_queue.pop(0)
-                self.current_process = next(p for p in self.processes if p.pid == pid)
-                self.current_process.state = ProcessState.RUNNING
-                if self.current_process.start_time is None:
-                    # Set start time to current time
-                    self.current_process.start_time = self.current_time
-                    # Calculate waiting time: WT = ST - AT
-                    self.current_process.waiting_time = self.current_time - self.current_process.arrival_time
-
-        if self.current_process:
-            self.current_process.remaining_time -= 1
-            if self.current_process.remaining_time <= 0:
-                self.current_process.state = ProcessState.TERMINATED
-                self.current_process.end_time = self.current_time
-                # Calculate completion time: CT = ST + BT
-                self.current_process.completion_time = self.current_process.start_time + self.current_process.burst_time
-                self.completed_processes.append(self.current_process.pid)
-                self.current_process = None
-
-    def _rr_schedule(self):
-        """Round Robin scheduling algorithm."""
-        if not self.current_process or self.current_process.state == ProcessState.TERMINATED:
-            if self.ready_queue:
-                # Get the next process from ready queue
-                pid = self.ready_queue.pop(0)
-                self.current_process = next(p for p in self.processes if p.pid == pid)
-                self.current_process.state = ProcessState.RUNNING
-                if self.current_process.start_time is None:
-                    # Set start time to current time
-                    self.current_process.start_time = self.current_time
-                    # Calculate waiting time: WT = ST - AT
-                    self.current_process.waiting_time = max(0, self.current_time - self.current_process.arrival_time)
-                # Reset quantum counter when process starts
-                self.quantum_counter = 0
-
-        if self.current_process:
-            self.current_process.remaining_time -= 1
-            self.quantum_counter += 1
-            if self.current_process.remaining_time <= 0:
-                self.current_process.state = ProcessState.TERMINATED
-                self.current_process.end_time = self.current_time + 1  # End at next time unit
-                # Calculate completion time: CT = ST + BT
-                self.current_process.completion_time = self.current_process.start_time + self.current_process.burst_time
-                # Calculate turnaround time: TAT = CT - AT
-                self.current_process.turnaround_time = self.current_process.completion_time - self.current_process.arrival_time
-                self.completed_processes.append(self.current_process.pid)
-                self.current_process = None
-            elif self.quantum_counter >= self.quantum:  # Time quantum expired
-                # Move current process to end of ready queue
-                self.current_process.state = ProcessState.READY
-                if self.current_process.pid not in self.ready_queue:
-                    self.ready_queue.append(self.current_process.pid)
-                self.current_process = None
-                # Reset quantum counter for next process
-                self.quantum_counter = 0
-
-    def _priority_schedule(self):
-        if not self.current_process or self.current_process.state == ProcessState.TERMINATED:
-            if self.ready_queue:
-                # Sort by priority (lower number = higher priority)
-                self.ready_queue.sort(key=lambda pid: next(p for p in self.processes if p.pid == pid).priority)
-                pid = self.ready_queue.pop(0)
-                self.current_process = next(p for p in self.processes if p.pid == pid)
-                self.current_process.state = ProcessState.RUNNING
-                if self.current_process.start_time is None:
-                    # Set start time to current time
-                    self.current_process.start_time = self.current_time
-                    # Calculate waiting time: WT = ST - AT
-                    self.current_process.waiting_time = self.current_time - self.current_process.arrival_time
-
-        if self.current_process:
-            self.current_process.remaining_time -= 1
-            if self.current_process.remaining_time <= 0:
-                self.current_process.state = ProcessState.TERMINATED
-                self.current_process.end_time = self.current_time
-                # Calculate completion time: CT = ST + BT
-                self.current_process.completion_time = self.current_process.start_time + self.current_process.burst_time
-                self.completed_processes.append(self.current_process.pid)
-                self.current_process = None
-            elif self.preemptive and self.ready_queue:
-                # Check if a higher priority process has arrived
-                highest_pid = min(self.ready_queue, key=lambda pid: next(p for p in self.processes if p.pid == pid).priority)
-                highest_priority = next(p for p in self.processes if p.pid == highest_pid)
-                if highest_priority.priority < self.current_process.priority:
-                    self.current_process.state = ProcessState.READY
-                    if self.current_process.pid not in self.ready_queue:
-                        self.ready_queue.append(self.current_process.pid)
-                    self.current_process = highest_priority
-                    if highest_pid in self.ready_queue:
-                        self.ready_queue.remove(highest_pid)
-                    self.current_process.state = ProcessState.RUNNING
-                    if self.current_process.start_time is None:
-                        # Set start time to current time
-                        self.current_process.start_time = self.current_time
-                        # Calculate waiting time: WT = ST - AT
-                        self.current_process.waiting_time = self.current_time - self.current_process.arrival_time
-
-    def _sjf_preemptive_schedule(self):
-        """Shortest Job First Preemptive scheduling algorithm."""
-        if not self.current_process or self.current_process.state == ProcessState.TERMINATED:
-            if self.ready_queue:
-                # Sort by remaining time
-                self.ready_queue.sort(key=lambda pid: next(p for p in self.processes if p.pid == pid).remaining_time)
-                pid = self.ready_queue.pop(0)
-                self.current_process = next(p for p in self.processes if p.pid == pid)
-                self.current_process.state = ProcessState.RUNNING
-                if self.current_process.start_time is None:
-                    self.current_process.start_time = self.current_time
-                    # Calculate waiting time when process first starts running
-                    self.current_process.waiting_time = max(0, self.current_time - self.current_process.arrival_time)
-
-        if self.current_process:
-            self.current_process.remaining_time -= 1
-            if self.current_process.remaining_time <= 0:
-                self.current_process.state = ProcessState.TERMINATED
-                self.current_process.end_time = self.current_time + 1  # End at next time unit
-                # Calculate completion time: CT = ST + BT
-                self.current_process.completion_time = self.current_process.start_time + self.current_process.burst_time
-                # Calculate turnaround time: TAT = CT - AT
-                self.current_process.turnaround_time = self.current_process.completion_time - self.current_process.arrival_time
-                self.completed_processes.append(self.current_process.pid)
-                self.current_process = None
-            elif self.preemptive and self.ready_queue:
-                # Check if a shorter job has arrived
-                shortest_pid = min(self.ready_queue, key=lambda pid: next(p for p in self.processes if p.pid == pid).remaining_time)
-                shortest_job = next(p for p in self.processes if p.pid == shortest_pid)
-                if shortest_job.remaining_time < self.current_process.remaining_time:
-                    # Preempt current process
-                    self.current_process.state = ProcessState.READY
-                    if self.current_process.pid not in self.ready_queue:
-                        self.ready_queue.append(self.current_process.pid)
-                    # Switch to shorter job
-                    self.current_process = shortest_job
-                    if shortest_pid in self.ready_queue:
-                        self.ready_queue.remove(shortest_pid)
-                    self.current_process.state = ProcessState.RUNNING
-                    if self.current_process.start_time is None:
-                        self.current_process.start_time = self.current_time
-                        # Calculate waiting time when process first starts running
-                        self.current_process.waiting_time = max(0, self.current_time - self.current_process.arrival_time)
+        """Run every CPU for the current tick.
+
+        An idle CPU dispatches whichever process the policy picks. After
+        each tick of running, the process either completes or the policy may
+        preempt it: it is requeued, and its CPU either takes the policy's
+        next pick right away or stays idle until the next tick.
+        """
+        policy = self.policy
+        policy.begin_tick()
+        timelines = self.core_timelines or (self.timeline,)
+        ran = []
+        for core, process in enumerate(self.core_processes):
+            if not process:
+                pid = policy.pick(core)
+                if pid is not None:
+                    process = self._dispatch(pid, core)
+
+            ran.append(process is not None)
+            if not process:
+                continue
+            process.remaining_time -= 1
+            self.busy_time += 1
+            self.core_busy[core] += 1
+            self.core_quantum[core] += 1
+            timelines[core].run(process.pid, self.current_time)
+            if process.remaining_time <= 0:
+                self._complete(process)
+                self.core_processes[core] = None
+            elif policy.should_preempt(process, core):
+                self.preemptions += 1
+                process.state = ProcessState.READY
+                if policy.switch_on_preempt:
+                    pid = policy.pick_preempting(core)
+                    policy.requeue(process, core)
+                    self._dispatch(pid, core)
+                else:
+                    policy.requeue(process, core)
+                    self.core_processes[core] = None
+
+        if self.core_timelines:
+            for core, busy in enumerate(ran):
+                timelines[core].sample(self.current_time, 1, self.ready_queue.core_length(core), busy)
+
+    def _dispatch(self, pid: int, core: int) -> Process:
+        """Put ``pid`` on ``core``, counting a context switch if the core ran another process."""
+        process = self.process_index[pid]
+        last_pid = self._core_last_pid[core]
+        if last_pid is not None and last_pid != pid:
+            self.context_switches += 1
+        self._core_last_pid[core] = pid
+        process.state = ProcessState.RUNNING
+        if process.start_time is None:
+            process.start_time = self.current_time
+            # Waiting time until the first dispatch: WT = ST - AT
+            process.waiting_time = max(0, self.current_time - process.arrival_time)
+        self.core_quantum[core] = 0
+        self.core_processes[core] = process
+        return process
+
+    def _complete(self, process: Process):
+        """Terminate ``process``, which ran its last tick on the current tick."""
+        process.state = ProcessState.TERMINATED
+        process.end_time = self.current_time + self.policy.end_offset
+        # Completion time: CT = ST + BT
+        process.completion_time = process.start_time + process.burst_time
+        self.completed_processes.append(process.pid)
+        self._record_completion(process)
+
+    def _record_completion(self, process: Process):
+        """Finalize a terminated process and add it to the running totals."""
+        # Turnaround time: TAT = CT - AT
+        process.turnaround_time = process.completion_time - process.arrival_time
+        # Waiting time: WT = TAT - BT
+        process.waiting_time = max(0, process.turnaround_time - process.burst_time)
+        self._add_completion_totals(process, 1)
+
+    def _retract_completion(self, process: Process):
+        """Remove a completed process from the running totals."""
+        self._add_completion_totals(process, -1)
+
+    def _add_completion_totals(self, process: Process, sign: int):
+        # Response time: RT = ST - AT
+        response_time = max(0, process.start_time - process.arrival_time) if process.start_time is not None else 0
+        self.total_waiting_time += sign * process.waiting_time
+        self.total_turnaround_time += sign * process.turnaround_time
+        self.total_response_time += sign * response_time
+        if sign > 0:
+            self.waiting_time_sketch.add(process.waiting_time)
+            self.turnaround_time_sketch.add(process.turnaround_time)
+        else:
+            self.waiting_time_sketch.remove(process.waiting_time)
+            self.turnaround_time_sketch.remove(process.turnaround_time)
 
     def _update_metrics(self):
-        """Update performance metrics for all processes."""
-        total_waiting_time = 0
-        total_turnaround_time = 0
-        total_response_time = 0
+        """Compute performance metrics from the running totals in O(1)."""
         completed_count = len(self.completed_processes)
 
-        for process in self.processes:
-            if process.state == ProcessState.TERMINATED:
-                # Turnaround time: TAT = CT - AT
-                process.turnaround_time = process.completion_time - process.arrival_time
-                
-                # Waiting time: WT = TAT - BT
-                process.waiting_time = max(0, process.turnaround_time - process.burst_time)
-                
-                total_waiting_time += process.waiting_time
-                total_turnaround_time += process.turnaround_time
-                if process.start_time is not None:
-                    # Response time: RT = ST - AT
-                    response_time = max(0, process.start_time - process.arrival_time)
-                    total_response_time += response_time
-
         # Calculate average metrics
         if completed_count > 0:
-            avg_waiting_time = total_waiting_time / completed_count
-            avg_turnaround_time = total_turnaround_time / completed_count
-            avg_response_time = total_response_time / completed_count
-            
-            # Ensure no negative values
-            avg_waiting_time = max(0, avg_waiting_time)
-            avg_turnaround_time = max(0, avg_turnaround_time)
-            avg_response_time = max(0, avg_response_time)
+            avg_waiting_time = max(0, self.total_waiting_time / completed_count)
+            avg_turnaround_time = max(0, self.total_turnaround_time / completed_count)
+            avg_response_time = max(0, self.total_response_time / completed_count)
         else:
             avg_waiting_time = 0
             avg_turnaround_time = 0
             avg_response_time = 0
 
-        return {
+        cores = self.policy.cores
+        if self.current_time > 0:
+            throughput = completed_count / self.current_time
+            cpu_utilization = 100 * self.busy_time / (self.current_time * cores)
+        else:
+            throughput = 0
+            cpu_utilization = 0
+
+        metrics = {
             'avg_waiting_time': avg_waiting_time,
             'avg_turnaround_time': avg_turnaround_time,
-            'avg_response_time': avg_response_time
+            'avg_response_time': avg_response_time,
+            'throughput': throughput,
+            'cpu_utilization': cpu_utilization,
+            'context_switches': self.context_switches
         }
+        for q in (50, 95, 99):
+            metrics[f'p{q}_waiting_time'] = self.waiting_time_sketch.quantile(q / 100)
+            metrics[f'p{q}_turnaround_time'] = self.turnaround_time_sketch.quantile(q / 100)
+        if self.policy.multicore:
+            busy = self.core_busy
+            mean_busy = sum(busy) / cores
+            metrics['core_utilization'] = [100 * ticks / self.current_time if self.current_time > 0 else 0
+                                           for ticks in busy]
+            # How far the busiest core is above the average, 0 when perfectly balanced
+            metrics['load_imbalance'] = max(busy) / mean_busy - 1 if mean_busy else 0
+            metrics['steals'] = self.steals
+        return metrics
 
     def get_current_state(self):
-        """Get the current state of the scheduler for visualization."""
+        """Get the current state of the scheduler for visualization.
+
+        This is the full snapshot sent to clients on connect and resync;
+        ``delta_seq`` tells them which ``take_state_delta`` result follows it.
+        """
+        table = self.table
+        first_pid = table.first_pid
+        burst, arrival, priority, state = table.burst_time, table.arrival_time, table.priority, table.state
+        waiting, turnaround, completion = table.waiting_time, table.turnaround_time, table.completion_time
+        ready_queue = list(self.ready_queue)
         return {
+            'delta_seq': self.delta_seq,
+            'current_time': self.current_time,
             'processes': [
                 {
-                    'pid': p.pid,
-                    'burst_time': p.burst_time,
-                    'arrival_time': p.arrival_time,
-                    'state': p.state.value,
-                    'waiting_time': p.waiting_time,
-                    'turnaround_time': p.turnaround_time,
-                    'completion_time': p.completion_time,
-                    'priority': p.priority
+                    'pid': first_pid + row,
+                    'burst_time': burst[row],
+                    'arrival_time': arrival[row],
+                    'state': _STATES[state[row]].value,
+                    'waiting_time': waiting[row],
+                    'turnaround_time': turnaround[row],
+                    'completion_time': completion[row],
+                    'priority': priority[row]
                 }
-                for p in self.processes
+                for row in self.processes.rows
             ],
-            'ready_queue': self.ready_queue,  # Already a list of PIDs
-            'waiting_queue': self.waiting_queue,  # Already a list of PIDs
-            'completed_processes': self.completed_processes,  # Already a list of PIDs
+            'ready_queue': ready_queue,  # PIDs in dispatch order
+            'ready_keys': [self.ready_queue.order_key(pid) for pid in ready_queue],
+            'waiting_queue': self.waiting_queue,
+            'completed_processes': list(self.completed_processes),
             'performance_metrics': self._update_metrics()
         }
 
+    def take_state_delta(self):
+        """Changes since the previous call, or None when a full snapshot is needed.
+
+        The delta lists the processes whose fields changed, the net ready
+        queue pushes (with their order keys) and pops, newly completed pids,
+        and the metrics whose values changed. Applying it to the state from
+        the previous delta, or to any snapshot taken since, yields the
+        current state. None is returned after bulk changes such as a reset
+        or a deletion; callers should then broadcast ``get_current_state()``.
+        """
+        table = self.table
+        dirty, table.dirty = table.dirty, set()
+        added, removed = self.ready_queue.take_changes()
+        metrics = self._update_metrics()
+        emitted_metrics, self._emitted_metrics = self._emitted_metrics, metrics
+        emitted_completed, self._emitted_completed = self._emitted_completed, len(self.completed_processes)
+        if self._needs_snapshot or table.all_dirty:
+            self._needs_snapshot = False
+            table.all_dirty = False
+            return None
+
+        first_pid = table.first_pid
+        burst, arrival, priority, state = table.burst_time, table.arrival_time, table.priority, table.state
+        waiting, turnaround, completion = table.waiting_time, table.turnaround_time, table.completion_time
+        self.delta_seq += 1
+        return {
+            'seq': self.delta_seq,
+            'current_time': self.current_time,
+            'processes': [
+                {
+                    'pid': first_pid + row,
+                    'burst_time': burst[row],
+                    'arrival_time': arrival[row],
+                    'state': _STATES[state[row]].value,
+                    'waiting_time': waiting[row],
+                    'turnaround_time': turnaround[row],
+                    'completion_time': completion[row],
+                    'priority': priority[row]
+                }
+                for row in sorted(dirty) if state[row] != _DELETED
+            ],
+            'ready_added': [[pid, key] for pid, key in added.items()],
+            'ready_removed': list(removed),
+            'completed_added': list(self.completed_processes[emitted_completed:]),
+            'metrics': {name: value for name, value in metrics.items()
+                        if emitted_metrics.get(name) != value}
+        }
+
+    def get_timeline(self, start: int = 0, end: int = None, resolution: int = None) -> Dict:
+        """Gantt segments and queue/idle series over ``[start, end)``.
+
+        ``resolution`` caps the number of segments and series points; busy
+        stretches shorter than a pixel's worth are merged so long runs stay
+        cheap to draw.
+        """
+        if self._evaluated_order is not None:
+            self._replay_timeline(self._evaluated_order)
+            self._evaluated_order = None
+        end = self.current_time + 1 if end is None else end
+        timeline = {
+            'from': start,
+            'to': end,
+            'bucket_width': self.timeline.bucket_width,
+            'segments': self.timeline.segments(start, end, resolution),
+            'series': self.timeline.series(start, end, resolution)
+        }
+        if self.core_timelines:
+            timeline['cores'] = [
+                {'segments': core.segments(start, end, resolution), 'series': core.series(start, end, resolution)}
+                for core in self.core_timelines
+            ]
+        return timeline
+
+    def _replay_timeline(self, order):
+        """Fill the timeline of an ``evaluate``d run from its final schedule.
+
+        Between arrivals, dispatches and completions the ready-queue length
+        and CPU state are constant, so each stretch is one ``sample`` call.
+        """
+        table = self.table
+        first_pid = table.first_pid
+        start_time, burst, arrival = table.start_time, table.burst_time, table.arrival_time
+        ready_changes = Counter()
+        busy_changes = Counter()
+        for row in order:
+            start = start_time[row]
+            ticks = max(burst[row], 1)
+            self.timeline.run(first_pid + row, start, ticks)
+            ready_changes[max(arrival[row], 0)] += 1
+            ready_changes[start] -= 1
+            busy_changes[start] += 1
+            busy_changes[start + ticks] -= 1
+
+        # Ticks are sampled from 1, like the tick engine does after start()
+        end = self.current_time + 1
+        ticks = sorted(set(ready_changes) | set(busy_changes) | {1, end})
+        ready = busy = 0
+        for tick, next_tick in zip(ticks, ticks[1:]):
+            ready += ready_changes[tick]
+            busy += busy_changes[tick]
+            low, high = max(tick, 1), min(next_tick, end)
+            if high > low:
+                self.timeline.sample(low, high - low, ready, busy > 0)
+
     def get_processes(self) -> List[Dict]:
         """Get list of all processes with their current state."""
+        table = self.table
+        first_pid = table.first_pid
+        burst, arrival, priority, state = table.burst_time, table.arrival_time, table.priority, table.state
+        remaining, waiting = table.remaining_time, table.waiting_time
+        turnaround, completion = table.turnaround_time, table.completion_time
         return [{
-            'pid': p.pid,
-            'burst_time': p.burst_time,
-            'arrival_time': p.arrival_time,
-            'remaining_time': p.remaining_time,
-            'state': p.state.value,
-            'waiting_time': p.waiting_time,
-            'turnaround_time': p.turnaround_time,
-            'completion_time': p.completion_time,
-            'priority': p.priority
-        } for p in self.processes]
+            'pid': first_pid + row,
+            'burst_time': burst[row],
+            'arrival_time': arrival[row],
+            'remaining_time': remaining[row],
+            'state': _STATES[state[row]].value,
+            'waiting_time': waiting[row],
+            'turnaround_time': turnaround[row],
+            'completion_time': completion[row],
+            'priority': priority[row]
+        } for row in self.processes.rows]
 
     def get_performance_metrics(self) -> Dict:
         """Calculate and return performance metrics."""
-        completed = [p for p in self.processes if p.state == ProcessState.TERMINATED]
-        if not completed:
-            return {
-                'avg_waiting_time': 0,
-                'avg_turnaround_time': 0,
-                'avg_response_time': 0
-            }
-
-        total_waiting_time = sum(p.waiting_time for p in completed)
-        total_turnaround_time = sum(p.turnaround_time for p in completed)
-        total_response_time = sum(p.start_time - p.arrival_time for p in completed if p.start_time is not None)
-        total_burst_time = sum(p.burst_time for p in completed)
-        total_time = max(p.end_time for p in completed) if completed else 0
+        return self._update_metrics()
 
-        return {
-            'avg_waiting_time': total_waiting_time / len(completed),
-            'avg_turnaround_time': total_turnaround_time / len(completed),
-            'avg_response_time': total_response_time / len(completed)
-        } 
\ No newline at end of file
+if __name__ == '__main__':
+    # python -m process_scheduler: the headless batch runner
+    from cli import main
+    raise SystemExit(main())
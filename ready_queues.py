@@ -0,0 +1,374 @@
+"""Ready queues: the processes waiting for a CPU, in dispatch order.
+
+Every queue records its net pushes and pops so state deltas can describe
+ready-queue changes, and can give a process's ``order_key`` so clients
+sort the queue the way the scheduler serves it.
+"""
+import heapq
+from collections import deque
+from typing import Callable
+
+class _ReadyQueueChanges:
+    """Net ready-queue pushes and pops since the last ``take_changes`` call.
+
+    A pid pushed and popped inside the same window only shows up as removed,
+    and a re-keyed pid shows up as added with its new order key, so a client
+    can replay removals and then additions to catch up.
+    """
+
+    def _reset_changes(self):
+        self._added = {}
+        self._removed = set()
+
+    def _note_push(self, pid: int, order_key: list):
+        self._removed.discard(pid)
+        self._added[pid] = order_key
+
+    def _note_pop(self, pid: int):
+        self._added.pop(pid, None)
+        self._removed.add(pid)
+
+    def take_changes(self):
+        """Return ``(added, removed)`` and start a new window."""
+        added, removed = self._added, self._removed
+        self._reset_changes()
+        return added, removed
+
+class FifoReadyQueue(_ReadyQueueChanges):
+    """Ready queue served in insertion order (FCFS and Round Robin)."""
+
+    def __init__(self):
+        self._queue = deque()
+        self._members = {}
+        self._next_seq = 0
+        self._reset_changes()
+
+    def push(self, pid: int):
+        seq = self._next_seq
+        self._next_seq += 1
+        self._queue.append(pid)
+        self._members[pid] = seq
+        self._note_push(pid, [seq])
+
+    def pop(self) -> int:
+        pid = self._queue.popleft()
+        del self._members[pid]
+        self._note_pop(pid)
+        return pid
+
+    def peek(self) -> int:
+        return self._queue[0]
+
+    def remove(self, pid: int):
+        self._queue.remove(pid)
+        del self._members[pid]
+        self._note_pop(pid)
+
+    def update(self, pid: int):
+        """Insertion order does not depend on process fields, nothing to do."""
+
+    def copy(self) -> 'FifoReadyQueue':
+        """Independent copy with the same order and no pending changes."""
+        queue = FifoReadyQueue()
+        queue._queue = deque(self._queue)
+        queue._members = dict(self._members)
+        queue._next_seq = self._next_seq
+        return queue
+
+    def order_key(self, pid: int) -> list:
+        """Sort key placing ``pid`` among the other queued processes."""
+        return [self._members[pid]]
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._members
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def __iter__(self):
+        return iter(self._queue)
+
+class HeapReadyQueue(_ReadyQueueChanges):
+    """Ready queue backed by a binary heap ordered by ``key(pid)``.
+
+    Ties are broken by ``order``, the position in the ready list the
+    scheduler used to keep: processes were appended to it and it was
+    stable-sorted by key before every dispatch. Without edits that is
+    insertion order; a re-keyed process keeps its place in the list, which
+    ``update`` reproduces by renumbering the queue. Removed entries are only
+    marked and skipped lazily when they reach the top of the heap.
+
+    Heap entries are ``[key, order, seq, pid]``. ``seq`` is fresh on every
+    push, so no two entries ever compare equal and a removed entry (whose
+    pid is None) is never compared with a live one beyond its ``seq``.
+    """
+
+    def __init__(self, key: Callable[[int], int]):
+        self._key = key
+        self._heap = []
+        self._entries = {}
+        self._next_seq = 0
+        # Entries pushed before this seq were in the list when it was last
+        # sorted, or None when orders are the list positions themselves
+        self._sorted_before = None
+        self._reset_changes()
+
+    def push(self, pid: int):
+        seq = self._next_seq
+        self._next_seq += 1
+        entry = [self._key(pid), seq, seq, pid]
+        self._entries[pid] = entry
+        heapq.heappush(self._heap, entry)
+        self._note_push(pid, entry[:2])
+
+    def pop(self, sort: bool = True) -> int:
+        """Remove and return the first process.
+
+        A dispatch sorted the list first; a preempting process was taken
+        out of it as it was, so pass ``sort=False`` for those.
+        """
+        self._discard_removed()
+        pid = heapq.heappop(self._heap)[3]
+        del self._entries[pid]
+        self._note_pop(pid)
+        if sort:
+            self._sorted_before = self._next_seq
+        return pid
+
+    def peek(self) -> int:
+        self._discard_removed()
+        return self._heap[0][3]
+
+    def remove(self, pid: int):
+        entry = self._entries.pop(pid)
+        entry[3] = None
+        self._note_pop(pid)
+
+    def update(self, pid: int):
+        """Re-key a queued process after its burst time or priority changed."""
+        entry = self._entries[pid]
+        key = self._key(pid)
+        if key == entry[0]:
+            return
+        # Number every entry by its place in the list: when it was last
+        # sorted, by the keys it had then (the old key for this entry),
+        # followed by the processes appended since
+        boundary = self._sorted_before
+        if boundary is None:
+            ordered = sorted(self._entries.values(), key=lambda entry: entry[1])
+        else:
+            ordered = sorted(self._entries.values(),
+                             key=lambda entry: (1, 0, entry[1]) if entry[2] >= boundary else (0, entry[0], entry[1]))
+        entry[0] = key
+        for order, queued in enumerate(ordered):
+            queued[1] = order
+            self._note_push(queued[3], queued[:2])
+        self._heap = ordered
+        heapq.heapify(self._heap)
+        self._sorted_before = None
+
+    def order_key(self, pid: int) -> list:
+        """Sort key placing ``pid`` among the other queued processes."""
+        return self._entries[pid][:2]
+
+    def copy(self) -> 'HeapReadyQueue':
+        """Independent copy with the same order and no pending changes.
+
+        Entries removed lazily are left behind, so the copy's heap layout
+        may differ, but entries are unique and it pops in the same order.
+        """
+        queue = HeapReadyQueue(self._key)
+        queue._entries = {pid: list(entry) for pid, entry in self._entries.items()}
+        queue._heap = list(queue._entries.values())
+        heapq.heapify(queue._heap)
+        queue._next_seq = self._next_seq
+        queue._sorted_before = self._sorted_before
+        return queue
+
+    def _discard_removed(self):
+        while self._heap and self._heap[0][3] is None:
+            heapq.heappop(self._heap)
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return (entry[3] for entry in sorted(self._entries.values()))
+
+class MultilevelReadyQueue(_ReadyQueueChanges):
+    """Ready queue of a multilevel feedback queue: one FIFO per level.
+
+    Level 0 is served first. A process keeps its level while it runs, and
+    enters level 0 when it is first pushed. Each level's FIFO is ordered by
+    the time processes joined it, so aging only has to look at the front of
+    every level.
+    """
+
+    def __init__(self, levels: int, clock: Callable[[], int]):
+        self._clock = clock
+        self._levels = [deque() for _ in range(levels)]
+        self._members = {}  # pid -> [level, seq, time it joined the level]
+        self._level = {}  # Current level of every process pushed so far
+        self._next_seq = 0
+        self._reset_changes()
+
+    def level_of(self, pid: int) -> int:
+        return self._level.get(pid, 0)
+
+    def set_level(self, pid: int, level: int):
+        """Move ``pid``, which is not queued, to ``level`` for when it is pushed next."""
+        self._level[pid] = level
+
+    def push(self, pid: int, level: int = None):
+        if level is None:
+            level = self._level.get(pid, 0)
+        seq = self._next_seq
+        self._next_seq += 1
+        self._level[pid] = level
+        self._levels[level].append(pid)
+        self._members[pid] = [level, seq, self._clock()]
+        self._note_push(pid, [level, seq])
+
+    def pop(self) -> int:
+        for queue in self._levels:
+            if queue:
+                pid = queue.popleft()
+                del self._members[pid]
+                self._note_pop(pid)
+                return pid
+        raise IndexError("pop from an empty ready queue")
+
+    def peek(self) -> int:
+        for queue in self._levels:
+            if queue:
+                return queue[0]
+        raise IndexError("peek at an empty ready queue")
+
+    def top_level(self) -> int:
+        """Level of the process ``pop`` would return."""
+        return self._members[self.peek()][0]
+
+    def remove(self, pid: int):
+        level = self._members.pop(pid)[0]
+        self._levels[level].remove(pid)
+        self._note_pop(pid)
+
+    def update(self, pid: int):
+        """Levels do not depend on process fields, nothing to do."""
+
+    def age(self, threshold: int) -> int:
+        """Promote processes that waited ``threshold`` ticks on their level by one level."""
+        now = self._clock()
+        promoted = 0
+        for level in range(1, len(self._levels)):
+            queue = self._levels[level]
+            while queue and now - self._members[queue[0]][2] >= threshold:
+                pid = queue.popleft()
+                del self._members[pid]
+                self.push(pid, level - 1)
+                promoted += 1
+        return promoted
+
+    def next_promotion(self, threshold: int):
+        """Time at which ``age`` will next promote a process, or None."""
+        waiting = [self._members[queue[0]][2] for queue in self._levels[1:] if queue]
+        return min(waiting) + threshold if waiting else None
+
+    def copy(self) -> 'MultilevelReadyQueue':
+        """Independent copy with the same order and no pending changes."""
+        queue = MultilevelReadyQueue(len(self._levels), self._clock)
+        queue._levels = [deque(level) for level in self._levels]
+        queue._members = {pid: list(member) for pid, member in self._members.items()}
+        queue._level = dict(self._level)
+        queue._next_seq = self._next_seq
+        return queue
+
+    def order_key(self, pid: int) -> list:
+        """Sort key placing ``pid`` among the other queued processes."""
+        return self._members[pid][:2]
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self):
+        return (pid for queue in self._levels for pid in queue)
+
+class PerCoreReadyQueue(_ReadyQueueChanges):
+    """One FIFO run queue per core, as used for multi-core scheduling.
+
+    A process pushed without a core joins the shortest queue. ``steal``
+    lets an idle core take the most recently queued process of the longest
+    queue, so the other processes there keep their place.
+    """
+
+    def __init__(self, cores: int):
+        self._queues = [deque() for _ in range(cores)]
+        self._members = {}  # pid -> [core, seq]
+        self._next_seq = 0
+        self._reset_changes()
+
+    def push(self, pid: int, core: int = None):
+        if core is None:
+            core = min(range(len(self._queues)), key=lambda core: len(self._queues[core]))
+        seq = self._next_seq
+        self._next_seq += 1
+        self._queues[core].append(pid)
+        self._members[pid] = [core, seq]
+        self._note_push(pid, [core, seq])
+
+    def pop(self, core: int = 0) -> int:
+        pid = self._queues[core].popleft()
+        del self._members[pid]
+        self._note_pop(pid)
+        return pid
+
+    def peek(self, core: int = 0) -> int:
+        return self._queues[core][0]
+
+    def remove(self, pid: int):
+        core = self._members.pop(pid)[0]
+        self._queues[core].remove(pid)
+        self._note_pop(pid)
+
+    def update(self, pid: int):
+        """Queue placement does not depend on process fields, nothing to do."""
+
+    def steal(self, core: int) -> bool:
+        """Move one process from the longest other queue to ``core``'s queue."""
+        victim = max(range(len(self._queues)), key=lambda other: len(self._queues[other]))
+        if victim == core or not self._queues[victim]:
+            return False
+        pid = self._queues[victim].pop()
+        self._note_pop(pid)
+        self.push(pid, core)
+        return True
+
+    def core_length(self, core: int) -> int:
+        return len(self._queues[core])
+
+    def copy(self) -> 'PerCoreReadyQueue':
+        """Independent copy with the same order and no pending changes."""
+        queue = PerCoreReadyQueue(len(self._queues))
+        queue._queues = [deque(pids) for pids in self._queues]
+        queue._members = {pid: list(member) for pid, member in self._members.items()}
+        queue._next_seq = self._next_seq
+        return queue
+
+    def order_key(self, pid: int) -> list:
+        """Sort key placing ``pid`` among the other queued processes."""
+        return self._members[pid][:2]
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self):
+        return (pid for queue in self._queues for pid in queue)
@@ -0,0 +1,131 @@
+"""Memoized results of complete simulation runs.
+
+Running the same workload with the same algorithm and settings always
+produces the same result, so finished runs are kept under a content hash
+of both (``ProcessScheduler.result_key``) and the next identical run is
+restored instead of simulated. Editing a workload changes its hash, so an
+entry can never describe a workload other than the one it was run on.
+"""
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+class ResultCache:
+    """LRU cache of finished runs within a memory budget, optionally on disk.
+
+    Entries are kept pickled, which makes their size exact and means every
+    ``get`` hands out a fresh copy the caller may modify. With a
+    ``directory``, entries are also written there and misses in memory fall
+    back to it, so results survive restarts and are shared by every process
+    using the same directory; the least recently used files are removed
+    once they outgrow ``max_disk_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, directory: str = None,
+                 max_disk_bytes: int = 1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        # Worker processes forked while another thread held the lock would never get it
+        os.register_at_fork(after_in_child=self._reset_lock)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """The result stored under ``key``, or None."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            else:
+                data = self._load(key)
+                if data is not None:
+                    self._remember(key, data)
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return pickle.loads(data)
+
+    def put(self, key: str, result: Dict):
+        """Store ``result`` under ``key``, replacing any previous entry."""
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, data)
+            if self.directory:
+                self._save(key, data)
+
+    def clear(self):
+        """Forget every entry, on disk too."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            for entry in self._disk_entries():
+                os.remove(entry.path)
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self._entries),
+            'bytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def _reset_lock(self):
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, data: bytes):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= len(old)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = data
+        self.nbytes += len(data)
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= len(evicted)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.pickle')
+
+    def _load(self, key: str) -> Optional[bytes]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # The file's modification time is its position in the disk LRU
+        os.utime(self._path(key))
+        return data
+
+    def _save(self, key: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        entries = sorted(self._disk_entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.max_disk_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+
+    def _disk_entries(self):
+        if not self.directory:
+            return []
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith('.pickle')]
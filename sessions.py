@@ -0,0 +1,346 @@
+"""Per-simulation scheduler instances for the web app.
+
+Every browser session (or explicit simulation id) gets its own
+``ProcessScheduler``. Live simulations are kept in an LRU cache bounded by
+idle time and an approximate memory budget; simulations pushed out of the
+cache are pickled to a private spill directory and restored on their next
+request, unless they expire there first.
+
+Each simulation is an actor: a single writer task owns the scheduler and
+runs the commands submitted with ``execute`` one at a time, so requests and
+the simulation loop can never interleave mid-tick. Reads are answered from
+JSON snapshots serialized once per state change, which any number of
+clients share without going through the writer.
+"""
+import atexit
+import json
+import os
+import pickle
+import queue
+import re
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+from process_scheduler import ProcessScheduler
+
+SIMULATION_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+def _spawn_thread(target: Callable):
+    threading.Thread(target=target, daemon=True).start()
+
+class Simulation:
+    """A scheduler together with the playback settings of one simulation.
+
+    Only the writer task may touch ``scheduler``; everyone else submits
+    commands with ``execute`` or reads snapshots with ``read``. The writer
+    is started on the first command with ``spawn``, which the web app points
+    at its async framework's background tasks.
+    """
+
+    def __init__(self, simulation_id: str, scheduler_factory: Callable[[], ProcessScheduler] = ProcessScheduler):
+        self.id = simulation_id
+        self.scheduler = scheduler_factory()
+        self.settings = {'frame_rate': 2, 'ticks_per_frame': 1}
+        # Bumped whenever a new simulation loop starts so older loops stop
+        self.generation = 0
+        self.last_used = time.monotonic()
+        self._init_actor()
+
+    def _init_actor(self):
+        self.spawn = _spawn_thread
+        self.version = 0  # Bumped after every command that may change the scheduler
+        self._snapshots = {}  # name -> (version, JSON bytes)
+        self._commands = queue.SimpleQueue()
+        self._writer = None  # Ident of the task serving _commands, while it runs
+        self._started = False
+        self._lock = threading.Lock()
+        self._pending = 0  # Commands queued or running
+        self.leases = 0  # Handlers holding the simulation, which keep it from being spilled
+
+    def __getstate__(self):
+        # The command queue and writer belong to this process; snapshots are rebuilt on demand
+        state = self.__dict__.copy()
+        for name in ('spawn', 'version', '_snapshots', '_commands', '_writer', '_started', '_lock', '_pending',
+                     'leases'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_actor()
+
+    @property
+    def pending(self) -> int:
+        """Commands queued or running."""
+        return self._pending
+
+    @property
+    def idle(self) -> bool:
+        """Whether no command is queued or running."""
+        return self._pending == 0
+
+    def execute(self, command: Callable, *args, mutates: bool = True) -> Any:
+        """Run ``command(*args)`` on the writer task and return its result.
+
+        Commands run one at a time in submission order; exceptions are
+        re-raised in the caller. Pass ``mutates=False`` for commands that
+        leave the simulation as it was, so cached snapshots stay valid.
+        """
+        if self._writer == threading.get_ident():
+            # Already on the writer, e.g. a command issuing another one
+            return self._run(command, args, mutates)
+        future = Future()
+        with self._lock:
+            self._pending += 1
+            self._commands.put((command, args, mutates, future))
+            if not self._started:
+                self._started = True
+                commands = self._commands
+                self.spawn(lambda: self._serve(commands))
+        return future.result()
+
+    def read(self, name: str, build: Callable[[ProcessScheduler], Any]) -> bytes:
+        """JSON of ``build(scheduler)``, serialized at most once per version.
+
+        A snapshot of the current version is returned straight away, without
+        queueing behind the writer; the bytes are never modified afterwards.
+        """
+        cached = self._snapshots.get(name)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        return self.execute(self._snapshot, name, build, mutates=False)
+
+    def forget(self, name: str):
+        """Drop the cached snapshot ``name``, after a command that changed
+        what it reports without changing the simulation."""
+        self._snapshots.pop(name, None)
+
+    def _snapshot(self, name: str, build: Callable) -> bytes:
+        cached = self._snapshots.get(name)
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, json.dumps(build(self.scheduler)).encode())
+            self._snapshots[name] = cached
+        return cached[1]
+
+    def stop(self):
+        """Let the writer task finish once the queued commands have run.
+
+        Later commands go to a new queue and start a new writer, so there
+        is never more than one writer per queue.
+        """
+        with self._lock:
+            if self._started:
+                self._commands.put(None)
+                self._commands = queue.SimpleQueue()
+                self._started = False
+
+    def _serve(self, commands: queue.SimpleQueue):
+        writer = threading.get_ident()
+        while True:
+            item = commands.get()
+            if item is None:
+                return
+            self._writer = writer
+            command, args, mutates, future = item
+            try:
+                result, error = self._run(command, args, mutates), None
+            except BaseException as e:
+                result, error = None, e
+            self._writer = None
+            # Done before the caller resumes, so it finds the simulation idle
+            with self._lock:
+                self._pending -= 1
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _run(self, command: Callable, args: tuple, mutates: bool):
+        try:
+            return command(*args)
+        finally:
+            if mutates:
+                self.version += 1
+
+    @property
+    def nbytes(self) -> int:
+        """Rough memory footprint, used to enforce the store's budget."""
+        scheduler = self.scheduler
+        return (scheduler.table.nbytes
+                + 8 * (len(scheduler.processes) + len(scheduler.completed_processes))
+                + 128 * len(scheduler.ready_queue)
+                + scheduler.checkpoints.nbytes)
+
+def _private_dir(path: str) -> str:
+    """Create ``path`` if needed and make sure only this user can use it.
+
+    Spill files are unpickled, so anyone able to write to the directory
+    could run code in the server.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.stat(path, follow_symlinks=False)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"Spill directory {path} must be a directory only its owner can access")
+    return path
+
+class SimulationStore:
+    """LRU cache of simulations with an idle TTL, a memory cap and disk spill.
+
+    Running simulations are pinned: their loop keeps a reference to the
+    ``Simulation`` object, so they are only evicted once paused. So are
+    simulations handed out by ``get`` until they are ``release``d.
+
+    Spilled simulations are deleted once they have not been used for
+    ``spill_ttl`` seconds, and the oldest ones whenever the spill directory
+    outgrows ``max_spill_bytes``. Without a ``spill_dir`` a fresh private
+    temporary directory is used and removed at exit.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl: float = 30 * 60,
+                 spill_dir: str = None, scheduler_factory: Callable[[], ProcessScheduler] = ProcessScheduler,
+                 spawn: Callable[[Callable], Any] = _spawn_thread, spill_ttl: float = 24 * 60 * 60,
+                 max_spill_bytes: int = 1024 * 1024 * 1024, result_cache=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.spill_ttl = spill_ttl
+        self.max_spill_bytes = max_spill_bytes
+        if spill_dir:
+            self.spill_dir = _private_dir(spill_dir)
+        else:
+            self.spill_dir = tempfile.mkdtemp(prefix='process-scheduler-sessions-')
+            atexit.register(shutil.rmtree, self.spill_dir, ignore_errors=True)
+        self.scheduler_factory = scheduler_factory
+        self.spawn = spawn  # Starts the writer task of each simulation
+        self.result_cache = result_cache  # Shared by the schedulers of every simulation here, or None
+        self._simulations: 'OrderedDict[str, Simulation]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_expiry = 0.0  # When spill files are next checked for expiry
+        self.spilled = 0
+        self.restored = 0
+        self.expired = 0
+
+    def get(self, simulation_id: str) -> Simulation:
+        """Return the simulation for ``simulation_id``, restoring or creating it.
+
+        The simulation cannot be spilled until the caller hands it back
+        with ``release``.
+        """
+        if not SIMULATION_ID.match(simulation_id):
+            raise ValueError(f"Invalid simulation id: {simulation_id}")
+        with self._lock:
+            simulation = self._simulations.get(simulation_id)
+            if simulation is None:
+                simulation = self._restore(simulation_id) or Simulation(simulation_id, self.scheduler_factory)
+                simulation.spawn = self.spawn
+                simulation.scheduler.result_cache = self.result_cache
+                self._simulations[simulation_id] = simulation
+            else:
+                self._simulations.move_to_end(simulation_id)
+            simulation.last_used = time.monotonic()
+            simulation.leases += 1
+            self._evict(keep=simulation_id)
+            return simulation
+
+    def release(self, simulation: Simulation):
+        """Hand back a simulation obtained from ``get``."""
+        with self._lock:
+            simulation.leases -= 1
+            simulation.last_used = time.monotonic()
+
+    def live(self) -> List[Simulation]:
+        """Simulations currently held in memory, least recently used first."""
+        with self._lock:
+            return list(self._simulations.values())
+
+    def __contains__(self, simulation_id: str) -> bool:
+        return simulation_id in self._simulations or os.path.exists(self._spill_path(simulation_id))
+
+    def __len__(self) -> int:
+        return len(self._simulations)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(simulation.nbytes for simulation in self._simulations.values())
+
+    def stats(self) -> Dict:
+        return {
+            'live': len(self._simulations),
+            'bytes': self.nbytes,
+            'spilled': self.spilled,
+            'restored': self.restored,
+            'expired': self.expired
+        }
+
+    def _evict(self, keep: str):
+        """Spill idle simulations past their TTL, then the least recently used
+        ones until the live set fits in ``max_bytes``."""
+        now = time.monotonic()
+        for simulation_id, simulation in list(self._simulations.items()):
+            if simulation_id != keep and now - simulation.last_used > self.ttl:
+                self._spill(simulation)
+
+        total = self.nbytes
+        for simulation_id, simulation in list(self._simulations.items()):
+            if total <= self.max_bytes:
+                break
+            if simulation_id != keep:
+                size = simulation.nbytes
+                if self._spill(simulation):
+                    total -= size
+
+        if now >= self._next_expiry:
+            self._next_expiry = now + min(60, self.spill_ttl)
+            self._expire_spilled()
+
+    def _expire_spilled(self):
+        """Delete spill files unused for ``spill_ttl``, then the oldest beyond ``max_spill_bytes``."""
+        now = time.time()
+        files = []
+        for entry in os.scandir(self.spill_dir):
+            if not entry.name.endswith('.pickle'):
+                continue
+            info = entry.stat()
+            if now - info.st_mtime > self.spill_ttl:
+                os.remove(entry.path)
+                self.expired += 1
+            else:
+                files.append((info.st_mtime, info.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_spill_bytes:
+                break
+            os.remove(path)
+            total -= size
+            self.expired += 1
+
+    def _spill(self, simulation: Simulation) -> bool:
+        if simulation.scheduler.is_running or not simulation.idle or simulation.leases:
+            return False
+        simulation.stop()
+        path = self._spill_path(simulation.id)
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(simulation, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        del self._simulations[simulation.id]
+        self.spilled += 1
+        return True
+
+    def _restore(self, simulation_id: str):
+        path = self._spill_path(simulation_id)
+        try:
+            with open(path, 'rb') as f:
+                simulation = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        os.remove(path)
+        self.restored += 1
+        return simulation
+
+    def _spill_path(self, simulation_id: str) -> str:
+        return os.path.join(self.spill_dir, f'{simulation_id}.pickle')
@@ -1,8 +1,7 @@
 document.addEventListener('DOMContentLoaded', () => {
     const visualizer = new ProcessVisualizer();
-    let simulationInterval = null;
+    const simulationState = new SimulationState();
     let currentSpeed = 'medium';
-    let metricsChart = null;
 
     // DOM Elements
     const startBtn = document.getElementById('start-btn');
@@ -10,12 +9,16 @@ document.addEventListener('DOMContentLoaded', () => {
     const resetBtn = document.getElementById('reset-btn');
     const algorithmSelect = document.getElementById('algorithm-select');
     const speedSelect = document.getElementById('speed-select');
+    const coresInput = document.getElementById('cores-input');
     const addProcessBtn = document.getElementById('add-process-btn');
     const generateRandomBtn = document.getElementById('generate-random-btn');
     const burstTimeInput = document.getElementById('burst-time');
     const arrivalTimeInput = document.getElementById('arrival-time');
     const priorityInput = document.getElementById('priority');
-    const processListTable = document.getElementById('process-list-table').getElementsByTagName('tbody')[0];
+    const processListTable = document.getElementById('process-list-table');
+    let processList = new Map();
+    const processListView = new VirtualList(processListTable.parentElement, processListTable.tBodies[0],
+        createProcessListRow, (row, pid) => drawProcessListRow(row, processList.get(pid)));
 
     // Make editProcess and deleteProcess globally accessible
     window.editProcess = function(pid) {
@@ -41,14 +44,48 @@ document.addEventListener('DOMContentLoaded', () => {
     speedSelect.addEventListener('change', updateSpeed);
     addProcessBtn.addEventListener('click', addProcess);
     generateRandomBtn.addEventListener('click', generateRandomProcesses);
+    // Rows come and go as the table scrolls, so their buttons share one listener
+    processListTable.tBodies[0].addEventListener('click', (event) => {
+        const button = event.target.closest('button');
+        if (!button) return;
+        const pid = parseInt(button.closest('tr').dataset.pid);
+        if (button.classList.contains('edit-btn')) window.editProcess(pid);
+        else window.deleteProcess(pid);
+    });
+    document.getElementById('gantt-chart').addEventListener('click', (event) => {
+        const tick = visualizer.timelineTickAt(event.clientX);
+        if (tick !== null) seekSimulation(tick);
+    });
 
     // Socket.IO event handlers
+    // Full snapshot, sent on connect, on resync and after bulk changes
     socket.on('state_update', (data) => {
-        updateVisualization(data);
-        updateProcessList(data.processes);
-        visualizer.updateProcessTable(data.processes);
-        visualizer.updateProcessQueues(data.processes, data.ready_queue, data.waiting_queue, data.completed_processes);
-        visualizer.updatePerformanceMetrics(data.performance_metrics);
+        simulationState.applySnapshot(data);
+        scheduleRender();
+    });
+
+    // Compact patch against the previous update
+    socket.on('state_delta', (delta) => {
+        if (!simulationState.applyDelta(delta)) {
+            socket.emit('resync');
+            return;
+        }
+        scheduleRender();
+    });
+
+    socket.on('simulation_complete', () => {
+        showNotification('success', 'Simulation complete');
+        refreshTimeline();
+    });
+
+    // Admission control started or stopped deferring arrivals; refused
+    // submissions are reported by the requests that made them
+    socket.on('backpressure', (data) => {
+        if (data.reason === 'deferred') {
+            showNotification('error', data.message);
+        } else if (data.reason === 'cleared') {
+            showNotification('success', data.message);
+        }
     });
 
     // Process Management Functions
@@ -79,7 +116,7 @@ document.addEventListener('DOMContentLoaded', () => {
             const data = await response.json();
             
             if (response.ok) {
-                updateProcessList(data.processes);
+                // The server broadcasts the new process list to every client
                 // Clear inputs
                 burstTimeInput.value = 1;
                 arrivalTimeInput.value = 0;
@@ -107,7 +144,6 @@ document.addEventListener('DOMContentLoaded', () => {
             const data = await response.json();
             
             if (response.ok) {
-                updateProcessList(data.processes);
                 showNotification('success', data.message);
             } else {
                 showNotification('error', data.message);
@@ -132,10 +168,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 })
             });
 
-            if (response.ok) {
-                const data = await response.json();
-                updateProcessList(data.processes);
-            } else {
+            if (!response.ok) {
                 alert('Failed to update process');
             }
         } catch (error) {
@@ -154,10 +187,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 method: 'DELETE'
             });
 
-            if (response.ok) {
-                const data = await response.json();
-                updateProcessList(data.processes);
-            } else {
+            if (!response.ok) {
                 alert('Failed to delete process');
             }
         } catch (error) {
@@ -166,75 +196,28 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    function updateProcessList(processes) {
-        processListTable.innerHTML = processes
-            .map(process => `
-                <tr>
-                    <td>P${process.pid}</td>
-                    <td>${process.burst_time}</td>
-                    <td>${process.arrival_time}</td>
-                    <td>${process.priority}</td>
-                    <td class="action-buttons">
-                        <button class="edit-btn" onclick="editProcess(${process.pid})">Edit</button>
-                        <button class="delete-btn" onclick="deleteProcess(${process.pid})">Delete</button>
-                    </td>
-                </tr>
-            `)
-            .join('');
+    function updateProcessList(view) {
+        processList = view.processes;
+        processListView.update(view.order, view.changed);
     }
 
-    function updatePerformanceMetrics(metrics) {
-        if (!metrics) return;
-        
-        // Update metric cards
-        document.getElementById('avg-waiting-time').textContent = metrics.avg_waiting_time.toFixed(2);
-        document.getElementById('avg-turnaround-time').textContent = metrics.avg_turnaround_time.toFixed(2);
-        document.getElementById('avg-response-time').textContent = metrics.avg_response_time.toFixed(2);
-        document.getElementById('cpu-utilization').textContent = metrics.cpu_utilization.toFixed(2) + '%';
-        document.getElementById('throughput').textContent = metrics.throughput.toFixed(2);
-
-        // Update metrics chart
-        updateMetricsChart(metrics);
+    function createProcessListRow() {
+        const row = visualizer.createTableRow(5);
+        const actions = row.cells[4];
+        actions.className = 'action-buttons';
+        actions.innerHTML = `
+            <button class="edit-btn">Edit</button>
+            <button class="delete-btn">Delete</button>
+        `;
+        return row;
     }
 
-    function updateMetricsChart(metrics) {
-        const ctx = document.getElementById('metrics-chart').getContext('2d');
-        
-        if (metricsChart) {
-            metricsChart.destroy();
-        }
-
-        metricsChart = new Chart(ctx, {
-            type: 'bar',
-            data: {
-                labels: ['Waiting Time', 'Turnaround Time', 'Response Time', 'CPU Utilization', 'Throughput'],
-                datasets: [{
-                    label: 'Performance Metrics',
-                    data: [
-                        metrics.avg_waiting_time,
-                        metrics.avg_turnaround_time,
-                        metrics.avg_response_time,
-                        metrics.cpu_utilization,
-                        metrics.throughput
-                    ],
-                    backgroundColor: [
-                        '#e74c3c',
-                        '#e67e22',
-                        '#f1c40f',
-                        '#2ecc71',
-                        '#3498db'
-                    ]
-                }]
-            },
-            options: {
-                responsive: true,
-                scales: {
-                    y: {
-                        beginAtZero: true
-                    }
-                }
-            }
-        });
+    function drawProcessListRow(row, process) {
+        row.dataset.pid = process.pid;
+        setText(row.cells[0], `P${process.pid}`);
+        setText(row.cells[1], process.burst_time);
+        setText(row.cells[2], process.arrival_time);
+        setText(row.cells[3], process.priority);
     }
 
     // API Functions
@@ -246,13 +229,13 @@ document.addEventListener('DOMContentLoaded', () => {
                 headers: {
                     'Content-Type': 'application/json'
                 },
-                body: JSON.stringify({ algorithm })
+                body: JSON.stringify({ algorithm, speed: currentSpeed, cores: parseInt(coresInput.value) || 1 })
             });
             
             const data = await response.json();
             
             if (response.ok) {
-                startSimulationInterval();
+                // The server runs the simulation and pushes state_update events
                 showNotification('success', data.message);
             } else {
                 showNotification('error', data.message);
@@ -270,7 +253,6 @@ document.addEventListener('DOMContentLoaded', () => {
             });
             
             if (response.ok) {
-                clearInterval(simulationInterval);
                 showNotification('success', 'Simulation paused');
             }
         } catch (error) {
@@ -285,14 +267,8 @@ document.addEventListener('DOMContentLoaded', () => {
             });
             
             if (response.ok) {
-                clearInterval(simulationInterval);
-                // Clear visualizations
-                visualizer.updateProcessQueues([], [], [], []);
-                visualizer.updateProcessTable([]);
-                if (metricsChart) {
-                    metricsChart.destroy();
-                    metricsChart = null;
-                }
+                // The server broadcasts the reset state, only the timeline is fetched
+                refreshTimeline();
                 showNotification('success', 'Simulation reset');
             }
         } catch (error) {
@@ -300,40 +276,84 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    function updateSpeed() {
+    // Jump to a tick of the run; the server restores the nearest checkpoint
+    async function seekSimulation(time) {
+        try {
+            const response = await fetch('/api/seek', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ time })
+            });
+            if (!response.ok) {
+                const data = await response.json();
+                showNotification('error', data.message);
+            }
+        } catch (error) {
+            console.error('Error seeking simulation:', error);
+        }
+    }
+
+    async function updateSpeed() {
         currentSpeed = speedSelect.value;
-        if (simulationInterval) {
-            clearInterval(simulationInterval);
-            startSimulationInterval();
+        try {
+            await fetch('/api/speed', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ speed: currentSpeed })
+            });
+        } catch (error) {
+            console.error('Error updating speed:', error);
         }
     }
 
-    function startSimulationInterval() {
-        const speeds = {
-            'slow': 1000,
-            'medium': 500,
-            'fast': 100
-        };
-
-        clearInterval(simulationInterval);
-        simulationInterval = setInterval(async () => {
-            try {
-                const response = await fetch('/api/step', {
-                    method: 'POST'
-                });
-                
-                if (response.ok) {
-                    const data = await response.json();
-                    if (data) {
-                        updateVisualization(data);
-                        updateProcessList(data.processes);
-                        updatePerformanceMetrics(data.performance_metrics);
-                    }
-                }
-            } catch (error) {
-                console.error('Error stepping simulation:', error);
+    // Updates arriving faster than the display refreshes are applied to
+    // simulationState right away but rendered once per animation frame
+    let renderFrame = null;
+
+    function scheduleRender() {
+        if (renderFrame === null) {
+            renderFrame = requestAnimationFrame(renderState);
+        }
+    }
+
+    function renderState() {
+        renderFrame = null;
+        const data = simulationState.takeView();
+        updateVisualization(data);
+        updateProcessList(data);
+        scheduleTimelineRefresh();
+    }
+
+    // The timeline is fetched rather than pushed, at most once a second
+    let timelineRequested = 0;
+    let timelineTimer = null;
+
+    function scheduleTimelineRefresh() {
+        if (timelineTimer) return;
+        const delay = Math.max(0, timelineRequested + 1000 - Date.now());
+        timelineTimer = setTimeout(() => {
+            timelineTimer = null;
+            refreshTimeline();
+        }, delay);
+    }
+
+    async function refreshTimeline() {
+        const canvas = document.getElementById('gantt-chart');
+        if (!canvas) return;
+        timelineRequested = Date.now();
+        try {
+            const resolution = Math.max(1, Math.floor(canvas.clientWidth));
+            const response = await fetch(`/api/timeline?resolution=${resolution}`);
+            if (response.ok) {
+                visualizer.updateTimeline(await response.json());
             }
-        }, speeds[currentSpeed]);
+        } catch (error) {
+            console.error('Error fetching timeline:', error);
+        }
     }
 
     function updateVisualization(data) {
@@ -343,9 +363,11 @@ document.addEventListener('DOMContentLoaded', () => {
             data.processes,
             data.ready_queue,
             data.waiting_queue,
-            data.completed_processes
+            data.completed_processes,
+            data.changed
         );
-        visualizer.updateProcessTable(data.processes);
+        visualizer.updateProcessTable(data.processes, data.order, data.changed);
+        // null unless the metrics changed
         visualizer.updatePerformanceMetrics(data.performance_metrics);
     }
 
@@ -1,10 +1,20 @@
 class ProcessVisualizer {
     constructor() {
         this.metricsChart = null;
-        this.processTable = document.getElementById('process-table').getElementsByTagName('tbody')[0];
-        this.readyQueue = document.getElementById('ready-queue');
-        this.waitingQueue = document.getElementById('waiting-queue');
-        this.completedQueue = document.getElementById('completed-queue');
+        // pid -> process of the latest view, read when rows are drawn
+        this.processes = new Map();
+        const processTable = document.getElementById('process-table');
+        this.processTable = new VirtualList(processTable.parentElement, processTable.tBodies[0],
+            () => this.createTableRow(7), (row, pid) => this.drawTableRow(row, this.processes.get(pid)));
+        const queue = id => {
+            const element = document.getElementById(id);
+            return new VirtualList(element, element, () => this.createProcessElement(),
+                (chip, pid) => this.drawProcessElement(chip, this.processes.get(pid)));
+        };
+        this.readyQueue = queue('ready-queue');
+        this.waitingQueue = queue('waiting-queue');
+        this.completedQueue = queue('completed-queue');
+        this.ganttChart = document.getElementById('gantt-chart');
         
         // Check if metrics chart element exists
         const metricsChartElement = document.getElementById('metrics-chart');
@@ -41,37 +51,33 @@ class ProcessVisualizer {
         });
     }
 
-    updateProcessQueues(processes, readyQueue, waitingQueue, completedProcesses) {
-        // Update Ready Queue
-        this.readyQueue.innerHTML = readyQueue
-            .map(pid => this.createProcessElement(processes.find(p => p.pid === pid)))
-            .join('');
+    // `processes` maps pid to process; only the chips of pids in `changed`
+    // (every chip when it is null) are redrawn
+    updateProcessQueues(processes, readyQueue, waitingQueue, completedProcesses, changed = null) {
+        this.processes = processes;
+        this.readyQueue.update(readyQueue, changed);
+        this.waitingQueue.update(waitingQueue, changed);
+        this.completedQueue.update(completedProcesses, changed);
+    }
 
-        // Update Waiting Queue
-        this.waitingQueue.innerHTML = waitingQueue
-            .map(pid => this.createProcessElement(processes.find(p => p.pid === pid)))
-            .join('');
+    // `order` lists the pids top to bottom
+    updateProcessTable(processes, order, changed = null) {
+        this.processes = processes;
+        this.processTable.update(order, changed);
+    }
 
-        // Update Completed Queue
-        this.completedQueue.innerHTML = completedProcesses
-            .map(pid => this.createProcessElement(processes.find(p => p.pid === pid)))
-            .join('');
+    createTableRow(cells) {
+        const row = document.createElement('tr');
+        for (let i = 0; i < cells; i++) {
+            row.appendChild(document.createElement('td'));
+        }
+        return row;
     }
 
-    updateProcessTable(processes) {
-        this.processTable.innerHTML = processes
-            .map(process => `
-                <tr>
-                    <td>P${process.pid}</td>
-                    <td>${process.burst_time}</td>
-                    <td>${process.arrival_time}</td>
-                    <td>${process.state}</td>
-                    <td>${process.waiting_time || 0}</td>
-                    <td>${process.completion_time || 0}</td>
-                    <td>${process.turnaround_time || 0}</td>
-                </tr>
-            `)
-            .join('');
+    drawTableRow(row, process) {
+        const values = [`P${process.pid}`, process.burst_time, process.arrival_time, process.state,
+                        process.waiting_time || 0, process.completion_time || 0, process.turnaround_time || 0];
+        values.forEach((value, i) => setText(row.cells[i], value));
     }
 
     updatePerformanceMetrics(metrics) {
@@ -97,14 +103,94 @@ class ProcessVisualizer {
         }
     }
 
-    createProcessElement(process) {
-        if (!process) return '';
-        const color = this.getProcessColor(process.state);
-        return `
-            <div class="process ${process.state.toLowerCase()}" style="background-color: ${color}">
-                P${process.pid}
-            </div>
-        `;
+    // Gantt bars on top, ready-queue length (mean and max) below, idle
+    // time shaded. The server already downsampled everything to at most
+    // one segment and one series point per pixel.
+    updateTimeline(timeline) {
+        const canvas = this.ganttChart;
+        if (!canvas || !timeline) return;
+
+        const width = canvas.clientWidth;
+        const height = canvas.clientHeight;
+        const ratio = window.devicePixelRatio || 1;
+        if (canvas.width !== width * ratio || canvas.height !== height * ratio) {
+            canvas.width = width * ratio;
+            canvas.height = height * ratio;
+        }
+        const ctx = canvas.getContext('2d');
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        ctx.clearRect(0, 0, width, height);
+
+        this.timelineRange = [timeline.from, timeline.to];
+        const span = Math.max(timeline.to - timeline.from, 1);
+        const x = tick => (tick - timeline.from) / span * width;
+        const barHeight = height * 0.45;
+        const queueTop = barHeight + 10;
+        const queueHeight = height - queueTop;
+
+        ctx.fillStyle = '#ecf0f1';
+        ctx.fillRect(0, 0, width, barHeight);
+        // Multi-core runs get one lane per core
+        const lanes = timeline.cores ? timeline.cores.map(core => core.segments) : [timeline.segments];
+        const laneHeight = barHeight / lanes.length;
+        lanes.forEach((segments, lane) => {
+            for (const [pid, start, end] of segments) {
+                ctx.fillStyle = this.getPidColor(pid);
+                ctx.fillRect(x(start), lane * laneHeight, Math.max(x(end) - x(start), 1), Math.max(laneHeight - 1, 1));
+            }
+        });
+
+        const series = timeline.series;
+        if (!series.length) return;
+        const peak = Math.max(1, ...series.map(point => point.ready_max));
+        const y = value => queueTop + queueHeight - value / peak * queueHeight;
+
+        ctx.fillStyle = 'rgba(149, 165, 166, 0.35)';
+        for (const point of series) {
+            if (point.idle_fraction > 0) {
+                const h = point.idle_fraction * queueHeight;
+                ctx.fillRect(x(point.start), queueTop + queueHeight - h, x(point.end) - x(point.start), h);
+            }
+        }
+        [['ready_max', '#e67e22'], ['ready_mean', '#3498db']].forEach(([field, color]) => {
+            ctx.strokeStyle = color;
+            ctx.beginPath();
+            series.forEach((point, i) => {
+                const px = (x(point.start) + x(point.end)) / 2;
+                if (i === 0) ctx.moveTo(px, y(point[field]));
+                else ctx.lineTo(px, y(point[field]));
+            });
+            ctx.stroke();
+        });
+    }
+
+    // Tick under a horizontal position on the timeline canvas
+    timelineTickAt(clientX) {
+        if (!this.ganttChart || !this.timelineRange) return null;
+        const [from, to] = this.timelineRange;
+        const rect = this.ganttChart.getBoundingClientRect();
+        const fraction = Math.min(Math.max((clientX - rect.left) / rect.width, 0), 1);
+        return Math.round(from + fraction * (to - from));
+    }
+
+    getPidColor(pid) {
+        // Golden-angle hues keep neighbouring pids apart
+        return `hsl(${(pid * 137.508) % 360}, 60%, 55%)`;
+    }
+
+    createProcessElement() {
+        const chip = document.createElement('div');
+        chip.className = 'process';
+        return chip;
+    }
+
+    drawProcessElement(chip, process) {
+        const className = `process ${process.state.toLowerCase()}`;
+        if (chip.className !== className) {
+            chip.className = className;
+            chip.style.backgroundColor = this.getProcessColor(process.state);
+        }
+        setText(chip, `P${process.pid}`);
     }
 
     getProcessColor(state) {
@@ -117,4 +203,230 @@ class ProcessVisualizer {
         };
         return colors[state.toLowerCase()] || '#95a5a6';
     }
-}
\ No newline at end of file
+}
+
+// Windowed list of keyed rows. Only the rows scrolled into `viewport`, plus
+// `overscan` on either side, exist in `body`; spacers stand in for the
+// rest. Rows are keyed by pid and kept across updates, so a frame creates
+// rows scrolled into view, redraws the changed ones and moves the ones
+// whose position changed, however many processes there are.
+class VirtualList {
+    constructor(viewport, body, createRow, drawRow, overscan = 10) {
+        this.viewport = viewport;
+        this.body = body;
+        this.createRow = createRow;
+        this.drawRow = drawRow;
+        this.overscan = overscan;
+        this.keys = [];
+        this.rows = new Map();  // key -> element, for rendered rows only
+        this.rowHeight = 0;  // Measured on the first render with two rows
+        this.scrollFrame = null;
+        [this.top, this.topFill] = this.createSpacer();
+        [this.bottom, this.bottomFill] = this.createSpacer();
+        body.replaceChildren(this.top, this.bottom);
+        viewport.addEventListener('scroll', () => {
+            if (this.scrollFrame === null) {
+                this.scrollFrame = requestAnimationFrame(() => {
+                    this.scrollFrame = null;
+                    this.render(new Set());
+                });
+            }
+        }, { passive: true });
+    }
+
+    createSpacer() {
+        if (this.body.tagName !== 'TBODY') {
+            const spacer = document.createElement('div');
+            spacer.className = 'virtual-spacer';
+            return [spacer, spacer];
+        }
+        const row = document.createElement('tr');
+        const cell = row.insertCell();
+        row.className = 'virtual-spacer';
+        cell.colSpan = 100;
+        return [row, cell];
+    }
+
+    // Show `keys` in this order; rows of keys in `changed` (every row when
+    // it is null) are redrawn
+    update(keys, changed = null) {
+        this.keys = keys;
+        this.render(changed);
+    }
+
+    render(changed) {
+        const keys = this.keys;
+        const height = this.rowHeight || 40;
+        // Layout is read once, before anything is written
+        const scrollTop = this.viewport.scrollTop;
+        const listTop = this.top.getBoundingClientRect().top - this.viewport.getBoundingClientRect().top + scrollTop;
+        const first = Math.max(0, Math.floor((scrollTop - listTop) / height) - this.overscan);
+        const last = Math.min(keys.length,
+            Math.ceil((scrollTop - listTop + this.viewport.clientHeight) / height) + this.overscan);
+        const visible = keys.slice(first, last);
+
+        const keep = new Set(visible);
+        this.rows.forEach((row, key) => {
+            if (!keep.has(key)) {
+                row.remove();
+                this.rows.delete(key);
+            }
+        });
+        let cursor = this.top.nextSibling;
+        for (const key of visible) {
+            let row = this.rows.get(key);
+            if (!row) {
+                row = this.createRow();
+                this.rows.set(key, row);
+                this.drawRow(row, key);
+            } else if (changed === null || changed.has(key)) {
+                this.drawRow(row, key);
+            }
+            if (row === cursor) {
+                cursor = cursor.nextSibling;
+            } else {
+                this.body.insertBefore(row, cursor);
+            }
+        }
+        this.topFill.style.height = `${first * height}px`;
+        this.bottomFill.style.height = `${(keys.length - last) * height}px`;
+
+        if (!this.rowHeight && visible.length > 1) {
+            // Row pitch including borders and margins, then redo the window with it
+            const pitch = this.rows.get(visible[1]).offsetTop - this.rows.get(visible[0]).offsetTop;
+            if (pitch > 0) {
+                this.rowHeight = pitch;
+                this.render(new Set());
+            }
+        }
+    }
+}
+
+// Assigning textContent replaces the text node even if the text is the same
+function setText(element, value) {
+    const text = String(value);
+    if (element.textContent !== text) {
+        element.textContent = text;
+    }
+}
+
+// Client-side copy of the scheduler state, kept current by applying the
+// server's state_delta patches on top of the last state_update snapshot.
+// Orders are only re-sorted when a patch could have changed them, and the
+// pids changed since the last view are tracked so only their rows redraw.
+class SimulationState {
+    constructor() {
+        this.seq = null;
+        this.currentTime = 0;
+        this.processes = new Map();
+        this.readyKeys = new Map();
+        this.waiting = new Set();
+        this.completed = [];
+        this.completedSet = new Set();
+        this.metrics = {};
+        this.changed = null;  // pids changed since the last view, null for all
+        this.metricsChanged = true;
+        this.order = [];
+        this.readyQueue = [];
+        this.waitingQueue = [];
+        this.orderStale = this.readyStale = this.waitingStale = true;
+    }
+
+    applySnapshot(data) {
+        this.seq = data.delta_seq;
+        this.currentTime = data.current_time;
+        this.processes = new Map(data.processes.map(process => [process.pid, process]));
+        this.readyKeys = new Map(data.ready_queue.map((pid, i) => [pid, data.ready_keys[i]]));
+        this.waiting = new Set(data.processes.filter(p => p.state === 'Waiting').map(p => p.pid));
+        this.completed = data.completed_processes.slice();
+        this.completedSet = new Set(this.completed);
+        this.metrics = data.performance_metrics || {};
+        this.changed = null;
+        this.metricsChanged = true;
+        this.orderStale = this.readyStale = this.waitingStale = true;
+    }
+
+    // Returns false when a delta was missed and a fresh snapshot is needed
+    applyDelta(delta) {
+        if (this.seq === null || delta.seq !== this.seq + 1) {
+            return false;
+        }
+        this.seq = delta.seq;
+        this.currentTime = delta.current_time;
+        delta.processes.forEach(process => {
+            const previous = this.processes.get(process.pid);
+            if (!previous || previous.arrival_time !== process.arrival_time) {
+                this.orderStale = true;
+            }
+            if ((process.state === 'Waiting') !== this.waiting.has(process.pid)) {
+                if (process.state === 'Waiting') this.waiting.add(process.pid);
+                else this.waiting.delete(process.pid);
+                this.waitingStale = true;
+            }
+            this.processes.set(process.pid, process);
+            if (this.changed) this.changed.add(process.pid);
+        });
+        if (delta.ready_removed.length || delta.ready_added.length) {
+            this.readyStale = true;
+        }
+        delta.ready_removed.forEach(pid => this.readyKeys.delete(pid));
+        delta.ready_added.forEach(([pid, key]) => this.readyKeys.set(pid, key));
+        delta.completed_added.forEach(pid => {
+            // Deltas may repeat completions already contained in a snapshot
+            if (!this.completedSet.has(pid)) {
+                this.completedSet.add(pid);
+                this.completed.push(pid);
+            }
+        });
+        if (Object.keys(delta.metrics).length) {
+            Object.assign(this.metrics, delta.metrics);
+            this.metricsChanged = true;
+        }
+        return true;
+    }
+
+    // Everything the render functions need since the previous view:
+    // `processes` maps pid to process, `order` lists all pids by arrival,
+    // the queues list pids, and `changed` holds the pids whose rows need
+    // redrawing (null for all of them)
+    takeView() {
+        const byArrival = (a, b) => {
+            const p = this.processes.get(a);
+            const q = this.processes.get(b);
+            return p.arrival_time - q.arrival_time || a - b;
+        };
+        if (this.orderStale) {
+            this.order = Array.from(this.processes.keys()).sort(byArrival);
+            this.orderStale = false;
+        }
+        if (this.readyStale) {
+            this.readyQueue = Array.from(this.readyKeys.entries())
+                .sort(([, a], [, b]) => compareKeys(a, b))
+                .map(([pid]) => pid);
+            this.readyStale = false;
+        }
+        if (this.waitingStale) {
+            this.waitingQueue = Array.from(this.waiting).sort(byArrival);
+            this.waitingStale = false;
+        }
+        const view = {
+            processes: this.processes,
+            order: this.order,
+            ready_queue: this.readyQueue,
+            waiting_queue: this.waitingQueue,
+            completed_processes: this.completed,
+            performance_metrics: this.metricsChanged ? this.metrics : null,
+            changed: this.changed
+        };
+        this.changed = new Set();
+        this.metricsChanged = false;
+        return view;
+    }
+}
+
+function compareKeys(a, b) {
+    for (let i = 0; i < Math.min(a.length, b.length); i++) {
+        if (a[i] !== b[i]) return a[i] - b[i];
+    }
+    return a.length - b.length;
+}
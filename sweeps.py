@@ -0,0 +1,237 @@
+"""Monte Carlo sweeps: many seeded random workloads, aggregated per algorithm.
+
+Each workload draws its burst times from a configurable distribution and
+its arrivals from a Poisson process whose rate gives a target load (the
+share of CPU time the workload asks for). Every algorithm is run on every
+workload, and the per-workload averages are summarised as a mean with a
+confidence interval.
+
+Workers generate their workloads from the seed themselves and send back
+running aggregates rather than per-workload results, so a sweep uses the
+same memory for a hundred workloads as for a million, and ``run_sweep``
+can report progress (and be cancelled) after every chunk.
+"""
+import math
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from statistics import NormalDist
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from comparison import run_algorithm
+from process_scheduler import ProcessScheduler, ProcessTable
+
+BURST_DISTRIBUTIONS = {
+    # name -> default parameters
+    'uniform': {'low': 1, 'high': 10},
+    'exponential': {'mean': 5},
+    'pareto': {'alpha': 1.5, 'scale': 1},
+    'bimodal': {'short': 2, 'long': 20, 'long_fraction': 0.2, 'spread': 0.1}
+}
+SWEEP_METRICS = ('avg_waiting_time', 'avg_turnaround_time', 'avg_response_time')
+
+def burst_distribution(spec: Dict = None) -> Dict:
+    """``spec`` (``{'kind': ..., parameters}``) completed with default parameters.
+
+    An optional ``max`` caps bursts, which keeps heavy-tailed Pareto
+    workloads from producing a single job that dominates the run.
+    """
+    spec = dict(spec or {'kind': 'uniform'})
+    kind = spec.pop('kind', 'uniform')
+    if kind not in BURST_DISTRIBUTIONS:
+        raise ValueError(f"Unknown burst distribution: {kind}")
+    unknown = set(spec) - set(BURST_DISTRIBUTIONS[kind]) - {'max'}
+    if unknown:
+        raise ValueError(f"Unknown {kind} parameters: {', '.join(sorted(unknown))}")
+    params = dict(BURST_DISTRIBUTIONS[kind], **spec)
+    if any(not isinstance(value, (int, float)) or value < 0 for value in params.values()):
+        raise ValueError("Distribution parameters must be non-negative numbers")
+    if kind == 'uniform' and not 1 <= params['low'] <= params['high']:
+        raise ValueError("uniform bursts need 1 <= low <= high")
+    if kind == 'pareto' and params['alpha'] <= 0:
+        raise ValueError("pareto bursts need alpha > 0")
+    if kind == 'bimodal' and not 0 <= params['long_fraction'] <= 1:
+        raise ValueError("long_fraction must be between 0 and 1")
+    return dict(params, kind=kind)
+
+def draw_bursts(rng: random.Random, count: int, distribution: Dict) -> List[int]:
+    """``count`` burst times of at least one tick from a ``burst_distribution``."""
+    kind = distribution['kind']
+    if kind == 'uniform':
+        low, high = int(distribution['low']), int(distribution['high'])
+        values = [rng.randint(low, high) for _ in range(count)]
+    elif kind == 'exponential':
+        values = [rng.expovariate(1 / distribution['mean']) for _ in range(count)]
+    elif kind == 'pareto':
+        alpha, scale = distribution['alpha'], distribution['scale']
+        values = [scale * rng.paretovariate(alpha) for _ in range(count)]
+    else:
+        values = []
+        for _ in range(count):
+            mode = distribution['long'] if rng.random() < distribution['long_fraction'] else distribution['short']
+            values.append(rng.gauss(mode, mode * distribution['spread']))
+    cap = distribution.get('max')
+    return [max(1, min(round(value), cap) if cap else round(value)) for value in values]
+
+def poisson_arrivals(rng: random.Random, count: int, rate: float) -> List[int]:
+    """Tick of each of ``count`` arrivals of a Poisson process with ``rate`` per tick."""
+    arrivals = []
+    time = 0.0
+    for _ in range(count):
+        time += rng.expovariate(rate)
+        arrivals.append(int(time))
+    return arrivals
+
+def generate_workload(seed, processes: int, bursts: Dict = None, load: float = 0.8,
+                      cores: int = 1, priority_levels: int = 5) -> ProcessTable:
+    """One random workload, the same for the same arguments.
+
+    Arrivals are Poisson with rate ``load * cores / mean burst``, so on
+    average the workload keeps ``load`` of the CPUs busy; above 1 the ready
+    queue grows without bound.
+    """
+    rng = random.Random(seed)
+    burst_times = draw_bursts(rng, processes, burst_distribution(bursts))
+    mean_burst = sum(burst_times) / processes
+    arrival_times = poisson_arrivals(rng, processes, load * cores / mean_burst)
+    priorities = [rng.randrange(priority_levels) for _ in range(processes)]
+    return ProcessTable.from_columns(burst_times, arrival_times, priorities)
+
+class RunningStats:
+    """Count, mean and variance of a stream of values (Welford's method).
+
+    Two instances merge exactly, so workers can summarise their share of a
+    sweep and only the summaries travel.
+    """
+
+    __slots__ = ('count', 'mean', '_m2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: 'RunningStats'):
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def summary(self, z: float) -> Dict:
+        """Mean with a normal-approximation interval of ``z`` standard errors."""
+        half_width = z * self.stddev / math.sqrt(self.count) if self.count else 0.0
+        return {
+            'mean': self.mean,
+            'low': self.mean - half_width,
+            'high': self.mean + half_width,
+            'stddev': self.stddev,
+            'count': self.count
+        }
+
+def _run_chunk(seed, indices: range, processes: int, bursts: Dict, load: float,
+               jobs: Sequence, preemptive: bool, cores: int) -> Dict:
+    """Run every job on the workloads ``indices`` and aggregate their metrics."""
+    stats = {}
+    for index in indices:
+        table = generate_workload(f'{seed}:{index}', processes, bursts, load)
+        for label, algorithm, quantum in jobs:
+            metrics = run_algorithm(table, algorithm, quantum, preemptive, cores)
+            for name in SWEEP_METRICS:
+                stats.setdefault((label, name), RunningStats()).add(metrics[name])
+    return stats
+
+def _job_label(algorithm: str, quantum: int, quanta: Sequence[int]) -> str:
+    return f'{algorithm} (q={quantum})' if algorithm == 'rr' and len(quanta) > 1 else algorithm
+
+def run_sweep(workloads: int, processes: int = 50, bursts: Dict = None, load: float = 0.8,
+              algorithms: Iterable[str] = ProcessScheduler.ALGORITHMS, quanta: Sequence[int] = (2,),
+              preemptive: bool = True, cores: int = 2, seed=0, confidence: float = 0.95,
+              chunk_size: int = None, max_workers: int = None, cancel=None) -> Iterator[Dict]:
+    """Start a sweep; the returned iterator yields its aggregate after each chunk of workloads.
+
+    Every yielded dict has ``completed`` and ``total`` workload counts,
+    ``done``, ``cancelled``, and ``results``: for each algorithm (Round
+    Robin once per quantum) and metric, the mean over workloads with its
+    ``confidence`` interval. ``load`` is relative to a single CPU so every
+    algorithm sees the same workloads; SMP runs them on ``cores`` CPUs.
+
+    Arguments are checked before anything runs, raising ValueError. Setting
+    ``cancel`` (a ``threading.Event``) or closing the iterator stops the
+    sweep: chunks already running finish, queued ones are dropped, and a
+    final result with ``cancelled`` set is yielded.
+    """
+    if workloads < 1 or processes < 1 or cores < 1:
+        raise ValueError("workloads, processes and cores must be positive")
+    if load <= 0:
+        raise ValueError("load must be positive")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    bursts = burst_distribution(bursts)
+    jobs = []
+    for algorithm in algorithms:
+        if algorithm not in ProcessScheduler.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        for quantum in (quanta if algorithm == 'rr' else quanta[:1] or (2,)):
+            jobs.append((_job_label(algorithm, quantum, quanta), algorithm, quantum))
+    if not jobs:
+        raise ValueError("No algorithms to sweep")
+
+    workers = min(max_workers or os.cpu_count() or 1, workloads)
+    # Enough chunks to keep every worker busy and report progress often,
+    # few enough that scheduling them costs nothing
+    chunk_size = chunk_size or max(1, min(100, workloads // (workers * 8)))
+    chunks = [range(start, min(start + chunk_size, workloads)) for start in range(0, workloads, chunk_size)]
+    run_chunk = partial(_run_chunk, seed, processes=processes, bursts=bursts, load=load,
+                        jobs=jobs, preemptive=preemptive, cores=cores)
+    return _aggregate(run_chunk, chunks, workers, NormalDist().inv_cdf((1 + confidence) / 2),
+                      {'total': workloads, 'confidence': confidence}, cancel)
+
+def _aggregate(run_chunk, chunks: List[range], workers: int, z: float, info: Dict, cancel) -> Iterator[Dict]:
+    stats = {}
+    completed = 0
+
+    def result(done: bool, cancelled: bool = False) -> Dict:
+        results = {}
+        for (label, name), values in sorted(stats.items()):
+            results.setdefault(label, {})[name] = values.summary(z)
+        return dict(info, completed=completed, done=done, cancelled=cancelled, results=results)
+
+    remaining = iter(chunks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}  # future -> its chunk
+        try:
+            while True:
+                # Only a few chunks are queued at a time, so cancelling is quick
+                while len(pending) < 2 * workers:
+                    chunk = next(remaining, None)
+                    if chunk is None:
+                        break
+                    pending[executor.submit(run_chunk, chunk)] = chunk
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for key, values in future.result().items():
+                        stats.setdefault(key, RunningStats()).merge(values)
+                    completed += len(pending.pop(future))
+                if cancel is not None and cancel.is_set():
+                    yield result(True, cancelled=True)
+                    return
+                yield result(completed == info['total'])
+        finally:
+            for future in pending:
+                future.cancel()
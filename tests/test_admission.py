@@ -0,0 +1,120 @@
+import math
+
+import pytest
+
+from admission import RateLimiter
+from process_scheduler import AdmissionRejected, ProcessScheduler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def submit(scheduler: ProcessScheduler, burst_time: int, arrival_time: int):
+    scheduler.admit(1)
+    scheduler.add_process(burst_time, arrival_time)
+
+def test_reject_counts_processes_that_have_not_arrived():
+    scheduler = ProcessScheduler()
+    scheduler.set_admission(2, 'reject')
+    scheduler.set_algorithm('fcfs')
+    scheduler.start()
+    accepted = 0
+    for _ in range(10):
+        try:
+            submit(scheduler, 5, scheduler.current_time + 1)
+            accepted += 1
+        except AdmissionRejected:
+            pass
+    assert accepted == 2
+    assert scheduler.rejected == 8
+    peak = 0
+    while not scheduler.is_complete():
+        scheduler.step()
+        peak = max(peak, len(scheduler.ready_queue))
+    assert peak <= 2
+
+def test_reject_accepts_again_once_processes_have_run():
+    scheduler = ProcessScheduler()
+    scheduler.set_admission(1, 'reject')
+    scheduler.start()
+    submit(scheduler, 2, 0)
+    with pytest.raises(AdmissionRejected):
+        submit(scheduler, 2, 5)
+    scheduler.run_to_completion()
+    submit(scheduler, 2, scheduler.current_time + 3)
+    assert scheduler.rejected == 1
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_defer_holds_arrivals_until_there_is_room(algorithm):
+    scheduler = ProcessScheduler()
+    for arrival_time in range(12):
+        scheduler.add_process(4, arrival_time % 3)
+    scheduler.set_admission(3, 'defer')
+    scheduler.set_algorithm(algorithm)
+    scheduler.start()
+    while not scheduler.is_complete():
+        scheduler.step()
+        # Preempted processes are requeued regardless, one per CPU at most
+        assert len(scheduler.ready_queue) <= 3 + (scheduler.cores if algorithm == 'smp' else 1)
+    assert len(scheduler.completed_processes) == 12
+    assert scheduler.rejected == 0
+
+def test_rate_limiter_refills_at_its_rate():
+    clock = FakeClock()
+    limiter = RateLimiter(2, burst=4, clock=clock)
+    assert limiter.acquire('a', 4) == 0
+    assert limiter.acquire('a') == pytest.approx(0.5)
+    assert limiter.acquire('b', 3) == 0  # Every client has its own bucket
+    clock.now = 1.0
+    assert limiter.acquire('a', 2) == 0
+    assert limiter.acquire('a', 3) == pytest.approx(1.5)
+    clock.now = 100.0
+    assert limiter.acquire('a', 4) == 0  # Refills up to the burst, no further
+    assert limiter.acquire('a') > 0
+    assert limiter.acquire('a', 5) == math.inf
+    assert limiter.limited == 4
+
+def test_rate_limiter_drops_idle_clients():
+    clock = FakeClock()
+    limiter = RateLimiter(1, burst=2, max_clients=2, clock=clock)
+    limiter.acquire('a')
+    clock.now = 1.0
+    limiter.acquire('b', 2)
+    clock.now = 2.5
+    limiter.acquire('c')
+    # a had refilled completely and was dropped, b had not
+    assert limiter.stats()['clients'] == 2
+    assert limiter.acquire('b', 2) == pytest.approx(0.5)
+    assert limiter.acquire('a', 2) == 0
+
+@pytest.fixture
+def client(monkeypatch):
+    main = pytest.importorskip('main')
+    monkeypatch.setattr(main, 'rate_limiter', None)
+    return main, main.app.test_client()
+
+def test_bulk_submissions_are_rate_limited(client):
+    from admission import RateLimiter
+    main, client = client
+    client.environ_base['REMOTE_ADDR'] = '10.0.0.1'
+    main.rate_limiter = RateLimiter(1, burst=3)
+    headers = {'X-Simulation-Id': 'bulk-rate-limited'}
+    assert client.post('/api/processes/generate', json={'count': 4}, headers=headers).status_code == 429
+    response = client.post('/api/processes/import', data=b'1,0\n2,0\n3,0\n4,0\n', headers=headers,
+                           content_type='text/csv')
+    assert response.status_code == 429
+    assert client.post('/api/processes/generate', json={'count': 3}, headers=headers).status_code == 200
+
+def test_bulk_submissions_are_admitted(client):
+    main, client = client
+    headers = {'X-Simulation-Id': 'bulk-admitted'}
+    assert client.post('/api/admission', json={'max_ready': 2, 'policy': 'reject'}, headers=headers).status_code == 200
+    assert client.post('/api/processes/generate', json={'count': 3}, headers=headers).status_code == 429
+    assert client.post('/api/processes/generate', json={'count': 2}, headers=headers).status_code == 200
+    response = client.post('/api/processes/import', data=b'1,9\n', headers=headers, content_type='text/csv')
+    assert response.status_code == 429
+    assert response.get_json()['admission']['rejected'] == 4
+    assert client.post('/api/processes/generate', json={'count': -1}, headers=headers).status_code == 400
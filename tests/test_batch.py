@@ -0,0 +1,98 @@
+import copy
+import random
+
+import pytest
+
+from process_scheduler import ProcessScheduler
+from sweeps import generate_workload
+
+def observed(scheduler: ProcessScheduler):
+    state = scheduler.get_current_state()
+    state.pop('delta_seq', None)
+    return (state, list(scheduler.processes.rows), list(scheduler.completed_processes),
+            scheduler.total_waiting_time, scheduler.total_turnaround_time)
+
+def random_ops(rng: random.Random, pids):
+    ops, gone = [], set()
+    for _ in range(rng.randint(1, 30)):
+        fields = dict(burst_time=rng.randint(1, 9), arrival_time=rng.randint(0, 30), priority=rng.randint(0, 4))
+        candidates = [pid for pid in pids if pid not in gone]
+        choice = rng.random()
+        if choice < 0.3 or not candidates:
+            ops.append(dict(op='add', **fields))
+        elif choice < 0.75:
+            ops.append(dict(op='update', pid=rng.choice(candidates), **fields))
+        else:
+            pid = rng.choice(candidates)
+            gone.add(pid)
+            ops.append(dict(op='delete', pid=pid))
+    return ops
+
+def apply_one_by_one(scheduler: ProcessScheduler, ops):
+    for op in ops:
+        if op['op'] == 'update':
+            scheduler.update_process(op['pid'], op['burst_time'], op['arrival_time'], op['priority'])
+        elif op['op'] == 'delete':
+            scheduler.delete_process(op['pid'])
+    adds = [op for op in ops if op['op'] == 'add']
+    if adds:
+        scheduler.add_processes([op['burst_time'] for op in adds], [op['arrival_time'] for op in adds],
+                                [op['priority'] for op in adds])
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_batch_matches_sequential_edits(algorithm):
+    for seed in range(40):
+        rng = random.Random(seed)
+        batched = ProcessScheduler(generate_workload(seed, 40))
+        batched.set_algorithm(algorithm)
+        started = seed % 3 != 0
+        if started:
+            batched.start()
+            batched.advance(rng.randint(0, 100))
+        sequential = copy.deepcopy(batched)
+        ops = random_ops(rng, [process.pid for process in batched.processes])
+        summary = batched.apply_batch(ops)
+        apply_one_by_one(sequential, ops)
+        assert observed(batched) == observed(sequential), seed
+        assert summary['added'] == sum(op['op'] == 'add' for op in ops)
+        assert summary['deleted'] == sum(op['op'] == 'delete' for op in ops)
+        for scheduler in (batched, sequential):
+            if not started:
+                scheduler.start()
+            scheduler.run_to_completion()
+        assert observed(batched) == observed(sequential), seed
+
+@pytest.mark.parametrize('ops, message', [
+    ([{'op': 'add', 'burst_time': 0, 'arrival_time': 1}], "Operation 0: burst time must be positive"),
+    ([{'op': 'update', 'pid': 99, 'burst_time': 1, 'arrival_time': 1}], "Operation 0: process 99 not found"),
+    ([{'op': 'delete', 'pid': 1}, {'op': 'delete', 'pid': 1}], "Operation 1: process 1 not found"),
+    ([{'op': 'rename'}], "Operation 0: unknown op 'rename'"),
+    ([{'op': 'add', 'burst_time': '3', 'arrival_time': 1}], "Operation 0: burst_time, arrival_time and priority"),
+    ([{'op': 'add', 'burst_time': 3, 'arrival_time': 1}, {'op': 'delete', 'pid': 100}],
+     "Operation 1: process 100 not found"),
+])
+def test_invalid_batch_changes_nothing(ops, message):
+    scheduler = ProcessScheduler(generate_workload(1, 10))
+    before = observed(scheduler)
+    with pytest.raises(ValueError, match=f'^{message}'):
+        scheduler.apply_batch(ops)
+    assert observed(scheduler) == before
+
+def test_batch_endpoint_broadcasts_once(monkeypatch):
+    main = pytest.importorskip('main')
+    monkeypatch.setattr(main, 'rate_limiter', None)
+    events = []
+    monkeypatch.setattr(main.socketio, 'emit', lambda event, *args, **kwargs: events.append(event))
+    client = main.app.test_client()
+    headers = {'X-Simulation-Id': 'batch-broadcast'}
+    ops = [{'op': 'add', 'burst_time': 3, 'arrival_time': i} for i in range(50)]
+    response = client.post('/api/processes/batch', json={'ops': ops}, headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['added'] == 50
+    assert len(events) == 1
+
+    events.clear()
+    response = client.post('/api/processes/batch', json=[{'op': 'delete', 'pid': 10 ** 6}], headers=headers)
+    assert response.status_code == 400
+    assert 'not found' in response.get_json()['message']
+    assert not events
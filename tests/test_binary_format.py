@@ -0,0 +1,63 @@
+import io
+
+import pytest
+
+import binary_format
+from comparison import compare_algorithms, run_algorithm
+from process_scheduler import ProcessScheduler, ProcessTable
+
+def finished_run() -> ProcessScheduler:
+    scheduler = ProcessScheduler(ProcessTable.from_columns([5, 3, 8, 2], [0, 1, 2, 9], [1, 0, 2, 1]))
+    scheduler.delete_process(2)
+    scheduler.set_algorithm('rr')
+    scheduler.start()
+    scheduler.run_to_completion()
+    return scheduler
+
+def columns(table) -> dict:
+    return {name: list(getattr(table, name)) for name in binary_format.COLUMNS}
+
+def test_results_round_trip(tmp_path):
+    scheduler = finished_run()
+    path = str(tmp_path / ('run' + binary_format.EXTENSION))
+    binary_format.save_table(scheduler.table, path, scheduler.current_time)
+    loaded = binary_format.load_table(path)
+    assert columns(loaded) == columns(scheduler.table)
+    assert loaded.first_pid == scheduler.table.first_pid
+    stream = io.BytesIO()
+    binary_format.write_table(scheduler.table, stream)
+    stream.seek(0)
+    assert columns(binary_format.read_table(stream)) == columns(scheduler.table)
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_mapped_columns_read_the_file(tmp_path, monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(binary_format, 'np', None)
+    scheduler = finished_run()
+    path = str(tmp_path / ('run' + binary_format.EXTENSION))
+    binary_format.save_table(scheduler.table, path, scheduler.current_time)
+    with binary_format.open_table(path) as mapped:
+        assert len(mapped) == len(scheduler.table)
+        assert mapped.current_time == scheduler.current_time
+        assert [int(value) for value in mapped.burst_time] == list(scheduler.table.burst_time)
+        assert [int(value) for value in mapped.state] == list(scheduler.table.state)
+        assert columns(mapped.to_table()) == columns(scheduler.table)
+
+def test_damaged_files_are_refused(tmp_path):
+    path = tmp_path / ('run' + binary_format.EXTENSION)
+    binary_format.save_table(finished_run().table, str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    with pytest.raises(ValueError, match='truncated'):
+        binary_format.load_table(str(path))
+    path.write_bytes(b'NOTATABL' + data[8:])
+    with pytest.raises(ValueError, match='Not a process table'):
+        binary_format.load_table(str(path))
+
+def test_workers_map_a_workload_file(tmp_path):
+    table = ProcessTable.from_columns([5, 3, 8, 2], [0, 1, 2, 9], [1, 0, 2, 1])
+    path = str(tmp_path / ('workload' + binary_format.EXTENSION))
+    binary_format.save_table(table, path)
+    results = compare_algorithms(path, ['fcfs', 'priority'], max_workers=2)
+    assert [result['metrics'] for result in results] == \
+        [run_algorithm(table, 'fcfs'), run_algorithm(table, 'priority')]
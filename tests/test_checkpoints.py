@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from process_scheduler import ProcessScheduler, ProcessTable
+
+def random_workload(rng: random.Random, count: int):
+    return ([rng.randint(1, 10) for _ in range(count)],
+            [rng.randint(0, 4 * count) for _ in range(count)],
+            [rng.randrange(5) for _ in range(count)])
+
+def fingerprint(scheduler: ProcessScheduler):
+    """Everything a client could observe about the simulation right now."""
+    state = scheduler.get_current_state()
+    state.pop('delta_seq')
+    columns = {name: list(getattr(scheduler.table, name)) for name in ProcessTable.COLUMNS + ('state',)}
+    return (state, columns, scheduler.busy_time, scheduler.context_switches, scheduler.preemptions,
+            scheduler.quantum_counter)
+
+def advanced_to(workload, algorithm: str, time: int) -> ProcessScheduler:
+    scheduler = ProcessScheduler(ProcessTable.from_columns(*workload))
+    scheduler.set_algorithm(algorithm)
+    scheduler.start()
+    scheduler.advance(time)
+    return scheduler
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_seek_reproduces_a_fresh_run(algorithm):
+    for seed in range(8):
+        rng = random.Random(seed)
+        workload = random_workload(rng, rng.randint(1, 120))
+        scheduler = ProcessScheduler(ProcessTable.from_columns(*workload))
+        scheduler.checkpoints.base_interval = rng.choice([1, 7, 50])
+        scheduler.checkpoints.max_bytes = rng.choice([10 ** 9, 20000])
+        scheduler.set_algorithm(algorithm)
+        scheduler.start()
+        scheduler.run_to_completion()
+        end = scheduler.current_time
+        timeline = scheduler.get_timeline(0, end + 1)
+        for _ in range(6):
+            time = rng.randint(0, end + 5)
+            assert scheduler.seek(time) == time
+            assert fingerprint(scheduler) == fingerprint(advanced_to(workload, algorithm, time)), (seed, time)
+            scheduler.step()
+            assert fingerprint(scheduler) == fingerprint(advanced_to(workload, algorithm, scheduler.current_time))
+        scheduler.seek(end)
+        assert scheduler.get_timeline(0, end + 1) == timeline
+
+def test_a_checkpoint_can_be_restored_repeatedly():
+    workload = random_workload(random.Random(1), 50)
+    scheduler = advanced_to(workload, 'rr', 150)
+    expected = fingerprint(advanced_to(workload, 'rr', 60))
+    for _ in range(3):
+        scheduler.seek(60)
+        assert fingerprint(scheduler) == expected
+        scheduler.advance(40)
+
+def test_edits_discard_the_future():
+    workload = random_workload(random.Random(5), 100)
+    scheduler = advanced_to(workload, 'rr', 200)
+    scheduler.seek(100)
+    scheduler.add_process(3, 50, 1)
+    assert len(scheduler.checkpoints) == 0
+    assert all(end <= 101 for _, _, end in scheduler.get_timeline(0, 1000)['segments'])
+    scheduler.advance(50)
+    assert scheduler.seek(120) == 120
+    # Before the edit there are no checkpoints left, so the run is replayed
+    assert scheduler.seek(30) == 30
+
+def test_thinning_keeps_checkpoints_within_budget():
+    rng = random.Random(9)
+    scheduler = ProcessScheduler(ProcessTable.from_columns(*random_workload(rng, 3000)))
+    scheduler.checkpoints.base_interval = 1
+    scheduler.checkpoints.max_bytes = 1024 * 1024
+    scheduler.set_algorithm('fcfs')
+    scheduler.start()
+    scheduler.run_to_completion()
+    assert len(scheduler.checkpoints) > 1
+    assert scheduler.checkpoints.nbytes <= scheduler.checkpoints.max_bytes
+    assert scheduler.checkpoints.interval > 1
@@ -0,0 +1,66 @@
+import csv
+import json
+
+import pytest
+
+import binary_format
+import cli
+from comparison import run_algorithm
+from process_scheduler import ProcessTable
+
+BURSTS, ARRIVALS, PRIORITIES = [5, 3, 8, 2, 4], [0, 1, 2, 3, 9], [2, 0, 1, 3, 0]
+
+@pytest.fixture
+def trace(tmp_path):
+    path = tmp_path / 'small.csv'
+    rows = '\n'.join(f'{b},{a},{p}' for b, a, p in zip(BURSTS, ARRIVALS, PRIORITIES))
+    path.write_text(f'burst_time,arrival_time,priority\n{rows}\n')
+    return str(path)
+
+def expected_metrics(algorithm: str, quantum: int = 2, cores: int = 1):
+    return run_algorithm(ProcessTable.from_columns(BURSTS, ARRIVALS, PRIORITIES), algorithm, quantum, True, cores)
+
+def test_json_output_has_one_record_per_run(trace, tmp_path):
+    output = tmp_path / 'out.json'
+    assert cli.main(['run', trace, '--algorithms', 'fcfs', 'rr', '--quanta', '2', '4',
+                     '--jobs', '1', '--output', str(output)]) == 0
+    records = json.loads(output.read_text())
+    assert [(r['algorithm'], r['quantum']) for r in records] == [('fcfs', None), ('rr', 2), ('rr', 4)]
+    for record in records:
+        assert record['trace'] == trace and record['processes'] == len(BURSTS)
+        expected = expected_metrics(record['algorithm'], record['quantum'] or 2)
+        assert record['metrics']['avg_waiting_time'] == pytest.approx(expected['avg_waiting_time'])
+    assert records[0]['metrics']['makespan'] == sum(BURSTS)
+
+def test_csv_output_and_parallel_traces(trace, tmp_path):
+    second = tmp_path / 'second.jsonl'
+    second.write_text('\n'.join(json.dumps({'burst_time': b, 'arrival_time': a}) for b, a in zip(BURSTS, ARRIVALS)))
+    output = tmp_path / 'out.csv'
+    assert cli.main(['run', trace, str(second), '--algorithms', 'sjf', 'smp', '--cores', '2',
+                     '--format', 'csv', '--jobs', '2', '-o', str(output)]) == 0
+    with open(output, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [(row['trace'], row['algorithm'], row['cores']) for row in rows] == [
+        (trace, 'sjf', ''), (trace, 'smp', '2'), (str(second), 'sjf', ''), (str(second), 'smp', '2')]
+    assert float(rows[0]['avg_turnaround_time']) == pytest.approx(expected_metrics('sjf')['avg_turnaround_time'])
+
+def test_binary_output_saves_finished_tables(trace, tmp_path):
+    directory = tmp_path / 'tables'
+    assert cli.main(['run', trace, '--algorithms', 'priority', 'rr', '--format', 'binary',
+                     '--jobs', '1', '-o', str(directory)]) == 0
+    assert sorted(p.name for p in directory.iterdir()) == ['small.priority.ptab', 'small.rr-q2.ptab']
+    table = binary_format.load_table(str(directory / 'small.rr-q2.ptab'))
+    assert list(table.burst_time) == BURSTS
+    assert all(remaining == 0 for remaining in table.remaining_time)
+
+def test_broken_trace_is_reported_and_the_rest_run(trace, tmp_path, capsys):
+    broken = tmp_path / 'broken.csv'
+    broken.write_text('burst_time,arrival_time\n0,-1\n')
+    output = tmp_path / 'out.json'
+    assert cli.main(['run', trace, str(broken), '--algorithms', 'fcfs', '--jobs', '1', '-o', str(output)]) == 1
+    assert len(json.loads(output.read_text())) == 1
+    assert 'broken.csv' in capsys.readouterr().err
+
+@pytest.mark.parametrize('arguments', [['--algorithms', 'lottery'], ['--format', 'binary']])
+def test_bad_options_exit_with_usage_error(trace, arguments):
+    assert cli.main(['run', trace] + arguments) == 2
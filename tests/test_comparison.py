@@ -0,0 +1,35 @@
+import time
+
+import pytest
+
+from comparison import compare_algorithms, run_algorithm, as_table
+
+WORKLOAD = [{'burst_time': burst, 'arrival_time': arrival, 'priority': priority}
+            for burst, arrival, priority in [(5, 0, 2), (3, 1, 0), (8, 2, 1), (2, 4, 3), (4, 6, 0)]]
+
+def test_workers_match_a_run_in_process():
+    results = compare_algorithms(WORKLOAD, ['fcfs', 'rr', 'smp'], quanta=[1, 3], cores=[2], max_workers=2)
+    assert [(result['algorithm'], result['quantum'], result['cores']) for result in results] == \
+        [('fcfs', None, None), ('rr', 1, None), ('rr', 3, None), ('smp', 1, 2)]
+    for result in results:
+        expected = run_algorithm(as_table(WORKLOAD), result['algorithm'], result['quantum'] or 2, True,
+                                 result['cores'] or 1)
+        assert result['metrics'] == expected
+
+def test_api_compares_in_the_background():
+    main = pytest.importorskip('main')
+    client = main.app.test_client()
+    headers = {'X-Simulation-Id': 'compare-background'}
+    response = client.post('/api/compare', json={'processes': WORKLOAD, 'algorithms': ['fcfs', 'sjf']},
+                           headers=headers)
+    assert response.status_code == 202
+    comparison_id = response.get_json()['comparison_id']
+    deadline = time.monotonic() + 30
+    while True:
+        comparison = client.get(f'/api/compare/{comparison_id}', headers=headers).get_json()
+        if comparison['done'] or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert [result['algorithm'] for result in comparison['results']] == ['fcfs', 'sjf']
+    assert client.post('/api/compare', json={'processes': WORKLOAD, 'algorithms': ['nope']},
+                       headers=headers).status_code == 400
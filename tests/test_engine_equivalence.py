@@ -0,0 +1,117 @@
+"""The closed-form evaluator, the event-driven run and the tick engine must agree."""
+import random
+
+import pytest
+
+from process_scheduler import ProcessScheduler, ProcessTable
+
+SEEDS = range(40)
+
+def random_table(rng: random.Random) -> ProcessTable:
+    count = rng.randint(1, 30)
+    return ProcessTable.from_columns([rng.randint(1, 10) for _ in range(count)],
+                                     [rng.randint(0, 25) for _ in range(count)],
+                                     [rng.randrange(5) for _ in range(count)])
+
+def copy_table(table: ProcessTable) -> ProcessTable:
+    return ProcessTable.from_columns(list(table.burst_time), list(table.arrival_time), list(table.priority))
+
+def make_scheduler(table: ProcessTable, algorithm: str, preemptive: bool) -> ProcessScheduler:
+    scheduler = ProcessScheduler(copy_table(table))
+    scheduler.preemptive = preemptive
+    scheduler.set_algorithm(algorithm)
+    return scheduler
+
+def outcome(scheduler: ProcessScheduler):
+    """Per-process results and the final time of a finished run."""
+    processes = [(p['pid'], p['state'], p['waiting_time'], p['turnaround_time'], p['completion_time'])
+                 for p in scheduler.get_processes()]
+    return scheduler.current_time, processes, list(scheduler.completed_processes)
+
+def stepped(table: ProcessTable, algorithm: str, preemptive: bool) -> ProcessScheduler:
+    scheduler = make_scheduler(table, algorithm, preemptive)
+    scheduler.start()
+    while not scheduler.is_complete():
+        scheduler.step()
+    return scheduler
+
+def run(table: ProcessTable, algorithm: str, preemptive: bool) -> ProcessScheduler:
+    scheduler = make_scheduler(table, algorithm, preemptive)
+    scheduler.start()
+    scheduler.run_to_completion()
+    return scheduler
+
+@pytest.mark.parametrize('preemptive', [True, False])
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_run_to_completion_matches_steps(algorithm, preemptive):
+    for seed in SEEDS:
+        table = random_table(random.Random(seed))
+        expected = stepped(table, algorithm, preemptive)
+        actual = run(table, algorithm, preemptive)
+        assert outcome(actual) == outcome(expected), seed
+        assert actual.get_performance_metrics() == expected.get_performance_metrics(), seed
+
+@pytest.mark.parametrize('preemptive', [True, False])
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_evaluate_matches_steps(algorithm, preemptive):
+    scheduler = make_scheduler(ProcessTable(), algorithm, preemptive)
+    if not scheduler.can_evaluate(algorithm):
+        pytest.skip(f"{algorithm} is simulated tick by tick only")
+    for seed in SEEDS:
+        table = random_table(random.Random(seed))
+        expected = stepped(table, algorithm, preemptive)
+        evaluated = make_scheduler(table, algorithm, preemptive)
+        evaluated.evaluate(algorithm)
+        assert outcome(evaluated) == outcome(expected), seed
+        assert evaluated.get_performance_metrics() == expected.get_performance_metrics(), seed
+
+def sparse_table(rng: random.Random) -> ProcessTable:
+    """Long bursts that often run alone, so whole quanta expire uncontested."""
+    count = rng.randint(1, 8)
+    return ProcessTable.from_columns([rng.randint(1, 120) for _ in range(count)],
+                                     [rng.randint(0, 400) for _ in range(count)],
+                                     [rng.randrange(5) for _ in range(count)])
+
+@pytest.mark.parametrize('algorithm', ['rr', 'mlfq', 'smp'])
+def test_uncontested_quanta_match_steps(algorithm):
+    for seed in SEEDS:
+        table = sparse_table(random.Random(seed))
+        expected = stepped(table, algorithm, True)
+        actual = run(table, algorithm, True)
+        assert outcome(actual) == outcome(expected), seed
+        assert actual.get_performance_metrics() == expected.get_performance_metrics(), seed
+        # Skipping over quanta leaves the running processes where stepping would
+        for ticks in (1, 37, 150):
+            expected = make_scheduler(table, algorithm, True)
+            expected.start()
+            for _ in range(ticks):
+                expected.step()
+            actual = make_scheduler(table, algorithm, True)
+            actual.start()
+            actual.advance(ticks)
+            assert midway(actual) == midway(expected), (seed, ticks)
+
+def midway(scheduler: ProcessScheduler):
+    state = scheduler.get_current_state()
+    del state['delta_seq']
+    levels = [scheduler.ready_queue.level_of(process.pid) for process in scheduler.core_processes if process] \
+        if scheduler.algorithm == 'mlfq' else None
+    return state, list(scheduler.core_quantum), levels
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_long_bursts_run_alone_are_skipped(algorithm):
+    burst = 1_000_000
+    scheduler = make_scheduler(ProcessTable.from_columns([burst] * 3, [0, burst, 2 * burst], [0] * 3),
+                               algorithm, True)
+    steps = 0
+    step = scheduler.step
+
+    def counted_step():
+        nonlocal steps
+        steps += 1
+        step()
+    scheduler.step = counted_step
+    scheduler.start()
+    scheduler.run_to_completion()
+    assert scheduler.is_complete()
+    assert steps < 20
@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+import binary_format
+import ingest
+from process_scheduler import ProcessTable
+
+def binary_stream(burst_times, arrival_times, priorities) -> io.BytesIO:
+    stream = io.BytesIO()
+    binary_format.write_table(ProcessTable.from_columns(burst_times, arrival_times, priorities), stream)
+    stream.seek(0)
+    return stream
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_binary_rows_are_validated(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(ingest, 'np', None)
+    with pytest.raises(ValueError, match='Row 2'):
+        ingest.read_columns(binary_stream([3, 0, 2], [0, 1, 2], [0, 0, 0]), 'binary')
+    with pytest.raises(ValueError, match='Row 3'):
+        ingest.read_columns(binary_stream([3, 1, 2], [0, 1, -4], [0, 0, 0]), 'binary')
+    columns = ingest.read_columns(binary_stream([3, 1], [0, 5], [2, 1]), 'binary')
+    assert [list(column) for column in columns] == [[3, 1], [0, 5], [2, 1]]
+
+class ChunkedStream(io.RawIOBase):
+    """Binary stream handing out at most ``size`` bytes per read, like a socket."""
+
+    def __init__(self, data: bytes, size: int):
+        self.data = data
+        self.size = size
+
+    def read(self, size=-1):
+        chunk, self.data = self.data[:self.size], self.data[self.size:]
+        return chunk
+
+def test_csv_header_in_any_order():
+    data = 'priority,arrival_time,burst_time\n1,0,5\n\n3,2,4\n'
+    columns = ingest.read_columns(io.StringIO(data), 'csv')
+    assert [list(column) for column in columns] == [[5, 4], [0, 2], [1, 3]]
+
+def test_csv_without_header_takes_columns_in_order():
+    columns = ingest.read_columns(io.BytesIO(b'5,0\n4,2\n'), 'csv')
+    assert [list(column) for column in columns] == [[5, 4], [0, 2], [0, 0]]
+    columns = ingest.read_columns(io.BytesIO(b'5,0,1\n4,2,3\n'), 'csv')
+    assert [list(column) for column in columns] == [[5, 4], [0, 2], [1, 3]]
+
+def test_lines_split_across_reads():
+    rows = ''.join(f'{{"burst_time": {burst}, "arrival_time": {burst * 2}, "priority": 1}}\n'
+                   for burst in range(1, 200))
+    columns = ingest.read_columns(ChunkedStream(rows.encode(), 7), 'jsonl')
+    assert list(columns[0]) == list(range(1, 200))
+    assert list(columns[1]) == [burst * 2 for burst in range(1, 200)]
+
+@pytest.mark.parametrize('format, data, line', [
+    ('csv', b'5,0\nfive,1\n', 2),
+    ('csv', b'5,0\n\n0,1\n', 3),
+    ('jsonl', b'{"burst_time": 2, "arrival_time": 0}\n{"burst_time": 2}\n', 2),
+    ('jsonl', b'{"burst_time": 2, "arrival_time": -1}\n', 1),
+])
+def test_invalid_rows_name_their_line(format, data, line):
+    with pytest.raises(ValueError, match=f'line {line}|Line {line}'):
+        ingest.read_columns(io.BytesIO(data), format)
+
+def test_import_adds_nothing_when_a_row_is_invalid():
+    from process_scheduler import ProcessScheduler
+    scheduler = ProcessScheduler()
+    with pytest.raises(ValueError):
+        ingest.import_processes(scheduler, io.BytesIO(b'3,0\n4,1\n0,2\n'), 'csv')
+    assert len(scheduler.processes) == 0
+    stats = ingest.import_processes(scheduler, io.BytesIO(b'3,4\n4,1\n'), 'csv')
+    assert stats['rows'] == 2 and stats['first_pid'] == 0
+    assert [process['arrival_time'] for process in scheduler.get_processes()] == [1, 4]
+
+@pytest.mark.parametrize('filename, content_type, expected', [
+    ('trace.jsonl', None, 'jsonl'),
+    ('trace.ptab', None, 'binary'),
+    (None, 'application/x-ndjson', 'jsonl'),
+    (None, 'application/octet-stream', 'binary'),
+    ('trace.txt', 'text/plain', 'csv'),
+])
+def test_detect_format(filename, content_type, expected):
+    assert ingest.detect_format(filename, content_type) == expected
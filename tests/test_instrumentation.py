@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from instrumentation import InstrumentedScheduler, PHASES, Profiler, render_prometheus
+from process_scheduler import ProcessScheduler, ProcessTable
+
+def workload() -> ProcessTable:
+    return ProcessTable.from_columns([5, 3, 8, 2, 4], [0, 1, 2, 9, 9], [1, 0, 2, 1, 3])
+
+def run(scheduler: ProcessScheduler) -> ProcessScheduler:
+    scheduler.set_algorithm('smp')
+    scheduler.start()
+    while not scheduler.is_complete():
+        scheduler.step()
+    return scheduler
+
+def test_instrumented_runs_match_and_count_phases():
+    instrumented = InstrumentedScheduler(workload())
+    instrumented.set_algorithm('smp')
+    instrumented.start()
+    calls = dict(instrumented.phase_calls)
+    steps = 0
+    while not instrumented.is_complete():
+        instrumented.step()
+        steps += 1
+    plain = run(ProcessScheduler(workload()))
+    assert instrumented.get_processes() == plain.get_processes()
+    for phase in ('update_process_states', 'schedule_next_process'):
+        assert instrumented.phase_calls[phase] - calls[phase] == steps
+    assert all(instrumented.phase_seconds[phase] >= 0 for phase in PHASES)
+    assert instrumented.max_ready_queue_length >= 1
+
+def test_prometheus_exposition():
+    scheduler = run(InstrumentedScheduler(workload()))
+    simulation = SimpleNamespace(id='sim "1"', scheduler=scheduler, pending=0)
+    text = render_prometheus([simulation], {'live': 1, 'bytes': 10, 'spilled': 0, 'restored': 0, 'expired': 0},
+                             {'entries': 0, 'bytes': 0, 'hits': 2, 'misses': 1})
+    lines = text.splitlines()
+    assert lines.count('# TYPE scheduler_phase_seconds_total counter') == 1
+    assert f'scheduler_time{{simulation="sim \\"1\\""}} {scheduler.current_time}' in lines
+    assert 'scheduler_result_cache_hits_total 2' in lines
+    assert f'scheduler_core_busy_ticks_total{{simulation="sim \\"1\\"",core="1"}} {scheduler.core_busy[1]}' in lines
+    # Every sample follows the HELP and TYPE of its metric
+    names = [line.split()[2] for line in lines if line.startswith('# TYPE')]
+    assert len(names) == len(set(names))
+
+def test_profiler_only_records_profiled_blocks():
+    profiler = Profiler()
+    with profiler.profiled():
+        run(ProcessScheduler(workload()))
+    assert profiler.stop() == ''
+    profiler.start()
+    with profiler.profiled():
+        run(ProcessScheduler(workload()))
+    report = profiler.stop()
+    assert '_schedule_next_process' in report
+    assert not profiler.enabled
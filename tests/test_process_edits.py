@@ -0,0 +1,33 @@
+"""Editing processes mid-run schedules them as re-sorting the process list by arrival did."""
+from process_scheduler import ProcessScheduler, ProcessTable
+
+def run(bursts, arrivals, algorithm, edit_at, edit):
+    scheduler = ProcessScheduler(ProcessTable.from_columns(bursts, arrivals))
+    scheduler.set_algorithm(algorithm)
+    scheduler.start()
+    while not scheduler.is_complete():
+        if scheduler.current_time == edit_at:
+            scheduler.update_process(*edit)
+        scheduler.step()
+    return list(scheduler.completed_processes)
+
+def test_edit_keeps_place_among_simultaneous_arrivals():
+    assert run([2, 2, 2, 2], [0, 1, 1, 1], 'fcfs', 0, (1, 3, 1)) == [0, 1, 2, 3]
+
+def test_edit_to_earlier_arrival_goes_last_among_those_arriving_then():
+    assert run([2, 2, 2, 2], [0, 1, 1, 1], 'fcfs', 0, (3, 3, 0)) == [0, 3, 1, 2]
+
+def test_edit_of_queued_process_keeps_its_place_in_ready_list():
+    # After dispatching pid 1 the ready list was sorted as [2, 0]; pid 2
+    # keeps its place when its burst time grows to tie with pid 0
+    assert run([5, 3, 4], [0, 0, 0], 'sjf', 1, (2, 5, 0)) == [1, 2, 0]
+
+def test_batch_update_matches_sequential_updates():
+    edits = [(3, 2, 0), (1, 4, 1), (2, 1, 2), (3, 5, 1)]
+    sequential = ProcessScheduler(ProcessTable.from_columns([2, 2, 2, 2], [0, 1, 1, 1]))
+    batched = ProcessScheduler(ProcessTable.from_columns([2, 2, 2, 2], [0, 1, 1, 1]))
+    for pid, burst_time, arrival_time in edits:
+        sequential.update_process(pid, burst_time, arrival_time)
+    batched.apply_batch([{'op': 'update', 'pid': pid, 'burst_time': burst_time, 'arrival_time': arrival_time}
+                         for pid, burst_time, arrival_time in edits])
+    assert list(batched.processes.rows) == list(sequential.processes.rows)
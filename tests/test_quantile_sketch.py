@@ -0,0 +1,31 @@
+import random
+import statistics
+
+import pytest
+
+from process_scheduler import QuantileSketch
+
+@pytest.mark.parametrize('count', range(2, 21))
+def test_quantiles_match_statistics_for_small_samples(count):
+    rng = random.Random(count)
+    for _ in range(20):
+        samples = [rng.choice([0, rng.randint(1, 10), rng.randint(1, 1000)]) for _ in range(count)]
+        sketch = QuantileSketch()
+        sketch.add_many(samples)
+        expected = statistics.quantiles(samples, n=100, method='inclusive')
+        for percentile in (50, 95, 99):
+            assert sketch.quantile(percentile / 100) == pytest.approx(expected[percentile - 1], rel=0.01)
+
+def test_high_quantiles_of_few_samples_are_not_the_median():
+    sketch = QuantileSketch()
+    for value in (1, 2, 3, 4, 100):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == pytest.approx(3, rel=0.01)
+    assert sketch.quantile(0.99) > 90
+
+def test_removed_samples_no_longer_count():
+    sketch = QuantileSketch()
+    sketch.add_many([5, 10, 500])
+    sketch.remove(500)
+    assert sketch.quantile(0.99) == pytest.approx(statistics.quantiles([5, 10], n=100, method='inclusive')[98],
+                                                  rel=0.01)
@@ -0,0 +1,49 @@
+from process_scheduler import ProcessScheduler, ProcessTable
+from ready_queues import HeapReadyQueue
+
+def test_heap_rekey_back_to_earlier_key():
+    keys = {0: 5, 1: 3, 2: 4}
+    queue = HeapReadyQueue(keys.__getitem__)
+    for pid in keys:
+        queue.push(pid)
+    keys[1] = 6
+    queue.update(1)
+    keys[1] = 3
+    queue.update(1)
+    keys[2] = 3
+    queue.update(2)
+    # Equal keys keep their insertion order
+    assert [queue.pop() for _ in range(3)] == [1, 2, 0]
+    assert not queue
+
+def test_heap_copy_pops_in_same_order():
+    keys = {pid: pid % 3 for pid in range(10)}
+    queue = HeapReadyQueue(keys.__getitem__)
+    for pid in keys:
+        queue.push(pid)
+    queue.remove(4)
+    keys[7] = 0
+    queue.update(7)
+    copy = queue.copy()
+    assert [queue.pop() for _ in range(9)] == [copy.pop() for _ in range(9)]
+
+def test_sjf_edit_queued_process_back_and_forth():
+    scheduler = ProcessScheduler(ProcessTable.from_columns([5, 3, 4], [0, 0, 0]))
+    scheduler.set_algorithm('sjf')
+    scheduler.start()
+    scheduler.update_process(1, 6, 0)
+    scheduler.update_process(1, 3, 0)
+    scheduler.update_process(2, 3, 0)
+    scheduler.run_to_completion()
+    assert list(scheduler.completed_processes) == [1, 2, 0]
+
+def test_priority_edit_queued_process_back_and_forth():
+    scheduler = ProcessScheduler(ProcessTable.from_columns([4, 4, 4], [0, 0, 0], [2, 1, 3]))
+    scheduler.set_algorithm('priority')
+    scheduler.start()
+    scheduler.update_process(1, 4, 0, 4)
+    scheduler.update_process(1, 4, 0, 1)
+    scheduler.update_process(2, 4, 0, 1)
+    scheduler.run_to_completion()
+    assert scheduler.is_complete()
+    assert list(scheduler.completed_processes) == [1, 2, 0]
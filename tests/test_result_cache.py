@@ -0,0 +1,93 @@
+import os
+import pickle
+
+import pytest
+
+from process_scheduler import ProcessScheduler
+from result_cache import ResultCache
+from sweeps import generate_workload
+
+def observed(scheduler: ProcessScheduler):
+    state = scheduler.get_current_state()
+    state.pop('delta_seq', None)
+    return state, scheduler.get_timeline(), scheduler.get_processes(), scheduler.current_time
+
+def finished(table, algorithm: str, cache, evaluate: bool = False) -> ProcessScheduler:
+    scheduler = ProcessScheduler(table, cache)
+    scheduler.quantum = 3
+    scheduler.cores = 3
+    if evaluate:
+        scheduler.evaluate(algorithm)
+    else:
+        scheduler.set_algorithm(algorithm)
+        scheduler.start()
+        scheduler.run_to_completion()
+    return scheduler
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_cached_run_matches_a_fresh_one(algorithm):
+    table = generate_workload(f'cache:{algorithm}', 200, load=0.9)
+    expected = observed(finished(table, algorithm, None))
+    cache = ResultCache()
+    assert observed(finished(table, algorithm, cache)) == expected
+    hit = finished(table, algorithm, cache)
+    assert cache.hits == 1
+    assert observed(hit) == expected
+
+    middle = expected[3] // 2
+    hit.seek(middle)
+    fresh = finished(table, algorithm, None)
+    fresh.seek(middle)
+    assert observed(hit) == observed(fresh)
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_animated_run_fills_the_cache(algorithm):
+    table = generate_workload(f'animated:{algorithm}', 100)
+    cache = ResultCache()
+    scheduler = ProcessScheduler(table, cache)
+    scheduler.quantum = 3
+    scheduler.cores = 3
+    scheduler.set_algorithm(algorithm)
+    scheduler.start()
+    while not scheduler.is_complete():
+        scheduler.advance(7)
+    assert len(cache) == 1
+    assert observed(finished(table, algorithm, cache)) == observed(finished(table, algorithm, None))
+    assert cache.hits == 1
+
+def test_edits_and_settings_change_the_key():
+    scheduler = ProcessScheduler(generate_workload(1, 50), ResultCache())
+    keys = [scheduler.result_key('rr')]
+    scheduler.update_process(3, 7, 2, 1)
+    keys.append(scheduler.result_key('rr'))
+    scheduler.add_process(3, 4)
+    keys.append(scheduler.result_key('rr'))
+    scheduler.delete_process(0)
+    keys.append(scheduler.result_key('rr'))
+    scheduler.quantum = 5
+    keys.append(scheduler.result_key('rr'))
+    keys.append(scheduler.result_key('fcfs'))
+    assert len(set(keys)) == len(keys)
+
+def test_results_persist_on_disk(tmp_path):
+    table = generate_workload(5, 100)
+    expected = observed(finished(table, 'mlfq', None))
+    finished(table, 'mlfq', ResultCache(directory=str(tmp_path)))
+    assert os.listdir(tmp_path)
+    cache = ResultCache(directory=str(tmp_path))
+    assert observed(finished(table, 'mlfq', cache)) == expected
+    assert cache.hits == 1
+
+def test_entries_over_budget_are_not_kept(tmp_path):
+    cache = ResultCache(max_bytes=1, directory=str(tmp_path), max_disk_bytes=1)
+    finished(generate_workload(5, 100), 'rr', cache)
+    assert len(cache) == 0
+    assert not os.listdir(tmp_path)
+
+def test_pickled_scheduler_leaves_the_cache_behind():
+    cache = ResultCache()
+    scheduler = finished(generate_workload(2, 30), 'sjf', cache)
+    copy = pickle.loads(pickle.dumps(scheduler))
+    assert scheduler.result_cache is cache
+    assert copy.result_cache is None
+    assert observed(copy) == observed(scheduler)
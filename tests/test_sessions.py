@@ -0,0 +1,92 @@
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from sessions import SimulationStore
+
+def test_state_snapshot_follows_broadcast_deltas():
+    main = pytest.importorskip('main')
+    client = main.app.test_client()
+    headers = {'X-Simulation-Id': 'snapshot-delta-seq'}
+    client.post('/api/processes/generate', json={'count': 3}, headers=headers)
+    simulation = main.simulations.get('snapshot-delta-seq')
+    try:
+        scheduler = simulation.scheduler
+        simulation.execute(scheduler.add_process, 4, 1)
+        before = json.loads(client.get('/api/state', headers=headers).data)
+        main.broadcast_state(simulation)
+        after = json.loads(client.get('/api/state', headers=headers).data)
+        assert after['delta_seq'] == before['delta_seq'] + 1 == scheduler.delta_seq
+        # Nothing else changed, and other snapshots stay cached
+        assert {key: value for key, value in after.items() if key != 'delta_seq'} == \
+            {key: value for key, value in before.items() if key != 'delta_seq'}
+    finally:
+        main.simulations.release(simulation)
+
+def make_store(tmp_path, **options) -> SimulationStore:
+    spill_dir = tmp_path / 'spill'
+    return SimulationStore(spill_dir=str(spill_dir), **options)
+
+def test_simulations_are_isolated_and_kept(tmp_path):
+    store = make_store(tmp_path)
+    first = store.get('first')
+    first.execute(first.scheduler.add_process, 3, 0)
+    store.release(first)
+    second = store.get('second')
+    assert len(second.scheduler.processes) == 0
+    store.release(second)
+    assert store.get('first') is first
+    with pytest.raises(ValueError):
+        store.get('../escape')
+
+def test_least_recently_used_are_spilled_and_restored(tmp_path):
+    store = make_store(tmp_path, max_bytes=1)
+    for simulation_id in ('a', 'b', 'c'):
+        simulation = store.get(simulation_id)
+        simulation.execute(simulation.scheduler.add_processes, [2, 3], [0, 1])
+        store.release(simulation)
+    # Only the one just used fits
+    assert [simulation.id for simulation in store.live()] == ['c']
+    assert store.stats()['spilled'] == 2 and 'a' in store
+    restored = store.get('a')
+    assert [process['burst_time'] for process in restored.execute(restored.scheduler.get_processes)] == [2, 3]
+    assert store.stats()['restored'] == 1
+    store.release(restored)
+
+def test_held_simulations_are_not_spilled(tmp_path):
+    store = make_store(tmp_path, max_bytes=1)
+    held = store.get('held')
+    held.execute(held.scheduler.add_processes, [2] * 20, [0] * 20)
+    for simulation_id in ('x', 'y'):
+        store.release(store.get(simulation_id))
+    assert 'held' in [simulation.id for simulation in store.live()]
+    store.release(held)
+    store.release(store.get('z'))
+    assert 'held' not in [simulation.id for simulation in store.live()]
+
+def test_spill_files_expire(tmp_path):
+    store = make_store(tmp_path, max_bytes=1, spill_ttl=60)
+    for simulation_id in ('old', 'new'):
+        simulation = store.get(simulation_id)
+        simulation.scheduler.add_process(2, 0)
+        store.release(simulation)
+    store.release(store.get('newer'))
+    assert [simulation.id for simulation in store.live()] == ['newer']
+    # Last used two minutes ago
+    stale = time.time() - 120
+    os.utime(store._spill_path('old'), (stale, stale))
+    store._next_expiry = 0
+    store.release(store.get('newest'))
+    assert 'old' not in store and 'new' in store
+    assert store.stats()['expired'] == 1
+
+def test_spill_directory_must_be_private(tmp_path):
+    spill_dir = tmp_path / 'shared'
+    spill_dir.mkdir()
+    os.chmod(spill_dir, 0o777)
+    with pytest.raises(PermissionError):
+        SimulationStore(spill_dir=str(spill_dir))
+    assert stat.S_IMODE(os.stat(make_store(tmp_path).spill_dir).st_mode) == 0o700
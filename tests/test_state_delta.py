@@ -0,0 +1,93 @@
+"""Deltas replayed onto a snapshot must reproduce the scheduler's full state."""
+import random
+
+import pytest
+
+from process_scheduler import ProcessScheduler
+
+class ReplayClient:
+    """What the browser keeps: a snapshot with every delta since applied to it."""
+
+    def apply_snapshot(self, state):
+        self.seq = state['delta_seq']
+        self.processes = {process['pid']: process for process in state['processes']}
+        self.ready = dict(zip(state['ready_queue'], state['ready_keys']))
+        self.completed = list(state['completed_processes'])
+        self.metrics = dict(state['performance_metrics'])
+
+    def apply_delta(self, delta):
+        assert delta['seq'] == self.seq + 1
+        self.seq = delta['seq']
+        for process in delta['processes']:
+            self.processes[process['pid']] = process
+        for pid in delta['ready_removed']:
+            self.ready.pop(pid, None)
+        for pid, key in delta['ready_added']:
+            self.ready[pid] = key
+        for pid in delta['completed_added']:
+            if pid not in self.completed:
+                self.completed.append(pid)
+        self.metrics.update(delta['metrics'])
+
+    def view(self):
+        return (sorted(self.processes.values(), key=lambda process: process['pid']),
+                [pid for pid, _ in sorted(self.ready.items(), key=lambda item: item[1])],
+                self.completed, self.metrics)
+
+def full_view(scheduler: ProcessScheduler):
+    state = scheduler.get_current_state()
+    return (sorted(state['processes'], key=lambda process: process['pid']), state['ready_queue'],
+            state['completed_processes'], state['performance_metrics'])
+
+def broadcast(scheduler: ProcessScheduler, *clients: ReplayClient):
+    delta = scheduler.take_state_delta()
+    state = scheduler.get_current_state() if delta is None else None
+    for client in clients:
+        if delta is None:
+            client.apply_snapshot(state)
+        else:
+            client.apply_delta(delta)
+        assert client.view() == full_view(scheduler)
+    return delta
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_replayed_deltas_match_snapshots(algorithm):
+    for seed in range(30):
+        rng = random.Random(seed)
+        scheduler = ProcessScheduler()
+        client = ReplayClient()
+        for _ in range(rng.randint(1, 15)):
+            scheduler.add_process(rng.randint(1, 8), rng.randint(0, 10), rng.randint(0, 4))
+        broadcast(scheduler, client)
+        scheduler.set_algorithm(algorithm)
+        scheduler.start()
+        broadcast(scheduler, client)
+        # A client that joins midway seeds itself from a snapshot
+        late = ReplayClient()
+        late.apply_snapshot(scheduler.get_current_state())
+        while not scheduler.is_complete():
+            roll = rng.random()
+            if roll < 0.05:
+                scheduler.add_process(rng.randint(1, 8), scheduler.current_time + rng.randint(0, 5), rng.randint(0, 4))
+            elif roll < 0.08:
+                pid = rng.choice([process.pid for process in scheduler.processes])
+                scheduler.update_process(pid, rng.randint(1, 8), rng.randint(0, 12), rng.randint(0, 4))
+            elif roll < 0.09 and len(scheduler.processes) > 1:
+                scheduler.delete_process(rng.choice([process.pid for process in scheduler.processes]))
+            scheduler.advance(rng.randint(1, 4))
+            broadcast(scheduler, client, late)
+
+def test_deltas_only_carry_what_changed():
+    scheduler = ProcessScheduler()
+    for arrival in range(100):
+        scheduler.add_process(5, arrival * 10)
+    scheduler.set_algorithm('fcfs')
+    scheduler.start()
+    assert scheduler.take_state_delta() is None
+    scheduler.step()
+    delta = scheduler.take_state_delta()
+    assert delta['seq'] == scheduler.get_current_state()['delta_seq']
+    assert len(delta['processes']) < 5
+    scheduler.delete_process(99)
+    # Removals cannot be patched, clients need a snapshot
+    assert scheduler.take_state_delta() is None
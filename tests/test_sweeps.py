@@ -0,0 +1,74 @@
+import random
+import statistics
+import threading
+
+import pytest
+
+from comparison import run_algorithm
+from sweeps import RunningStats, burst_distribution, draw_bursts, generate_workload, run_sweep
+
+def test_merged_running_stats_match_statistics():
+    values = [random.Random(3).random() * 10 for _ in range(1000)]
+    first, second = RunningStats(), RunningStats()
+    for value in values[:300]:
+        first.add(value)
+    for value in values[300:]:
+        second.add(value)
+    first.merge(second)
+    assert first.count == 1000
+    assert first.mean == pytest.approx(statistics.mean(values))
+    assert first.stddev == pytest.approx(statistics.stdev(values))
+
+def test_workloads_are_reproducible_and_keep_the_target_load():
+    bursts = {'kind': 'exponential', 'mean': 4}
+    table = generate_workload('x:1', 4000, bursts, 0.5)
+    again = generate_workload('x:1', 4000, bursts, 0.5)
+    assert list(table.burst_time) == list(again.burst_time)
+    assert list(table.arrival_time) == list(again.arrival_time)
+    assert list(generate_workload('x:2', 4000, bursts, 0.5).burst_time) != list(table.burst_time)
+    assert sum(table.burst_time) / max(table.arrival_time) == pytest.approx(0.5, rel=0.1)
+
+@pytest.mark.parametrize('spec', [{'kind': 'uniform', 'low': 2, 'high': 6}, {'kind': 'exponential'},
+                                  {'kind': 'pareto', 'max': 50}, {'kind': 'bimodal'}])
+def test_bursts_are_positive_and_capped(spec):
+    bursts = draw_bursts(random.Random(1), 2000, burst_distribution(spec))
+    assert min(bursts) >= 1
+    if 'max' in spec or 'high' in spec:
+        assert max(bursts) <= spec.get('max', spec.get('high'))
+
+@pytest.mark.parametrize('arguments', [{'workloads': 0}, {'workloads': 1, 'load': 0},
+                                       {'workloads': 1, 'confidence': 1}, {'workloads': 1, 'algorithms': ['lottery']},
+                                       {'workloads': 1, 'bursts': {'kind': 'normal'}}])
+def test_bad_arguments_are_rejected_up_front(arguments):
+    with pytest.raises(ValueError):
+        run_sweep(**arguments)
+
+def test_sweep_of_one_workload_reports_its_metrics():
+    result = list(run_sweep(1, 20, algorithms=['fcfs', 'rr'], seed=4, max_workers=1))[-1]
+    table = generate_workload('4:0', 20, None, 0.8)
+    assert result['done'] and result['completed'] == 1
+    for algorithm in ('fcfs', 'rr'):
+        metrics = run_algorithm(table, algorithm)
+        summary = result['results'][algorithm]['avg_waiting_time']
+        assert summary['mean'] == pytest.approx(metrics['avg_waiting_time'])
+        assert summary['low'] == summary['high'] == summary['mean']
+
+def test_results_do_not_depend_on_chunking():
+    arguments = dict(workloads=30, processes=15, bursts={'kind': 'pareto', 'alpha': 2.0, 'max': 50},
+                     load=0.9, algorithms=['sjf', 'rr'], quanta=(2, 4), seed=7)
+    one = list(run_sweep(chunk_size=30, max_workers=1, **arguments))[-1]
+    many = list(run_sweep(chunk_size=4, max_workers=2, **arguments))[-1]
+    assert set(one['results']) == {'sjf', 'rr (q=2)', 'rr (q=4)'}
+    for label, metrics in one['results'].items():
+        for name, summary in metrics.items():
+            assert many['results'][label][name]['mean'] == pytest.approx(summary['mean']), (label, name)
+            assert summary['low'] <= summary['mean'] <= summary['high']
+
+def test_cancelled_sweep_stops_early():
+    cancel = threading.Event()
+    results = []
+    for result in run_sweep(10000, 10, algorithms=['fcfs'], chunk_size=5, max_workers=1, cancel=cancel):
+        results.append(result)
+        cancel.set()
+    assert results[-1]['cancelled'] and results[-1]['done']
+    assert results[-1]['completed'] < 10000
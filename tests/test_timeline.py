@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from process_scheduler import ProcessScheduler, ProcessTable
+from timeline import Timeline
+
+def random_scheduler(seed: int, algorithm: str) -> ProcessScheduler:
+    rng = random.Random(seed)
+    count = rng.randint(1, 40)
+    scheduler = ProcessScheduler(ProcessTable.from_columns([rng.randint(1, 8) for _ in range(count)],
+                                                           [rng.randint(0, 4 * count) for _ in range(count)],
+                                                           [rng.randrange(5) for _ in range(count)]))
+    scheduler.set_algorithm(algorithm)
+    return scheduler
+
+def all_segments(timeline):
+    return timeline['segments'] + [segment for core in timeline.get('cores', []) for segment in core['segments']]
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_stepped_and_skipped_runs_record_the_same_timeline(algorithm):
+    for seed in range(30):
+        stepped, skipped = random_scheduler(seed, algorithm), random_scheduler(seed, algorithm)
+        for scheduler in (stepped, skipped):
+            scheduler.start()
+        while not stepped.is_complete():
+            stepped.step()
+        skipped.run_to_completion()
+        assert skipped.get_timeline() == stepped.get_timeline(), seed
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_segments_account_for_every_tick_of_cpu_time(algorithm):
+    for seed in range(30):
+        scheduler = random_scheduler(seed, algorithm)
+        scheduler.start()
+        scheduler.run_to_completion()
+        ran = {}
+        for pid, start, end in all_segments(scheduler.get_timeline()):
+            assert start < end
+            ran[pid] = ran.get(pid, 0) + end - start
+        assert ran == {process.pid: max(process.burst_time, 1) for process in scheduler.processes}, seed
+        assert sum(ran.values()) == scheduler.busy_time
+
+@pytest.mark.parametrize('algorithm', ProcessScheduler.ALGORITHMS)
+def test_evaluated_timeline_matches_the_simulation(algorithm):
+    if not random_scheduler(0, algorithm).can_evaluate(algorithm):
+        pytest.skip(f"{algorithm} is simulated tick by tick only")
+    for seed in range(30):
+        simulated, evaluated = random_scheduler(seed, algorithm), random_scheduler(seed, algorithm)
+        simulated.start()
+        simulated.run_to_completion()
+        evaluated.evaluate(algorithm)
+        assert evaluated.get_timeline() == simulated.get_timeline(), seed
+
+def test_consecutive_runs_of_one_process_form_one_segment():
+    timeline = Timeline()
+    for tick in range(10):
+        timeline.run(3, tick)
+    timeline.flush()
+    timeline.run(3, 10, 5)
+    timeline.run(4, 20, 2)
+    assert timeline.segments(0, 100) == [[3, 0, 15], [4, 20, 22]]
+    assert timeline.segments(5, 21) == [[3, 5, 15], [4, 20, 21]]
+
+def test_buckets_widen_instead_of_growing_past_the_limit():
+    timeline = Timeline(max_buckets=8)
+    for tick in range(100):
+        timeline.sample(tick, 1, tick % 3, busy=tick % 2 == 0)
+    series = timeline.series(0, 100)
+    assert timeline.bucket_width == 16
+    assert len(series) <= 8
+    assert sum(point['end'] - point['start'] for point in series) == 112
+    assert max(point['ready_max'] for point in series) == 2
+    assert series[0]['idle_fraction'] == pytest.approx(0.5)
+
+def test_resolution_caps_segments_and_series():
+    timeline = Timeline()
+    for tick in range(1000):
+        timeline.run(tick % 7, tick)
+        timeline.sample(tick, 1, tick % 5, busy=True)
+    segments = timeline.segments(0, 1000, resolution=10)
+    assert len(segments) <= 10
+    assert segments[0][1] == 0 and segments[-1][2] == 1000
+    assert len(timeline.series(0, 1000, resolution=10)) <= 10
+
+def test_truncate_forgets_the_future():
+    timeline = Timeline()
+    timeline.run(1, 0, 10)
+    timeline.run(2, 10, 10)
+    timeline.sample(0, 20, 1, busy=True)
+    timeline.truncate(15)
+    assert timeline.horizon == 15
+    assert timeline.segments(0, 100) == [[1, 0, 10], [2, 10, 15]]
@@ -0,0 +1,240 @@
+"""Gantt timeline and downsampled queue/idle series of a simulation run."""
+import bisect
+from array import array
+from typing import Dict, List
+
+IDLE = -1
+
+class Timeline:
+    """Run-length CPU segments plus bucketed ready-queue and idle series.
+
+    A segment ``(pid, start, end)`` covers the ticks ``[start, end)`` during
+    which one process held the CPU without interruption. A new segment is
+    only appended when a different process runs or after an idle gap, so
+    memory grows with context switches rather than with ticks; ticks not
+    covered by any segment were idle.
+
+    Ready-queue length and busy ticks are summed into fixed-width buckets.
+    Once there are more than ``max_buckets``, neighbouring buckets are
+    merged and the width doubles, which keeps the series bounded however
+    long the run.
+
+    ``run`` and ``sample`` are called on every tick, so the current segment
+    and the current stretch of unchanged samples are kept in plain
+    attributes and only written out when they change or on ``flush``.
+
+    Ticks before ``horizon`` have been recorded already. After the
+    scheduler seeks back, the ticks it replays are identical to the recorded
+    ones and are ignored; ``truncate`` forgets the recorded future instead
+    when it no longer applies.
+    """
+
+    def __init__(self, max_buckets: int = 4096):
+        self.pids = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.max_buckets = max_buckets
+        self.bucket_width = 1
+        self._samples = array('q')  # Sampled ticks per bucket
+        self._ready_sum = array('q')
+        self._ready_max = array('q')
+        self._busy = array('q')
+        # Open segment and open stretch of identical samples
+        self._pid = None
+        self._start = self._end = 0
+        self._span_start = self._span_end = 0
+        self._span_ready = None
+        self._span_busy = False
+        self._horizon = 0
+
+    def __len__(self) -> int:
+        self.flush()
+        return len(self.pids)
+
+    def flush(self):
+        """Write out the open segment and sample stretch."""
+        self._flush_segment()
+        if self._span_ready is not None:
+            self._add_samples(self._span_start, self._span_end - self._span_start, self._span_ready, self._span_busy)
+            self._horizon = self._span_end
+            self._span_ready = None
+
+    @property
+    def horizon(self) -> int:
+        """One past the last sampled tick."""
+        return self._span_end if self._span_ready is not None else self._horizon
+
+    def truncate(self, time: int):
+        """Forget everything recorded from ``time`` on.
+
+        Segments are cut exactly; the series only to bucket precision, as
+        the bucket containing ``time`` is dropped as a whole.
+        """
+        self.flush()
+        if time >= self._horizon:
+            return
+        stop = bisect.bisect_left(self.starts, time)
+        del self.pids[stop:], self.starts[stop:], self.ends[stop:]
+        if self.ends and self.ends[-1] > time:
+            self.ends[-1] = time
+        index = time // self.bucket_width
+        for column in (self._samples, self._ready_sum, self._ready_max, self._busy):
+            del column[index:]
+        self._horizon = time
+
+    def run(self, pid: int, start: int, ticks: int = 1):
+        """Record that ``pid`` ran for ``ticks`` ticks from ``start``."""
+        if pid == self._pid and start == self._end:
+            self._end = start + ticks
+            return
+        if start < self.horizon:
+            start, ticks = self._unrecorded(start, ticks)
+            if not ticks:
+                return
+        self._flush_segment()
+        end = start + ticks
+        if self.pids and self.pids[-1] == pid and self.ends[-1] == start:
+            # Continue a segment that was written out by an earlier flush
+            self.pids.pop()
+            start = self.starts.pop()
+            self.ends.pop()
+        self._pid, self._start, self._end = pid, start, end
+
+    def _flush_segment(self):
+        if self._pid is not None:
+            self.pids.append(self._pid)
+            self.starts.append(self._start)
+            self.ends.append(self._end)
+            self._pid = None
+
+    def sample(self, start: int, ticks: int, ready: int, busy: bool):
+        """Record the ready-queue length and CPU state for ``ticks`` ticks."""
+        if ready == self._span_ready and busy == self._span_busy and start == self._span_end:
+            self._span_end = start + ticks
+            return
+        if start < self.horizon:
+            start, ticks = self._unrecorded(start, ticks)
+            if not ticks:
+                return
+        if self._span_ready is not None:
+            self._add_samples(self._span_start, self._span_end - self._span_start, self._span_ready, self._span_busy)
+        self._span_start, self._span_end = start, start + ticks
+        self._span_ready, self._span_busy = ready, busy
+
+    def _unrecorded(self, start: int, ticks: int) -> tuple:
+        """The part of ``ticks`` ticks from ``start`` at or after the horizon."""
+        skipped = min(self.horizon - start, ticks)
+        return start + skipped, ticks - skipped
+
+    def _add_samples(self, start: int, ticks: int, ready: int, busy: bool):
+        last_tick = start + ticks - 1
+        width = self.bucket_width
+        if last_tick >= len(self._samples) * width:
+            self._grow(last_tick)
+            width = self.bucket_width
+        if ticks == 1:
+            index = start // width
+            self._samples[index] += 1
+            self._ready_sum[index] += ready
+            if ready > self._ready_max[index]:
+                self._ready_max[index] = ready
+            if busy:
+                self._busy[index] += 1
+            return
+        end = start + ticks
+        for index in range(start // width, (end - 1) // width + 1):
+            overlap = min(end, (index + 1) * width) - max(start, index * width)
+            self._samples[index] += overlap
+            self._ready_sum[index] += ready * overlap
+            if ready > self._ready_max[index]:
+                self._ready_max[index] = ready
+            if busy:
+                self._busy[index] += overlap
+
+    def _grow(self, last_tick: int):
+        while last_tick // self.bucket_width >= self.max_buckets:
+            self._merge_buckets()
+        needed = last_tick // self.bucket_width + 1
+        if needed > len(self._samples):
+            # Unsampled buckets stay at zero and are skipped by series()
+            size = min(max(needed, 2 * len(self._samples), 64), self.max_buckets)
+            zeros = array('q', bytes(8 * (size - len(self._samples))))
+            for column in (self._samples, self._ready_sum, self._ready_max, self._busy):
+                column.extend(zeros)
+
+    def _merge_buckets(self):
+        """Halve the number of buckets by merging neighbours."""
+        def pairs(column, combine):
+            if len(column) % 2:
+                column.append(0)
+            return array('q', map(combine, column[::2], column[1::2]))
+        self._samples = pairs(self._samples, int.__add__)
+        self._ready_sum = pairs(self._ready_sum, int.__add__)
+        self._ready_max = pairs(self._ready_max, max)
+        self._busy = pairs(self._busy, int.__add__)
+        self.bucket_width *= 2
+
+    def segments(self, start: int, end: int, resolution: int = None) -> List[List[int]]:
+        """Segments overlapping ``[start, end)``, clipped to it.
+
+        With ``resolution``, at most that many equal-width bins are used:
+        each bin is attributed to whichever process (or idle time) occupied
+        most of it, and neighbouring bins with the same owner are merged.
+        """
+        self.flush()
+        first = bisect.bisect_right(self.ends, start)
+        stop = bisect.bisect_left(self.starts, end)
+        if not resolution or stop - first <= resolution:
+            return [[self.pids[i], max(self.starts[i], start), min(self.ends[i], end)]
+                    for i in range(first, stop)]
+
+        width = -(-(end - start) // resolution)
+        bins = [dict() for _ in range(-(-(end - start) // width))]
+        for i in range(first, stop):
+            pid = self.pids[i]
+            segment_start, segment_end = max(self.starts[i], start), min(self.ends[i], end)
+            for index in range((segment_start - start) // width, (segment_end - 1 - start) // width + 1):
+                bin_start = start + index * width
+                overlap = min(segment_end, bin_start + width) - max(segment_start, bin_start)
+                bins[index][pid] = bins[index].get(pid, 0) + overlap
+
+        result = []
+        for index, occupants in enumerate(bins):
+            bin_start = start + index * width
+            bin_end = min(bin_start + width, end)
+            occupants[IDLE] = (bin_end - bin_start) - sum(occupants.values())
+            pid = max(occupants, key=occupants.get)
+            if pid == IDLE:
+                continue
+            if result and result[-1][0] == pid and result[-1][2] == bin_start:
+                result[-1][2] = bin_end
+            else:
+                result.append([pid, bin_start, bin_end])
+        return result
+
+    def series(self, start: int, end: int, resolution: int = None) -> List[Dict]:
+        """Ready-queue length and idle share over ``[start, end)``, bucket aligned."""
+        self.flush()
+        width = self.bucket_width
+        first = max(0, start // width)
+        stop = min(len(self._samples), -(-end // width))
+        if stop <= first:
+            return []
+        group = 1
+        if resolution and stop - first > resolution:
+            group = -(-(stop - first) // resolution)
+        points = []
+        for index in range(first, stop, group):
+            last = min(index + group, stop)
+            samples = sum(self._samples[index:last])
+            if not samples:
+                continue
+            busy = sum(self._busy[index:last])
+            points.append({
+                'start': index * width,
+                'end': last * width,
+                'ready_mean': sum(self._ready_sum[index:last]) / samples,
+                'ready_max': max(self._ready_max[index:last]),
+                'idle_fraction': 1 - busy / samples
+            })
+        return points